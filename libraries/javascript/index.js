@@ -15,8 +15,10 @@
 const JSONLDSerializer = require("./jsonld-serializer");
 const JSONLDFeedSerializer = require("./jsonld-feed-serializer");
 const SchemaValidator = require("./schema-validator");
+const expandDescriptor = require("./utils/descriptor").expandDescriptor;
 
 
 module.exports.JSONLDSerializer = JSONLDSerializer;
 module.exports.JSONLDFeedSerializer = JSONLDFeedSerializer;
 module.exports.SchemaValidator = SchemaValidator;
+module.exports.expandDescriptor = expandDescriptor;
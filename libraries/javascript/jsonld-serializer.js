@@ -32,6 +32,19 @@ class JSONLDSerializer {
         return schemaDescriptor.primitives.includes(objectType);
     }
 
+    /**
+     * Check if a schema property is flattened to a primitive type, its values
+     * are then stored without a wrapper message.
+     * @param  {String} propertyType The schema property type.
+     * @param  {Object} schemaDescriptor The JSON schemaDescriptor.
+     * @return {Boolean}      If or not the property is a flattened primitive.
+     */
+    isFlattenedPrimitive(propertyType, schemaDescriptor) {
+        let message = schemaDescriptor.messages[propertyType];
+        return message != null && message.flattened != null &&
+            this.checkPrimitive(message.flattened, schemaDescriptor);
+    }
+
     /**
      * Convert schema class to dictionary object.
      * @param  {Object} obj The schema class object.
@@ -67,6 +80,13 @@ class JSONLDSerializer {
                         outObj["@id"] = obj.array[0];
                     }
                 }
+                else if(this.isFlattenedPrimitive(schemaDescriptor.messages[objectType].fields[i], schemaDescriptor) &&
+                        Array.isArray(obj.array[i]) && obj.array[i].length > 0){
+                    // Flattened properties with a primitive range are
+                    // stored as plain values.
+                    let values = obj.array[i];
+                    outObj[schemaDescriptor.messages[objectType].fields[i]] = values.length == 1 ? values[0] : values.slice();
+                }
             }
             return sortObject(outObj);
         }
@@ -241,6 +261,11 @@ class JSONLDSerializer {
         let messageType = schemaDescriptor.messages[objectType]['@type'];
 
         if(messageType=="Property"){
+            let flattened = schemaDescriptor.messages[objectType].flattened;
+            if(flattened){
+                // A flattened property holds the value without a wrapper.
+                return this.protoToDict(obj, flattened, schemaDescriptor);
+            }
             return this.getPropertyValue(obj, objectType, schemaDescriptor);
         }
         else if(messageType=="EnumWrapper"){
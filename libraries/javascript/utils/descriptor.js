@@ -0,0 +1,56 @@
+// Copyright 2020 Google LLC
+
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+
+//     https://www.apache.org/licenses/LICENSE-2.0
+
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+"use strict";
+
+/**
+ * Return a schema descriptor of any version in the form of version 1, where
+ * every message lists all of its fields. In version 2 the fields inherited
+ * by a class are replaced by references to the messages of the classes that
+ * declare them, those messages are expanded when first accessed.
+ * @param  {Object} schemaDescriptor The JSON schemaDescriptor.
+ * @return {Object}      The schemaDescriptor with expanded messages.
+ */
+function expandDescriptor(schemaDescriptor){
+    if(!schemaDescriptor.version || schemaDescriptor.version == 1){
+        return schemaDescriptor;
+    }
+
+    const messages = schemaDescriptor.messages;
+    const cache = {};
+
+    const expanded = new Proxy(messages, {
+        get: (target, name) => {
+            let message = target[name];
+            if(message == null || message.inherits == null){
+                return message;
+            }
+
+            if(!(name in cache)){
+                // The own fields of a referenced message follow its '@id'.
+                let fields = message.fields.slice();
+                for(let x of message.inherits){
+                    fields = fields.concat(target[x].fields.slice(1));
+                }
+
+                cache[name] = {"@type": message["@type"], "fields": fields};
+            }
+
+            return cache[name];
+        }
+    });
+
+    return {"messages": expanded, "primitives": schemaDescriptor.primitives};
+};
+
+module.exports.expandDescriptor = expandDescriptor;
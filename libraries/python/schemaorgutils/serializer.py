@@ -19,16 +19,66 @@ from types import ModuleType
 from typing import Any, Union
 
 
+class _Dispatch():
+    """The resolved serialization of a message, which JSONLDSerializer keeps
+    for every descriptor it has seen.
+
+    Args:
+        kind (str): Value of the (type) option of the message, the @type of
+                    a class.
+        handler (function): Method of the serializer that is called with the
+                            object, the schema and this entry.
+        data (any): What the handler needs besides the object, see
+                    JSONLDSerializer._get_dispatch().
+
+    Attributes:
+        kind (str): Value of the (type) option of the message, the @type of
+                    a class.
+        handler (function): Method of the serializer that is called with the
+                            object, the schema and this entry.
+        data (any): What the handler needs besides the object.
+    """
+
+    __slots__ = ('kind', 'handler', 'data')
+
+    def __init__(self, kind: str, handler: Any, data: Any = None):
+        self.kind = kind
+        self.handler = handler
+        self.data = data
+
+
 class JSONLDSerializer():
     """The JSONLDSerializer generates JSONLD output for protocol buffer
     objects, that are generated from schemaorg releases.
 
+    Args:
+        serializers (module): Module with the serializers of the messages,
+                              schema_jsonld.py written by the protogenerator
+                              with --compiled-format jsonld_serializer.
+                              Messages it has no serializer for are
+                              serialized by reading their descriptors.
+
     Attributes:
+        cache_hits (int): Number of objects whose message was found in the
+                          dispatch cache.
+        cache_misses (int): Number of objects whose message was resolved
+                            and added to the dispatch cache.
         _primitive_types (set): Set of primitive types in python.
+        _serializers (dict): Serializer of every message by the full name of
+                             the message.
+        _dispatch (dict): The resolved serialization of every message by its
+                          descriptor.
     """
 
-    def __init__(self):
+    def __init__(self, serializers: ModuleType = None):
+        assert serializers is None or isinstance(
+            serializers, ModuleType), "Invalid parameter 'serializers' must be <class 'module'>."
+
         self._primitive_types = {float, int, str, bool}
+        self._serializers = serializers.SERIALIZERS if serializers else dict()
+        self._dispatch = dict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def write(self, obj: Any, outfile: str, schema: ModuleType):
         """Write JSONLD output to outfile.
@@ -51,73 +101,95 @@ class JSONLDSerializer():
         json.dump(out_obj, fp, indent=4, sort_keys=True)
         fp.close()
 
-    def __serialize_class(self, obj: Any, schema: ModuleType) -> dict:
+    def __serialize_class(self, obj: Any, schema: ModuleType,
+                          entry: _Dispatch) -> dict:
         """Convert a schema class to dictionary.
 
         Args:
             obj (protobuf object): Protobuf object of schema class.
             schema (module): Module containing compiled proto schema.
+            entry (_Dispatch): The resolved serialization of the class.
 
         Returns:
             dict: The schema class as a dictionary.
         """
 
         out_obj = {}
-        out_obj['@type'] = obj.DESCRIPTOR.GetOptions().Extensions[schema.type]
-        for descriptor in obj.DESCRIPTOR.fields:
-            value = getattr(obj, descriptor.name)
-
-            if descriptor.name == 'id':
-                if len(value) > 0:
-                    out_obj[descriptor.json_name] = value
-            elif len(value) > 0:
-                out_obj[descriptor.json_name] = [
-                    self.serialize_proto(x, schema) for x in value]
-                if len(out_obj[descriptor.json_name]) == 1:
-                    out_obj[descriptor.json_name] = out_obj[descriptor.json_name][0]
+        out_obj['@type'] = entry.kind
+        fields = entry.data
+        # Only the fields that are set are listed.
+        for descriptor, value in obj.ListFields():
+            json_name, is_id, is_message = fields[descriptor.number]
+
+            if is_id:
+                out_obj[json_name] = value
+                continue
+
+            if is_message:
+                value = [self.serialize_proto(x, schema) for x in value]
+            else:
+                # Flattened properties with a primitive range hold the
+                # values themselves.
+                value = list(value)
+
+            out_obj[json_name] = value[0] if len(value) == 1 else value
 
         return out_obj
 
-    def __serialize_property(self, obj: Any, schema: ModuleType) -> Any:
+    def __serialize_property(self, obj: Any, schema: ModuleType,
+                             entry: _Dispatch) -> Any:
         """Get value of a schema property.
 
         Args:
             obj (protobuf object): Protobuf object of schema property.
             schema (module): Module containing compiled proto schema.
+            entry (_Dispatch): The resolved serialization of the property.
 
         Returns:
             any: The value of schema property.
         """
 
-        for descriptor in obj.DESCRIPTOR.fields:
-            if obj.HasField(descriptor.name):
-                value = getattr(obj, descriptor.name)
-                return self.serialize_proto(value, schema)
+        name = obj.WhichOneof('values')
+        if name is not None:
+            return self.serialize_proto(getattr(obj, name), schema)
 
-    def __serialize_enum(
-            self, obj: Any, schema: ModuleType) -> Union[str, dict]:
+    def __serialize_enum(self, obj: Any, schema: ModuleType,
+                         entry: _Dispatch) -> Union[str, dict]:
         """Convert a schema enumeration to dictionary or string.
 
         Args:
             obj (protobuf object): Protobuf object of schema enumeration.
             schema (module): Module containing compiled proto schema.
+            entry (_Dispatch): The resolved serialization of the enumeration.
 
         Returns:
             union[str, dict]: The schema class as a dictionary or string.
         """
 
-        desciptor = obj.DESCRIPTOR.fields[0]
-
-        value = getattr(obj, desciptor.name)
-        name = desciptor.enum_type.values[value].name
+        urls, id_name, class_name = entry.data
 
-        if name != 'UNKNOWN':
-            return desciptor.enum_type.values[value].GetOptions(
-            ).Extensions[schema.schemaorg_value]
+        url = urls.get(getattr(obj, id_name))
+        if url is not None:
+            return url
         else:
-            desciptor = obj.DESCRIPTOR.fields[1]
-            value = getattr(obj, desciptor.name)
-            return self.serialize_proto(value, schema)
+            return self.serialize_proto(getattr(obj, class_name), schema)
+
+    def __serialize_with(self, obj: Any, schema: ModuleType,
+                         entry: _Dispatch) -> Any:
+        """Convert an object with the function of its entry, which only takes
+        the object.
+
+        Args:
+            obj (protobuf object): Protobuf object of a datatype or of a
+                                   message with a generated serializer.
+            schema (module): Module containing compiled proto schema.
+            entry (_Dispatch): The resolved serialization of the message.
+
+        Returns:
+            any: The value returned by the function.
+        """
+
+        return entry.data(obj)
 
     def __serialize_date(self, obj: Any) -> str:
         """Convert a protobuf date object to python date object.
@@ -254,30 +326,78 @@ class JSONLDSerializer():
         if self.__check_primitive(obj):
             return obj
 
-        messageType = obj.DESCRIPTOR.GetOptions().Extensions[schema.type]
-        if messageType == 'Property':
-            return self.__serialize_property(obj, schema)
+        entry = self._dispatch.get(obj.DESCRIPTOR)
+        if entry is None:
+            entry = self._get_dispatch(obj.DESCRIPTOR, schema)
+            self._dispatch[obj.DESCRIPTOR] = entry
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
 
-        elif messageType == 'EnumWrapper':
-            return self.__serialize_enum(obj, schema)
+        return entry.handler(obj, schema, entry)
+
+    def _get_dispatch(self, descriptor: Any, schema: ModuleType) -> _Dispatch:
+        """Resolve how the objects of a message are serialized.
+
+        The data of the entry is the json name, whether it is the @id and
+        whether its values are messages of every field of a class by field
+        number; the URLs of the values by number and the names of the two
+        fields of an enumeration; the function of a datatype or the
+        generated serializer of the message.
+
+        Args:
+            descriptor (Descriptor): Descriptor of the message.
+            schema (module): Module containing compiled proto schema.
+
+        Returns:
+            _Dispatch: The resolved serialization of the message.
+        """
+
+        messageType = descriptor.GetOptions().Extensions[schema.type]
 
-        elif messageType == 'DatatypeDate':
-            return self.__serialize_date(obj)
+        serialize = self._serializers.get(descriptor.full_name)
+        if serialize is not None:
+            return _Dispatch(messageType, self.__serialize_with, serialize)
 
-        elif messageType == 'DatatypeTime':
-            return self.__serialize_time(obj)
+        if messageType == 'Property':
+            return _Dispatch(messageType, self.__serialize_property)
 
-        elif messageType == 'DatatypeDateTime':
-            return self.__serialize_datetime(obj)
+        elif messageType == 'EnumWrapper':
+            id_field = descriptor.fields[0]
+            urls = {x.number: x.GetOptions().Extensions[schema.schemaorg_value]
+                    for x in id_field.enum_type.values if x.name != 'UNKNOWN'}
+            return _Dispatch(messageType, self.__serialize_enum, (
+                urls, id_field.name, descriptor.fields[1].name))
+
+        datatypes = {
+            'DatatypeDate': self.__serialize_date,
+            'DatatypeTime': self.__serialize_time,
+            'DatatypeDateTime': self.__serialize_datetime,
+            'DatatypeQuantitative': self.__serialize_quantitative,
+            'DatatypeDuration': self.__serialize_duration
+        }
+        if messageType in datatypes:
+            return _Dispatch(messageType, self.__serialize_with,
+                             datatypes[messageType])
+
+        fields = {x.number: (x.json_name, x.name == 'id',
+                             x.type == x.TYPE_MESSAGE)
+                  for x in descriptor.fields}
+        return _Dispatch(messageType, self.__serialize_class, fields)
+
+    def get_cache_hit_rate(self) -> float:
+        """Return the share of serialized objects whose message was found in
+        the dispatch cache.
 
-        elif messageType == 'DatatypeQuantitative':
-            return self.__serialize_quantitative(obj)
+        Returns:
+            float: The hit rate, 0 if nothing has been serialized.
+        """
 
-        elif messageType == 'DatatypeDuration':
-            return self.__serialize_duration(obj)
+        lookups = self.cache_hits + self.cache_misses
+        if lookups == 0:
+            return 0.0
 
-        else:
-            return self.__serialize_class(obj, schema)
+        return self.cache_hits / lookups
 
 
 class JSONLDFeedSerializer(JSONLDSerializer):
@@ -289,6 +409,8 @@ class JSONLDFeedSerializer(JSONLDSerializer):
         feed_type (str): Type of feed that has to be generated
                              (ItemList/DateFeed).
         validator (SchemaValidator): Validator to check conformance before serializing.
+        serializers (module): Module with the serializers of the messages,
+                              see JSONLDSerializer.
 
     Attributes:
         _validator (SchemaValidator): Validator check conformance before serializing.
@@ -299,9 +421,10 @@ class JSONLDFeedSerializer(JSONLDSerializer):
     """
 
     def __init__(self, outfile: str, feed_type: str = 'ItemList',
-                 validator: validator.SchemaValidator = None):
+                 validator: validator.SchemaValidator = None,
+                 serializers: ModuleType = None):
 
-        JSONLDSerializer.__init__(self)
+        JSONLDSerializer.__init__(self, serializers)
         assert isinstance(
             outfile, str), "Invalid parameter 'outfile' must be 'str'."
         assert feed_type == 'ItemList' or feed_type == 'DataFeed', "feed_type must be 'ItemList' or 'DataFeed'."
@@ -294,3 +294,33 @@ def test_enumeration():
     }
     output = j.serialize_proto(c, schema)
     assert output == expected, 'Enumeration(Class) serialization failed.'
+
+
+def test_dispatch_cache():
+    """Test the dispatch cache of the serializer.
+    Procedure:
+        - Create a new serializer.
+        - Serialize a class with a text value and two date values twice.
+
+    Verification:
+        - Check if the class, the properties and the datatype are resolved
+          once and found in the cache afterwards.
+        - Check if both serializations return the same value.
+        - Check if the hit rate is the share of cache hits.
+    """
+
+    j = serializer.JSONLDSerializer()
+    assert j.get_cache_hit_rate() == 0, 'Hit rate without lookups failed.'
+
+    c = schema.Movie()
+    c.name.add().text = 'Name 1'
+    c.date_created.add().date.year = 2000
+    c.date_created.add().date.year = 2001
+
+    first = j.serialize_proto(c, schema)
+    assert (j.cache_hits, j.cache_misses) == (2, 4), 'Dispatch cache misses failed.'
+
+    second = j.serialize_proto(c, schema)
+    assert (j.cache_hits, j.cache_misses) == (8, 4), 'Dispatch cache hits failed.'
+    assert first == second, 'Cached serialization failed.'
+    assert j.get_cache_hit_rate() == 8 / 12, 'Hit rate failed.'
@@ -0,0 +1,190 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+import os
+import core.batch_generator as batch_generator
+import core.field_numbers as field_numbers
+import core.release_store as release_store
+import core.schema_cache as schema_cache
+import core.schema_generator as schema_generator
+import core.template_registry as template_registry
+
+parser = argparse.ArgumentParser()
+
+parser.add_argument('-s',
+                    '--SRC',
+                    nargs=2,
+                    action='append',
+                    default=[],
+                    metavar=('SRC', 'OUT'),
+                    help='Path to source file and output directory')
+
+parser.add_argument('-v',
+                    '--VER',
+                    nargs=2,
+                    action='append',
+                    default=[],
+                    metavar=('VER', 'OUT'),
+                    help='Schema.org release number and output directory')
+
+parser.add_argument('-p',
+                    '--PKG',
+                    type=str,
+                    help='Proto package name', required=True)
+
+parser.add_argument('-w',
+                    '--workers',
+                    type=int,
+                    default=os.cpu_count(),
+                    help='Number of worker processes')
+
+parser.add_argument('--descriptor-format',
+                    type=str,
+                    choices=['json', 'binary', 'both'],
+                    default='both',
+                    help='Format of the schema descriptor')
+
+parser.add_argument('--descriptor-version',
+                    type=int,
+                    choices=list(schema_generator.DESCRIPTOR_VERSIONS),
+                    default=1,
+                    help='Version of schema_descriptor.json')
+
+parser.add_argument('--cache-dir',
+                    type=str,
+                    default=schema_cache.DEFAULT_CACHE_DIR,
+                    help='Path to directory where parsed schemas and '
+                    'releases are cached')
+
+parser.add_argument('--cache-size',
+                    type=int,
+                    default=schema_cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+                    help='Maximum size of the cache directory in MB')
+
+parser.add_argument('--no-cache',
+                    action='store_true',
+                    help='Always parse the schemas and do not use the cache')
+
+parser.add_argument('--offline',
+                    action='store_true',
+                    help='Only use releases that are already in the cache')
+
+parser.add_argument('--usage-profile',
+                    type=str,
+                    help='Path to a usage profile written by usage_profile.py, '
+                    'the most used properties get the field numbers up to 15')
+
+parser.add_argument('--field-lock',
+                    type=str,
+                    help='Path to the lock file of the field numbers of every '
+                    'message, fields keep their numbers across releases and '
+                    'the numbers of removed fields are reserved, '
+                    'shared by all schemas of the batch')
+
+parser.add_argument('--flatten',
+                    action='store_true',
+                    help='Write properties whose range maps to a single proto '
+                    'type as fields of that type without a wrapper message')
+
+parser.add_argument('--compiled-format',
+                    type=str,
+                    action='append',
+                    choices=['descriptor_set', 'python', 'python_package',
+                             'jsonld_serializer', 'both'],
+                    help='Also write the descriptors protoc builds from '
+                    'schema.proto without running protoc, as schema.pb, '
+                    'schema_pb2.py, both or as the package schema that '
+                    'loads messages lazily, or the JSON-LD serializers of '
+                    'the messages as schema_jsonld.py, can be given several '
+                    'times')
+
+
+def main():
+    args = parser.parse_args()
+
+    if not args.SRC and not args.VER:
+        parser.error('at least one of --SRC or --VER is required')
+
+    descriptor_formats = schema_generator.DESCRIPTOR_FORMATS
+    if args.descriptor_format != 'both':
+        descriptor_formats = [args.descriptor_format]
+
+    compiled_formats = set()
+    for x in args.compiled_format or ():
+        if x == 'both':
+            compiled_formats.update(['descriptor_set', 'python'])
+        else:
+            compiled_formats.add(x)
+
+    usage_profile = None
+    if args.usage_profile:
+        usage_profile = field_numbers.load_profile(args.usage_profile)
+
+    cache = None
+    if not args.no_cache:
+        cache = schema_cache.SchemaCache(
+            args.cache_dir, args.cache_size * 1024 * 1024)
+        template_registry.configure(
+            os.path.join(args.cache_dir, 'templates'))
+
+    store = release_store.ReleaseStore(
+        os.path.join(args.cache_dir, 'releases'), offline=args.offline)
+
+    batch = batch_generator.BatchGenerator(
+        args.PKG, args.workers, cache, store,
+        descriptor_formats=descriptor_formats,
+        descriptor_version=args.descriptor_version,
+        usage_profile=usage_profile,
+        field_lock=args.field_lock,
+        flatten=args.flatten,
+        compiled_formats=compiled_formats)
+
+    for src, dest in args.SRC:
+        os.makedirs(dest, exist_ok=True)
+        batch.add_source(src, dest)
+
+    for ver, dest in args.VER:
+        os.makedirs(dest, exist_ok=True)
+        batch.add_release(ver, dest)
+
+    print(batch_generator.format_summary(batch.run()), end='')
+
+
+if __name__ == '__main__':
+    """Generates protobuf code for several schemas in one run.
+
+    Args:
+        -h, --help  Show this help message and exit
+        -s, --SRC   Path to source file and output directory, repeatable
+        -v, --VER   Schema.org release number and output directory, repeatable
+        -p, --PKG   Proto package name
+        -w, --workers           Number of worker processes
+        --descriptor-format     Format of the schema descriptor: json, binary
+                                or both
+        --descriptor-version    Version of schema_descriptor.json: 1 or 2
+        --cache-dir     Path to directory where parsed schemas and releases
+                        are cached
+        --cache-size    Maximum size of the cache directory in MB
+        --no-cache      Always parse the schemas and do not use the cache
+        --offline       Only use releases that are already in the cache
+        --usage-profile Path to a usage profile written by usage_profile.py
+        --field-lock    Path to the lock file of the field numbers
+        --flatten       Write properties with a single type without a
+                        wrapper message
+        --compiled-format   Also write schema.pb, schema_pb2.py, both or
+                            the lazily loaded package schema without
+                            running protoc, or the JSON-LD serializers
+                            schema_jsonld.py
+    """
+    main()
@@ -0,0 +1,81 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark loading schema_descriptor.json and schema_descriptor.bin and
+looking up a few messages, as a serializer does at startup.
+
+Run from the protogenerator directory on the output of main.py:
+
+    python3 -m benchmarks.bench_descriptor ./out/
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+import core.binary_descriptor as binary_descriptor
+
+# Messages looked up after loading, a serializer only needs the messages of
+# the objects it serializes.
+LOOKUPS = ['Thing', 'CreativeWork', 'Movie', 'Person', 'name', 'url', 'Date']
+
+
+def load_json(path: str):
+    descriptor = json.load(open(path + 'schema_descriptor.json', 'r'))
+    return [descriptor['messages'].get(x) for x in LOOKUPS], descriptor
+
+
+def load_binary(path: str):
+    descriptor = binary_descriptor.load(path + 'schema_descriptor.bin')
+    return [descriptor.messages.get(x) for x in LOOKUPS], descriptor
+
+
+def measure(fn, path: str) -> str:
+    """Return the wall time and the peak of allocated memory of fn(path).
+
+    Args:
+        fn (function): The function to measure.
+        path (str): Path to the output directory of the generator.
+    """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result[0]
+    return '{:10.2f}ms {:10.1f}KB'.format(elapsed * 1000, peak / 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', type=str,
+                        help='Output directory of the generator')
+    args = parser.parse_args()
+
+    path = os.path.join(args.path, '')
+    print('{:>8} {:>10} {:>12} {:>12}'.format(
+        'format', 'size', 'time', 'memory'))
+
+    for name, fn, filename in [
+            ('json', load_json, 'schema_descriptor.json'),
+            ('binary', load_binary, 'schema_descriptor.bin')]:
+        size = os.path.getsize(path + filename)
+        print('{:>8} {:>8.1f}KB {}'.format(
+            name, size / 1024, measure(fn, path)))
+
+
+if __name__ == '__main__':
+    main()
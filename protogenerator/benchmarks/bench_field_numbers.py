@@ -0,0 +1,155 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the wire size of a JSON-LD corpus encoded with the default
+field numbers and with field numbers chosen from a usage profile of the same
+corpus.
+
+The size is computed from a version 1 schema_descriptor.json, whose fields
+are listed in the order they are numbered, so no compiled schema is needed.
+Run from the protogenerator directory:
+
+    python3 -m benchmarks.bench_field_numbers \\
+        ../schema/releases/v8.0/schema_descriptor.json \\
+        ../libraries/python/example/dump.json
+"""
+import argparse
+import json
+import core.field_numbers as field_numbers
+import utils.utils as utils
+from typing import Any, Dict, List
+
+
+def varint_size(x: int) -> int:
+    n = 1
+    while x >= 0x80:
+        x >>= 7
+        n += 1
+
+    return n
+
+
+def field_size(number: int, payload: int) -> int:
+    """Return the size of a length delimited field."""
+
+    return varint_size(number << 3) + varint_size(payload) + payload
+
+
+class Sizer():
+    """Compute the encoded size of JSON-LD entities.
+
+    Args:
+        messages (dict): Messages of schema_descriptor.json.
+        numbers (dict[str, dict[str, int]]): Field numbers of every class.
+    """
+
+    def __init__(self, messages: Dict[str, Any],
+                 numbers: Dict[str, Dict[str, int]]):
+        self.messages = messages
+        self.numbers = numbers
+        self.tags = 0
+
+    def entity(self, x: Dict[str, Any]) -> int:
+        name = x.get('@type')
+        numbers = self.numbers.get(name, dict())
+        size = 0
+
+        if '@id' in x:
+            size += field_size(1, len(str(x['@id']).encode('utf-8')))
+
+        for key, value in x.items():
+            if key not in numbers:
+                continue
+
+            for v in value if isinstance(value, list) else [value]:
+                n = numbers[key]
+                self.tags += varint_size(n << 3)
+                size += field_size(n, self.value(key, v))
+
+        return size
+
+    def value(self, prop: str, x: Any) -> int:
+        field_types = self.messages[prop]['fields']
+
+        if isinstance(x, dict) and x.get('@type') in field_types:
+            return field_size(field_types.index(x['@type']) + 1,
+                              self.entity(x))
+
+        # Values that are not entities are encoded as the first datatype of
+        # the range, the size of the number is close enough for numbers.
+        return field_size(1, len(str(x).encode('utf-8')))
+
+
+def get_numbers(messages: Dict[str, Any], profile: Dict[str, Dict[str, int]],
+                hot: bool) -> Dict[str, Dict[str, int]]:
+    numbers = dict()
+    for name, message in messages.items():
+        if message['@type'] in ('Property', 'EnumWrapper'):
+            continue
+
+        fields = message.get('fields', ['@id'])[1:]
+        pinned = None
+        if hot:
+            pinned = field_numbers.get_hot_fields(
+                fields, profile.get(name, dict()))
+
+        numbers[name] = utils.get_field_numbers(fields, pinned, 2)
+
+    return numbers
+
+
+def get_entities(corpus: List[Any]) -> List[Dict[str, Any]]:
+    entities = list()
+    stack = list(corpus)
+    while stack:
+        x = stack.pop()
+        if isinstance(x, list):
+            stack.extend(x)
+        elif isinstance(x, dict):
+            if '@type' in x:
+                entities.append(x)
+            else:
+                stack.extend(x.values())
+
+    return entities
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('descriptor', type=str,
+                        help='Path to a version 1 schema_descriptor.json')
+    parser.add_argument('corpus', type=str, nargs='+',
+                        help='Paths to JSON-LD documents')
+    args = parser.parse_args()
+
+    messages = json.load(open(args.descriptor, 'r'))['messages']
+    corpus = [json.load(open(x, 'r')) for x in args.corpus]
+    entities = get_entities(corpus)
+    profile = field_numbers.collect_profile(corpus)
+
+    print('{} top level entities'.format(len(entities)))
+    print('{:>10} {:>12} {:>12}'.format('numbers', 'size', 'tag bytes'))
+
+    sizes = dict()
+    for name, hot in [('default', False), ('profiled', True)]:
+        sizer = Sizer(messages, get_numbers(messages, profile, hot))
+        sizes[name] = sum(sizer.entity(x) for x in entities)
+        print('{:>10} {:>10.1f}KB {:>10.1f}KB'.format(
+            name, sizes[name] / 1024, sizer.tags / 1024))
+
+    print('reduction {:.1f}%'.format(
+        100 * (1 - sizes['profiled'] / sizes['default'])))
+
+
+if __name__ == '__main__':
+    main()
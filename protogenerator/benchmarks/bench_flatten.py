@@ -0,0 +1,198 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark building, encoding, decoding and serializing to JSON-LD objects
+of a schema class with every property wrapped in a message and with
+flattened properties.
+
+Both schemas are compiled with grpcio-tools and measured in a process of
+their own, as the messages of both cannot share a descriptor pool. JSON-LD
+serialization uses schemaorgutils from ../libraries/python and is skipped if
+it cannot be imported. Run from the protogenerator directory:
+
+    python3 -m benchmarks.bench_flatten ./schema.nt --type Movie
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import core.schema_generator as schema_generator
+from typing import Any, Dict
+
+_LIBRARY_PATH = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), '..', '..', 'libraries', 'python')
+
+
+def compile_proto(path: str):
+    import grpc_tools
+    from grpc_tools import protoc
+
+    include = os.path.join(os.path.dirname(grpc_tools.__file__), '_proto')
+    if protoc.main(['protoc', '-I' + path, '-I' + include,
+                    '--python_out=' + path, 'schema.proto']) != 0:
+        raise RuntimeError('protoc failed for ' + path + '.')
+
+
+def sample(field: Any) -> Any:
+    if field.type == field.TYPE_STRING:
+        return 'value'
+    if field.type == field.TYPE_BOOL:
+        return True
+    if field.type in (field.TYPE_DOUBLE, field.TYPE_FLOAT):
+        return 1.5
+
+    return 1
+
+
+def set_value(message: Any, schema: Any, depth: int):
+    """Set a value of the message of a property, enumeration, datatype or
+    class, classes below depth only get an @id.
+    """
+
+    kind = message.DESCRIPTOR.GetOptions().Extensions[schema.type]
+    fields = message.DESCRIPTOR.fields
+
+    if kind == 'Property':
+        scalars = [x for x in fields if x.type != x.TYPE_MESSAGE]
+        if scalars:
+            setattr(message, scalars[0].name, sample(scalars[0]))
+        else:
+            set_value(getattr(message, fields[0].name), schema, depth)
+    elif kind == 'EnumWrapper':
+        message.id = fields[0].enum_type.values[-1].number
+    elif kind.startswith('Datatype'):
+        # Strings of datatypes are units and timezones, which are optional.
+        for x in fields:
+            if x.type == x.TYPE_MESSAGE:
+                set_value(getattr(message, x.name), schema, depth)
+            elif x.type != x.TYPE_STRING:
+                setattr(message, x.name, sample(x))
+    elif depth > 0:
+        fill(message, schema, depth - 1)
+    else:
+        message.id = 'id'
+
+
+def fill(message: Any, schema: Any, depth: int):
+    """Give every property of a class one value."""
+
+    for x in message.DESCRIPTOR.fields:
+        if x.name == 'id':
+            message.id = 'id'
+        elif x.type != x.TYPE_MESSAGE:
+            getattr(message, x.name).append(sample(x))
+        else:
+            set_value(getattr(message, x.name).add(), schema, depth)
+
+
+def measure(path: str, name: str, count: int) -> Dict[str, Any]:
+    """Measure the schema compiled into path, in the current process."""
+
+    sys.path.insert(0, path)
+    sys.path.insert(0, _LIBRARY_PATH)
+    import schema_pb2
+
+    cls = getattr(schema_pb2, name)
+    result = dict()
+
+    start = time.perf_counter()
+    objects = list()
+    for _ in range(count):
+        obj = cls()
+        fill(obj, schema_pb2, 1)
+        objects.append(obj)
+    result['build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = [x.SerializeToString() for x in objects]
+    result['encode'] = time.perf_counter() - start
+    result['size'] = sum(map(len, data))
+
+    start = time.perf_counter()
+    objects = [cls.FromString(x) for x in data]
+    result['decode'] = time.perf_counter() - start
+
+    try:
+        import schemaorgutils.serializer as serializer
+    except ImportError:
+        return result
+
+    jsonld = serializer.JSONLDSerializer()
+    start = time.perf_counter()
+    out = [jsonld.serialize_proto(x, schema_pb2) for x in objects]
+    result['jsonld'] = time.perf_counter() - start
+    result['digest'] = hashlib.sha256(json.dumps(
+        out, sort_keys=True).encode('utf-8')).hexdigest()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('src', type=str, nargs='?',
+                        help='Path to the schema')
+    parser.add_argument('--type', type=str, default='Movie',
+                        help='Schema class of the objects')
+    parser.add_argument('--count', type=int, default=200,
+                        help='Number of objects')
+    parser.add_argument('--measure', type=str,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.type, args.count)))
+        return
+
+    if not args.src:
+        parser.error('the path to the schema is required')
+
+    gen = schema_generator.SchemaGenerator(args.src)
+    print('{:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'mode', 'proto', 'size', 'build', 'encode', 'decode', 'jsonld'))
+
+    digests = set()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode, flatten in [('wrapped', False), ('flattened', True)]:
+            path = os.path.join(tmp_dir, mode, '')
+            os.mkdir(path)
+            gen.write_proto(path, 'schemaorg', descriptor_formats=['json'],
+                            flatten=flatten)
+            compile_proto(path)
+
+            result = json.loads(subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_flatten',
+                 '--measure', path, '--type', args.type,
+                 '--count', str(args.count)],
+                check=True, stdout=subprocess.PIPE).stdout)
+
+            jsonld = 'n/a'
+            if 'jsonld' in result:
+                jsonld = '{:.1f}ms'.format(result['jsonld'] * 1000)
+                digests.add(result['digest'])
+
+            print('{:>10} {:>8.1f}KB {:>8.1f}KB {:>8.1f}ms {:>8.1f}ms {:>8.1f}ms {:>10}'.format(
+                mode, os.path.getsize(path + 'schema.proto') / 1024,
+                result['size'] / 1024, result['build'] * 1000,
+                result['encode'] * 1000, result['decode'] * 1000, jsonld))
+
+    if digests:
+        print('JSON-LD output is {}.'.format(
+            'identical' if len(digests) == 1 else 'different'))
+
+
+if __name__ == '__main__':
+    main()
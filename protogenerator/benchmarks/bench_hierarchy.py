@@ -0,0 +1,165 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark utils.topological_sort() and utils.get_children() on synthetic
+class hierarchies and compare them with the previous recursive versions.
+
+Run from the protogenerator directory:
+
+    python3 -m benchmarks.bench_hierarchy
+"""
+import argparse
+import random
+import sys
+import time
+import utils.utils as utils
+from typing import Any, Dict
+
+
+def recursive_topological_sort(graph: dict) -> list:
+    """Previous recursive implementation of utils.topological_sort()."""
+
+    seen = set()
+    answer = []
+
+    def visit(src):
+        seen.add(src)
+        for i in graph[src]:
+            if i not in seen:
+                visit(i)
+        answer.insert(0, src)
+
+    for x in graph:
+        if x not in seen:
+            visit(x)
+
+    return answer
+
+
+def recursive_get_children(graph: Dict[Any, set]) -> Dict[Any, set]:
+    """Previous recursive implementation of utils.get_children()."""
+
+    class_to_children = {}
+    seen = set()
+
+    def visit(src):
+        seen.add(src)
+        if src not in class_to_children:
+            class_to_children[src] = set()
+
+        for i in graph[src]:
+            class_to_children[src].add(i)
+            if i not in seen:
+                visit(i)
+
+            class_to_children[src] = class_to_children[src] | class_to_children[i]
+
+    for x in graph.keys():
+        if x not in seen:
+            visit(x)
+
+    return class_to_children
+
+
+def make_hierarchy(n: int, depth: int, extra_parents: float) -> Dict[str, set]:
+    """Return a synthetic hierarchy in the format used by SchemaGenerator,
+    mapping every class to its direct children.
+
+    Args:
+        n (int): Number of classes.
+        depth (int): Maximum depth of the hierarchy.
+        extra_parents (float): Fraction of classes with a second parent.
+
+    Returns:
+        dict[str, set]: The hierarchy.
+    """
+
+    rnd = random.Random(n)
+    levels = [['http://schema.org/Thing']]
+    graph = {'http://schema.org/Thing': set()}
+
+    for i in range(1, n):
+        level = 1 + (i - 1) * (depth - 1) // (n - 1)
+        if level == len(levels):
+            levels.append([])
+
+        name = 'http://schema.org/Class' + str(i)
+        graph[name] = set()
+        graph[rnd.choice(levels[level - 1])].add(name)
+
+        if level > 1 and rnd.random() < extra_parents:
+            graph[rnd.choice(levels[level - 2])].add(name)
+
+        levels[level].append(name)
+
+    return graph
+
+
+def measure(fn, graph, lookups: int = 0) -> str:
+    """Return the wall time of fn(graph) as a string.
+
+    Args:
+        fn (function): The function to measure.
+        graph (dict): The hierarchy.
+        lookups (int): Number of classes whose children are looked up in the
+                       result of fn, like the generator does for the classes
+                       in range of properties.
+    """
+
+    try:
+        start = time.perf_counter()
+        result = fn(graph)
+        for x in list(graph)[:lookups]:
+            len(result[x])
+        return '{:8.3f}s'.format(time.perf_counter() - start)
+    except RecursionError:
+        return 'RecursionError'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=str, default='10000,30000,100000',
+                        help='Comma separated number of classes')
+    parser.add_argument('--depth', type=int, default=12,
+                        help='Maximum depth of the hierarchy')
+    parser.add_argument('--deep-sizes', type=str, default='10000,30000',
+                        help='Comma separated number of classes for deep '
+                        'hierarchies')
+    parser.add_argument('--deep-depth', type=int, default=2000,
+                        help='Maximum depth of deep hierarchies')
+    args = parser.parse_args()
+
+    # Same as the default of the interpreter, so that the recursive versions
+    # fail where they would fail in the generator.
+    sys.setrecursionlimit(1000)
+
+    # The v8.0 release has roughly one class in range of a property for
+    # every two classes.
+    print('{:>8} {:>6} {:>15} {:>15} {:>15} {:>15}'.format(
+        'classes', 'depth', 'topsort old', 'topsort new', 'children old',
+        'children new'))
+
+    for depth, sizes in [(args.depth, args.sizes),
+                         (args.deep_depth, args.deep_sizes)]:
+        for n in map(int, sizes.split(',')):
+            graph = make_hierarchy(n, depth, 0.05)
+            print('{:>8} {:>6} {:>15} {:>15} {:>15} {:>15}'.format(
+                n, depth,
+                measure(recursive_topological_sort, graph),
+                measure(utils.topological_sort, graph),
+                measure(recursive_get_children, graph, n // 2),
+                measure(utils.get_children, graph, n // 2)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark downloading and parsing a release from a throttled local HTTP
+server, first downloading the whole release and then parsing it, and
+parsing the release while it is downloaded.
+
+Run from the protogenerator directory:
+
+    python3 -m benchmarks.bench_release ./schema.nt --rate 5
+"""
+import argparse
+import http.server
+import tempfile
+import threading
+import time
+import core.release_store as release_store
+import core.schema_generator as schema_generator
+
+
+def make_handler(content: bytes, rate: float, chunk_size: int = 1 << 14):
+    """Return a request handler that serves content at rate MB/s."""
+
+    class ThrottledHandler(http.server.BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+
+            delay = chunk_size / (rate * 1024 * 1024)
+            for i in range(0, len(content), chunk_size):
+                self.wfile.write(content[i:i + chunk_size])
+                time.sleep(delay)
+
+        def log_message(self, *args):
+            pass
+
+    return ThrottledHandler
+
+
+def download_then_parse(store: release_store.ReleaseStore):
+    path = store.fetch('bench')
+    return schema_generator.SchemaGenerator(path)
+
+
+def parse_stream(store: release_store.ReleaseStore):
+    with store.open('bench') as f:
+        return schema_generator.SchemaGenerator(f)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('src', type=str, help='Path to a schema.nt file')
+    parser.add_argument('--rate', type=float, default=5,
+                        help='Transfer rate of the server in MB/s')
+    args = parser.parse_args()
+
+    content = open(args.src, 'rb').read()
+    server = http.server.HTTPServer(
+        ('127.0.0.1', 0), make_handler(content, args.rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/{{}}/schema.nt'.format(server.server_port)
+
+    print('{:>22} {:>10}'.format('mode', 'time'))
+
+    try:
+        for name, fn in [('download then parse', download_then_parse),
+                         ('parse while download', parse_stream)]:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                store = release_store.ReleaseStore(cache_dir, url)
+                start = time.perf_counter()
+                fn(store)
+                print('{:>22} {:>9.2f}s'.format(
+                    name, time.perf_counter() - start))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark serializing objects of schema classes to JSON-LD with the
+generic JSONLDSerializer and with the serializers of schema_jsonld.py.
+
+The objects are built like in bench_flatten, every property of the class has
+a value and the classes of the values are filled down to --depth. The
+schema is written with --compiled-format python jsonld_serializer and
+measured in a process of its own for the wrapped and flattened forms.
+schemaorgutils is imported from ../libraries/python. Run from the
+protogenerator directory:
+
+    python3 -m benchmarks.bench_serializer ./schema.nt --type Movie TVSeries
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import core.schema_generator as schema_generator
+from benchmarks.bench_flatten import fill
+from typing import Any, Dict, List
+
+_LIBRARY_PATH = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), '..', '..', 'libraries', 'python')
+
+
+def measure(path: str, names: List[str], count: int,
+            depth: int) -> Dict[str, Any]:
+    """Measure the schema written into path, in the current process."""
+
+    sys.path.insert(0, path)
+    sys.path.insert(0, _LIBRARY_PATH)
+    import schema_pb2
+    import schema_jsonld
+    import schemaorgutils.serializer as serializer
+
+    result = dict()
+    for name in names:
+        objects = list()
+        for _ in range(count):
+            obj = getattr(schema_pb2, name)()
+            fill(obj, schema_pb2, depth)
+            objects.append(obj)
+
+        digests = list()
+        for mode, jsonld in [
+                ('generic', serializer.JSONLDSerializer()),
+                ('generated', serializer.JSONLDSerializer(schema_jsonld))]:
+            start = time.perf_counter()
+            out = [jsonld.serialize_proto(x, schema_pb2) for x in objects]
+            result[name + '/' + mode] = time.perf_counter() - start
+            digests.append(hashlib.sha256(json.dumps(
+                out, sort_keys=True).encode('utf-8')).hexdigest())
+
+        result[name + '/identical'] = digests[0] == digests[1]
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('src', type=str, nargs='?',
+                        help='Path to the schema')
+    parser.add_argument('--type', type=str, nargs='+',
+                        default=['Movie', 'TVSeries'],
+                        help='Schema classes of the objects')
+    parser.add_argument('--count', type=int, default=200,
+                        help='Number of objects of every class')
+    parser.add_argument('--depth', type=int, default=2,
+                        help='Depth to which the values are filled')
+    parser.add_argument('--measure', type=str,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.type, args.count,
+                                 args.depth)))
+        return
+
+    if not args.src:
+        parser.error('the path to the schema is required')
+
+    gen = schema_generator.SchemaGenerator(args.src)
+    print('{:>10} {:>16} {:>10} {:>10} {:>8} {:>10}'.format(
+        'mode', 'type', 'generic', 'generated', 'speedup', 'output'))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode, flatten in [('wrapped', False), ('flattened', True)]:
+            path = os.path.join(tmp_dir, mode, '')
+            os.mkdir(path)
+            gen.write_proto(path, 'schemaorg', descriptor_formats=[],
+                            flatten=flatten, compiled_formats=[
+                                'python', 'jsonld_serializer'])
+
+            result = json.loads(subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_serializer',
+                 '--measure', path, '--type'] + args.type + [
+                    '--count', str(args.count), '--depth', str(args.depth)],
+                check=True, stdout=subprocess.PIPE).stdout)
+
+            for name in args.type:
+                generic = result[name + '/generic']
+                generated = result[name + '/generated']
+                print('{:>10} {:>16} {:>8.1f}ms {:>8.1f}ms {:>7.1f}x {:>10}'.format(
+                    mode, name, generic * 1000, generated * 1000,
+                    generic / generated, 'identical' if result[
+                        name + '/identical'] else 'different'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import concurrent.futures
+import os
+import time
+import core.release_store as release_store
+import core.schema_cache as schema_cache
+import core.schema_generator as schema_generator
+import core.template_registry as template_registry
+from core.schema_model import SchemaModel
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _parse(src_file_path: str,
+           cache: Optional[schema_cache.SchemaCache]) -> Tuple[SchemaModel, float]:
+    """Parse a schema and build its model. This is the unit of work sent to
+    worker processes.
+
+    Args:
+        src_file_path (str): Path to the file containing schema.
+        cache (SchemaCache): Cache of parsed schemas.
+
+    Returns:
+        SchemaModel: The model of the schema.
+        float: Time spent parsing in seconds.
+    """
+
+    start = time.perf_counter()
+    model = schema_generator.SchemaGenerator(src_file_path, cache).get_model()
+    return model, time.perf_counter() - start
+
+
+class _RenderCache(dict):
+    """Render cache that counts the blocks that are read from it."""
+
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def __getitem__(self, key: tuple) -> str:
+        self.lookups += 1
+        return super().__getitem__(key)
+
+
+class BatchGenerator():
+    """The BatchGenerator generates the protobuf code for several schemas in
+    one run. The schemas are parsed in a pool of worker processes, and the
+    proto code of every schema is rendered in the same pool in the order the
+    schemas were added. A class, enumeration or property whose proto code is
+    the same as in an earlier schema is not rendered again, so consecutive
+    releases only pay for the parts that changed between them. The templates
+    are compiled once before the pool is started.
+
+    Args:
+        package_name (str): Package name for the proto code.
+        workers (int): Number of worker processes.
+        cache (SchemaCache): Cache of parsed schemas, schemas are always
+                             parsed if it is None.
+        store (ReleaseStore): Store used to fetch releases.
+        options (dict): Keyword arguments passed to
+                        SchemaGenerator.write_proto().
+
+    Attributes:
+        package_name (str): Package name for the proto code.
+        workers (int): Number of worker processes.
+        cache (SchemaCache): Cache of parsed schemas.
+        store (ReleaseStore): Store used to fetch releases.
+        options (dict): Keyword arguments passed to
+                        SchemaGenerator.write_proto().
+    """
+
+    def __init__(self, package_name: str, workers: int = 1,
+                 cache: Optional[schema_cache.SchemaCache] = None,
+                 store: Optional[release_store.ReleaseStore] = None,
+                 **options: Any):
+
+        assert isinstance(
+            package_name, str), "Invalid parameter 'package_name' must be 'str'."
+        assert isinstance(
+            workers, int) and workers > 0, "Invalid parameter 'workers' must be a positive 'int'."
+
+        self.package_name = package_name
+        self.workers = workers
+        self.cache = cache
+        self.store = store
+        self.options = options
+        self.__jobs = list()
+
+    def add_source(self, src_file_path: str, dst_path: str):
+        """Add a schema file to the batch.
+
+        Args:
+            src_file_path (str): Path to the file containing schema.
+            dst_path (str): Path to the output directory.
+        """
+
+        self.__jobs.append((src_file_path, None, dst_path))
+
+    def add_release(self, version: str, dst_path: str):
+        """Add a schema.org release to the batch.
+
+        Args:
+            version (str): Schema.org release number.
+            dst_path (str): Path to the output directory.
+        """
+
+        self.__jobs.append((version, version, dst_path))
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Generate the protobuf code for every schema in the batch.
+
+        Returns:
+            list[dict]: Summary of every schema in the order they were added,
+                        with the name, the output directory, the time spent
+                        fetching, parsing and writing in seconds, the number
+                        of blocks of proto code and the number of blocks
+                        that had to be rendered.
+        """
+
+        summary = list()
+        sources = list()
+
+        for name, version, dst_path in self.__jobs:
+            start = time.perf_counter()
+            if version is not None:
+                store = self.store or release_store.ReleaseStore()
+                name = store.fetch(version)
+
+            summary.append({
+                'name': version or name,
+                'dst_path': dst_path,
+                'fetch': time.perf_counter() - start
+            })
+            sources.append(name)
+
+        template_registry.preload()
+        render_cache = _RenderCache()
+
+        executor = None
+        if self.workers > 1:
+            executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+
+        try:
+            if executor:
+                parsed = executor.map(
+                    _parse, sources, [self.cache] * len(sources))
+            else:
+                parsed = (_parse(x, self.cache) for x in sources)
+
+            for row, (model, parse_time) in zip(summary, parsed):
+                lookups = render_cache.lookups
+                size = len(render_cache)
+
+                start = time.perf_counter()
+                gen = schema_generator.SchemaGenerator.from_model(model)
+                gen.write_proto(os.path.join(row['dst_path'], ''),
+                                self.package_name, self.workers,
+                                executor=executor, render_cache=render_cache,
+                                **self.options)
+
+                row['parse'] = parse_time
+                row['write'] = time.perf_counter() - start
+                row['blocks'] = render_cache.lookups - lookups
+                row['rendered'] = len(render_cache) - size
+        finally:
+            if executor:
+                executor.shutdown()
+
+        return summary
+
+
+def format_summary(summary: Iterable[Dict[str, Any]]) -> str:
+    """Return the summary of a batch as a table.
+
+    Args:
+        summary (iterable[dict]): Summary returned by BatchGenerator.run().
+
+    Returns:
+        str: The summary with one line per schema and a line with the totals.
+    """
+
+    fmt = '{:<24} {:>8} {:>8} {:>8} {:>8} {:>9}\n'
+    rows = [fmt.format('schema', 'fetch', 'parse', 'write', 'blocks',
+                       'rendered')]
+    total = {'fetch': 0, 'parse': 0, 'write': 0, 'blocks': 0, 'rendered': 0}
+
+    for row in summary:
+        rows.append(fmt.format(
+            row['name'][-24:], '{:.2f}s'.format(row['fetch']),
+            '{:.2f}s'.format(row['parse']), '{:.2f}s'.format(row['write']),
+            row['blocks'], row['rendered']))
+
+        for x in total:
+            total[x] += row[x]
+
+    rows.append(fmt.format(
+        'total', '{:.2f}s'.format(total['fetch']),
+        '{:.2f}s'.format(total['parse']), '{:.2f}s'.format(total['write']),
+        total['blocks'], total['rendered']))
+
+    return ''.join(rows)
@@ -0,0 +1,330 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# Compact binary form of schema_descriptor.json.
+#
+# Layout, all integers are unsigned 32 bit little endian:
+#
+#     header      magic, version, string count, message count, primitive
+#                 count and the offsets of the string table, the message index
+#                 and the primitives.
+#     messages    for every message: @type, flags, number of fields, number of
+#                 values, followed by the string ids of the fields and values
+#                 and, for a flattened property, of the type it is written as.
+#     strings     string count + 1 offsets into the blob, followed by the utf-8
+#                 blob of every interned string.
+#     index       (name, message offset) pairs sorted by the utf-8 bytes of the
+#                 name, so that a message is found with a binary search.
+#     primitives  string ids of the primitives.
+import collections.abc
+import mmap
+import struct
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b'SODB'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sIIIIIII')
+_MESSAGE = struct.Struct('<IIII')
+_INDEX_ENTRY = struct.Struct('<II')
+
+_HAS_FIELDS = 1
+_HAS_VALUES = 2
+_FLATTENED = 4
+
+
+def write(outFile: BinaryIO, messages: Iterable[Tuple[str, Dict[str, Any]]],
+          primitives: List[str]):
+    """Write a binary descriptor. Messages are written as they are consumed,
+    only the interned strings and the index are held in memory.
+
+    Args:
+        outFile (BinaryIO): Seekable file opened in binary mode.
+        messages (iterable[tuple(str, dict)]): The name and json descriptor of
+                                               every message.
+        primitives (list[str]): List of the undefined classes and primitives.
+    """
+
+    strings = dict()
+
+    def intern(x: str) -> int:
+        if x not in strings:
+            strings[x] = len(strings)
+
+        return strings[x]
+
+    outFile.write(b'\0' * _HEADER.size)
+    offset = _HEADER.size
+    index = list()
+
+    for name, message in messages:
+        fields = [intern(x) for x in message.get('fields', ())]
+        values = [intern(x) for x in message.get('values', ())]
+        extra = []
+
+        flags = 0
+        if 'fields' in message:
+            flags |= _HAS_FIELDS
+        if 'values' in message:
+            flags |= _HAS_VALUES
+        if 'flattened' in message:
+            flags |= _FLATTENED
+            extra.append(intern(message['flattened']))
+
+        index.append((name.encode('utf-8'), intern(name), offset))
+
+        data = _MESSAGE.pack(intern(message['@type']), flags, len(fields),
+                             len(values))
+        data += struct.pack('<{}I'.format(len(fields) + len(values) + len(extra)),
+                            *fields, *values, *extra)
+        outFile.write(data)
+        offset += len(data)
+
+    primitive_ids = [intern(x) for x in primitives]
+
+    string_offset = offset
+    blobs = [x.encode('utf-8') for x in strings]
+    offsets = [0]
+    for x in blobs:
+        offsets.append(offsets[-1] + len(x))
+
+    outFile.write(struct.pack('<{}I'.format(len(offsets)), *offsets))
+    outFile.writelines(blobs)
+    offset += 4 * len(offsets) + offsets[-1]
+
+    index_offset = offset
+    index.sort()
+    outFile.writelines(_INDEX_ENTRY.pack(name_id, message_offset)
+                       for _, name_id, message_offset in index)
+    offset += _INDEX_ENTRY.size * len(index)
+
+    primitives_offset = offset
+    outFile.write(struct.pack(
+        '<{}I'.format(len(primitive_ids)), *primitive_ids))
+
+    outFile.seek(0)
+    outFile.write(_HEADER.pack(MAGIC, VERSION, len(strings), len(index),
+                               len(primitive_ids), string_offset,
+                               index_offset, primitives_offset))
+    outFile.seek(0, 2)
+
+
+class Messages(collections.abc.Mapping):
+    """Read-only mapping from message name to its json descriptor. A message
+    is decoded from the file when it is first accessed.
+
+    Args:
+        descriptor (BinaryDescriptor): The descriptor the messages belong to.
+    """
+
+    def __init__(self, descriptor: 'BinaryDescriptor'):
+        self.__descriptor = descriptor
+        self.__cache = dict()
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        if name not in self.__cache:
+            offset = self.__descriptor.find(name)
+            if offset is None:
+                raise KeyError(name)
+
+            self.__cache[name] = self.__descriptor.decode_message(offset)
+
+        return self.__cache[name]
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self.__descriptor.get_index_name(i)
+
+    def __len__(self) -> int:
+        return self.__descriptor.message_count
+
+
+class BinaryDescriptor():
+    """The BinaryDescriptor memory-maps a binary descriptor written by
+    binary_descriptor.write(). Nothing but the header is read on open,
+    strings and messages are decoded on first use.
+
+    Args:
+        path (str): Path to the binary descriptor.
+
+    Attributes:
+        messages (Messages): Mapping from message name to its json
+                             descriptor.
+        message_count (int): Number of messages in the descriptor.
+    """
+
+    def __init__(self, path: str):
+        assert isinstance(path, str), "Invalid parameter 'path' must be 'str'."
+
+        with open(path, 'rb') as f:
+            self.__buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.__string_count, self.message_count,
+         self.__primitive_count, self.__string_offset, self.__index_offset,
+         self.__primitives_offset) = _HEADER.unpack_from(self.__buf, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('Unsupported binary descriptor: ' + path + '.')
+
+        self.__blob_offset = self.__string_offset + \
+            4 * (self.__string_count + 1)
+        self.__strings = dict()
+        self.messages = Messages(self)
+
+    def close(self):
+        """Unmap the file, messages that were not decoded yet can no longer
+        be accessed.
+        """
+
+        self.__buf.close()
+
+    def __enter__(self) -> 'BinaryDescriptor':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def primitives(self) -> List[str]:
+        """list[str]: List of the undefined classes and primitives."""
+
+        ids = struct.unpack_from('<{}I'.format(self.__primitive_count),
+                                 self.__buf, self.__primitives_offset)
+        return [self.get_string(x) for x in ids]
+
+    def get_string(self, i: int) -> str:
+        """Return an interned string.
+
+        Args:
+            i (int): Id of the string.
+
+        Returns:
+            str: The decoded string.
+        """
+
+        if i not in self.__strings:
+            start, end = self.__get_string_range(i)
+            self.__strings[i] = self.__buf[start:end].decode('utf-8')
+
+        return self.__strings[i]
+
+    def get_index_name(self, i: int) -> str:
+        """Return the name of the i-th message of the index.
+
+        Args:
+            i (int): Position in the index.
+
+        Returns:
+            str: Name of the message.
+        """
+
+        name_id, _ = _INDEX_ENTRY.unpack_from(
+            self.__buf, self.__index_offset + _INDEX_ENTRY.size * i)
+        return self.get_string(name_id)
+
+    def find(self, name: str) -> Optional[int]:
+        """Return the offset of a message using a binary search of the index.
+
+        Args:
+            name (str): Name of the message.
+
+        Returns:
+            int: Offset of the message, None if there is no such message.
+        """
+
+        key = name.encode('utf-8')
+        lo = 0
+        hi = self.message_count
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name_id, offset = _INDEX_ENTRY.unpack_from(
+                self.__buf, self.__index_offset + _INDEX_ENTRY.size * mid)
+            start, end = self.__get_string_range(name_id)
+            x = self.__buf[start:end]
+
+            if x == key:
+                return offset
+            elif x < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return None
+
+    def decode_message(self, offset: int) -> Dict[str, Any]:
+        """Return the json descriptor of the message at offset.
+
+        Args:
+            offset (int): Offset of the message returned by find().
+
+        Returns:
+            dict: The json descriptor of the message.
+        """
+
+        type_id, flags, field_count, value_count = _MESSAGE.unpack_from(
+            self.__buf, offset)
+        extra_count = 1 if flags & _FLATTENED else 0
+        ids = struct.unpack_from(
+            '<{}I'.format(field_count + value_count + extra_count),
+            self.__buf, offset + _MESSAGE.size)
+
+        o = {}
+        o['@type'] = self.get_string(type_id)
+        if flags & _HAS_VALUES:
+            o['values'] = [self.get_string(x) for x in
+                           ids[field_count:field_count + value_count]]
+        if flags & _HAS_FIELDS:
+            o['fields'] = [self.get_string(x) for x in ids[:field_count]]
+        if flags & _FLATTENED:
+            o['flattened'] = self.get_string(ids[-1])
+
+        return o
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the whole descriptor in the format of
+        schema_descriptor.json.
+
+        Returns:
+            dict: The decoded descriptor.
+        """
+
+        return {'messages': dict(self.messages), 'primitives': self.primitives}
+
+    def __get_string_range(self, i: int) -> Tuple[int, int]:
+        """Return the position of an interned string in the blob.
+
+        Args:
+            i (int): Id of the string.
+
+        Returns:
+            tuple(int, int): Start and end offset of the utf-8 bytes.
+        """
+
+        start, end = struct.unpack_from(
+            '<II', self.__buf, self.__string_offset + 4 * i)
+        return self.__blob_offset + start, self.__blob_offset + end
+
+
+def load(path: str) -> BinaryDescriptor:
+    """Open a binary descriptor for lazy reading.
+
+    Args:
+        path (str): Path to the binary descriptor.
+
+    Returns:
+        BinaryDescriptor: The memory-mapped descriptor.
+    """
+
+    return BinaryDescriptor(path)
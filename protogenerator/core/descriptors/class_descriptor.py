@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import utils.utils as utils
-import collections
-from jinja2 import Environment, FileSystemLoader
-from typing import List
+import core.template_registry as template_registry
+import core.file_descriptor as file_descriptor
+from google.protobuf import descriptor_pb2
+from typing import Dict, List, Optional, Tuple
 from utils.utils import PropertyToParent as PropertyToParent
 
 
@@ -25,14 +26,28 @@ class ClassDescriptor:
         name (str): Name of the schema class.
         field_types (list[PropertyToParent]): The schema properties that belong
                                               to the schema class.
+        field_numbers (dict[str, int]): Field numbers of properties that are
+                                        fixed, the other properties are
+                                        numbered in order.
+        reserved (list[int]): Field numbers of removed properties.
+        flat_types (dict[str, str]): Proto types of the properties that are
+                                     written without their wrapper message.
 
     Attributes:
         name (str): Name of the schema class.
         field_types (list[PropertyToParent]): The schema properties that belong
                                               to the schema class.
+        field_numbers (dict[str, int]): Field numbers of properties that are
+                                        fixed.
+        reserved (list[int]): Field numbers of removed properties.
+        flat_types (dict[str, str]): Proto types of the flattened
+                                     properties.
     """
 
-    def __init__(self, name: str, field_types: List[PropertyToParent]):
+    def __init__(self, name: str, field_types: List[PropertyToParent],
+                 field_numbers: Optional[Dict[str, int]] = None,
+                 reserved: Optional[List[int]] = None,
+                 flat_types: Optional[Dict[str, str]] = None):
 
         assert isinstance(name, str), "Invalid parameter 'name' must be 'str'."
         assert isinstance(
@@ -44,6 +59,9 @@ class ClassDescriptor:
 
         self.name = name
         self.field_types = field_types
+        self.field_numbers = field_numbers or dict()
+        self.reserved = sorted(reserved or ())
+        self.flat_types = flat_types or dict()
 
     def to_proto(self, comment: str) -> str:
         """Return proto code for the schema class.
@@ -58,36 +76,69 @@ class ClassDescriptor:
         assert isinstance(
             comment, str), "Invalid parameter 'comment' must be 'str'."
 
-        prop_from_self = list()
-        prop_inherited = dict()
-
-        for x in self.field_types:
-            if x.parent == self.name:
-                prop_from_self.append(x.name)
-            else:
-                if x.parent not in prop_inherited:
-                    prop_inherited[x.parent] = list()
-
-                prop_inherited[x.parent].append(x.name)
-
-        prop_from_self = sorted(prop_from_self)
-        prop_inherited = collections.OrderedDict(
-            sorted(prop_inherited.items()))
-
-        file_loader = FileSystemLoader('./core/templates')
-        env = Environment(
-            loader=file_loader,
-            trim_blocks=True,
-            lstrip_blocks=True)
-        env.globals['get_property_name'] = utils.get_property_name
-        env.globals['to_snake_case'] = utils.to_snake_case
-        env.globals['sorted'] = sorted
+        prop_from_self, prop_inherited, numbers, types = self.__get_fields()
 
         comment = '// ' + comment.replace('\n', '\n// ')
-        proto_string = env.get_template('class.txt').render(
+        proto_string = template_registry.get_template('class.txt').render(
             name=self.name,
             prop_from_self=prop_from_self,
             prop_inherited=prop_inherited,
+            numbers=numbers,
+            types=types,
+            reserved=self.reserved,
             comment=comment)
 
         return proto_string
+
+    def to_descriptor(self, package_name: str) -> descriptor_pb2.DescriptorProto:
+        """Return the descriptor protoc builds for the proto code of the
+        schema class.
+
+        Args:
+            package_name (str): Package name for the proto code.
+
+        Returns:
+            DescriptorProto: The descriptor of the message of the class.
+        """
+
+        prop_from_self, prop_inherited, numbers, types = self.__get_fields()
+
+        message = descriptor_pb2.DescriptorProto(name=self.name)
+        file_descriptor.add_field(
+            message, 'id', 1, 'string', package_name, json_name='@id')
+        for x in prop_from_self + [
+                x for props in prop_inherited.values() for x in props]:
+            file_descriptor.add_field(
+                message, utils.to_snake_case(x), numbers[x], types[x],
+                package_name, repeated=True, json_name=x)
+
+        message.options.CopyFrom(
+            file_descriptor.get_message_options(self.name))
+        file_descriptor.add_reserved(message, self.reserved)
+
+        return message
+
+    def __get_fields(self) -> Tuple[List[str], Dict[str, List[str]], Dict[str, int], Dict[str, str]]:
+        """Return the properties of the schema class in the order they are
+        written with their field numbers and types.
+
+        Returns:
+            list[str]: Sorted names of the properties declared by the class.
+            dict[str, list[str]]: The inherited properties grouped by the
+                                  class that declares them.
+            dict[str, int]: Field number of every property.
+            dict[str, str]: Proto type of every property.
+        """
+
+        prop_from_self, prop_inherited = utils.group_properties(
+            self.name, self.field_types)
+
+        # The field number 1 is used by @id.
+        order = prop_from_self + [
+            x for props in prop_inherited.values() for x in props]
+        numbers = utils.get_field_numbers(
+            order, self.field_numbers, 2, self.reserved)
+        types = {x: self.flat_types.get(x) or utils.get_property_name(x)
+                 for x in order}
+
+        return prop_from_self, prop_inherited, numbers, types
@@ -13,9 +13,10 @@
 # limitations under the License.
 import utils.utils as utils
 import utils.constants as constants
-import collections
-from jinja2 import Environment, FileSystemLoader
-from typing import List
+import core.template_registry as template_registry
+import core.file_descriptor as file_descriptor
+from google.protobuf import descriptor_pb2
+from typing import Dict, List, Optional, Tuple
 from utils.utils import PropertyToParent as PropertyToParent
 
 
@@ -28,16 +29,39 @@ class EnumDescriptor:
         field_types (list[PropertyToParent]): The schema properties that belong
                                               to the schema enumeration.
         enum_values (list[str]): The possible values of the schema enumeration.
+        field_numbers (dict[str, int]): Field numbers of properties that are
+                                        fixed, the other properties are
+                                        numbered in order.
+        reserved (list[int]): Field numbers of removed properties.
+        value_numbers (dict[str, int]): Numbers of enum values that are
+                                        fixed, the other values are numbered
+                                        in order.
+        reserved_values (list[int]): Numbers of removed enum values.
+        flat_types (dict[str, str]): Proto types of the properties that are
+                                     written without their wrapper message.
 
     Attributes:
         name (str): Name of the schema enumeration.
         field_types (list[PropertyToParent]): The schema properties that belong
                                               to the schema enumeration.
         enum_values (list[str]): The possible values of the schema enumeration.
+        field_numbers (dict[str, int]): Field numbers of properties that are
+                                        fixed.
+        reserved (list[int]): Field numbers of removed properties.
+        value_numbers (dict[str, int]): Numbers of enum values that are
+                                        fixed.
+        reserved_values (list[int]): Numbers of removed enum values.
+        flat_types (dict[str, str]): Proto types of the flattened
+                                     properties.
     """
 
     def __init__(self, name: str,
-                 field_types: List[PropertyToParent], enum_values: List[str]):
+                 field_types: List[PropertyToParent], enum_values: List[str],
+                 field_numbers: Optional[Dict[str, int]] = None,
+                 reserved: Optional[List[int]] = None,
+                 value_numbers: Optional[Dict[str, int]] = None,
+                 reserved_values: Optional[List[int]] = None,
+                 flat_types: Optional[Dict[str, str]] = None):
 
         assert isinstance(name, str), "Invalid parameter 'name' must be 'str'."
         assert isinstance(
@@ -56,6 +80,11 @@ class EnumDescriptor:
         self.name = name
         self.field_types = field_types
         self.enum_values = enum_values
+        self.field_numbers = field_numbers or dict()
+        self.reserved = sorted(reserved or ())
+        self.value_numbers = value_numbers or dict()
+        self.reserved_values = sorted(reserved_values or ())
+        self.flat_types = flat_types or dict()
 
     def to_proto(self, comment: str) -> str:
         """Return proto code for the schema enumeration.
@@ -70,39 +99,116 @@ class EnumDescriptor:
         assert isinstance(
             comment, str), "Invalid parameter 'comment' must be 'str'."
 
-        prop_from_self = list()
-        prop_inherited = dict()
-
-        for x in self.field_types:
-            if x.parent == self.name:
-                prop_from_self.append(x.name)
-            else:
-                if x.parent not in prop_inherited:
-                    prop_inherited[x.parent] = list()
-
-                prop_inherited[x.parent].append(x.name)
-
-        prop_from_self = sorted(prop_from_self)
-        prop_inherited = collections.OrderedDict(
-            sorted(prop_inherited.items()))
-
-        file_loader = FileSystemLoader('./core/templates')
-        env = Environment(
-            loader=file_loader,
-            trim_blocks=True,
-            lstrip_blocks=True)
-        env.globals['get_property_name'] = utils.get_property_name
-        env.globals['to_snake_case'] = utils.to_snake_case
-        env.globals['sorted'] = sorted
-        env.globals['get_enum_value_name'] = utils.get_enum_value_name
+        prop_from_self, prop_inherited, numbers, types = self.__get_fields()
+        enum_values, value_numbers = self.__get_values()
 
         comment = '// ' + comment.replace('\n', '\n// ')
-        proto_string = env.get_template('enumeration.txt').render(
+        proto_string = template_registry.get_template('enumeration.txt').render(
             name=self.name,
             prop_from_self=prop_from_self,
             prop_inherited=prop_inherited,
+            numbers=numbers,
+            types=types,
+            reserved=self.reserved,
             comment=comment,
-            enum_values=self.enum_values,
+            enum_values=enum_values,
+            value_numbers=value_numbers,
+            reserved_values=self.reserved_values
         )
 
         return proto_string
+
+    def to_descriptor(self, package_name: str) -> Tuple[descriptor_pb2.DescriptorProto, descriptor_pb2.DescriptorProto]:
+        """Return the descriptors protoc builds for the proto code of the
+        schema enumeration.
+
+        Args:
+            package_name (str): Package name for the proto code.
+
+        Returns:
+            DescriptorProto: The descriptor of the message <name>Class with
+                             the enum of the values.
+            DescriptorProto: The descriptor of the message that wraps a
+                             value or an instance of <name>Class.
+        """
+
+        prop_from_self, prop_inherited, numbers, types = self.__get_fields()
+        enum_values, value_numbers = self.__get_values()
+
+        message = descriptor_pb2.DescriptorProto(name=self.name + 'Class')
+        file_descriptor.add_field(
+            message, 'id', 1, 'string', package_name, json_name='@id')
+        for x in prop_from_self + [
+                x for props in prop_inherited.values() for x in props]:
+            file_descriptor.add_field(
+                message, utils.to_snake_case(x), numbers[x], types[x],
+                package_name, repeated=True, json_name=x)
+
+        enum = message.enum_type.add(name='Id')
+        enum.value.add(
+            name='UNKNOWN', number=0,
+            options=file_descriptor.get_enum_value_options('Unknown'))
+        for x in enum_values:
+            enum.value.add(
+                name=utils.get_enum_value_name(x), number=value_numbers[x],
+                options=file_descriptor.get_enum_value_options(
+                    constants.schema_url_prefix + x))
+        for x in self.reserved_values:
+            enum.reserved_range.add(start=x, end=x)
+
+        message.options.CopyFrom(
+            file_descriptor.get_message_options(self.name))
+        file_descriptor.add_reserved(message, self.reserved)
+
+        wrapper = descriptor_pb2.DescriptorProto(name=self.name)
+        wrapper.oneof_decl.add(name='values')
+        file_descriptor.add_field(wrapper, 'id', 1, self.name + 'Class.Id',
+                                  package_name, oneof_index=0, enum=True)
+        file_descriptor.add_field(wrapper, utils.to_snake_case(self.name), 2,
+                                  self.name + 'Class', package_name,
+                                  oneof_index=0)
+        wrapper.options.CopyFrom(
+            file_descriptor.get_message_options('EnumWrapper'))
+
+        return message, wrapper
+
+    def __get_fields(self) -> Tuple[List[str], Dict[str, List[str]], Dict[str, int], Dict[str, str]]:
+        """Return the properties of the schema enumeration in the order they
+        are written with their field numbers and types.
+
+        Returns:
+            list[str]: Sorted names of the properties declared by the
+                       enumeration.
+            dict[str, list[str]]: The inherited properties grouped by the
+                                  class that declares them.
+            dict[str, int]: Field number of every property.
+            dict[str, str]: Proto type of every property.
+        """
+
+        prop_from_self, prop_inherited = utils.group_properties(
+            self.name, self.field_types)
+
+        # The field number 1 is used by @id.
+        order = prop_from_self + [
+            x for props in prop_inherited.values() for x in props]
+        numbers = utils.get_field_numbers(
+            order, self.field_numbers, 2, self.reserved)
+        types = {x: self.flat_types.get(x) or utils.get_property_name(x)
+                 for x in order}
+
+        return prop_from_self, prop_inherited, numbers, types
+
+    def __get_values(self) -> Tuple[List[str], Dict[str, int]]:
+        """Return the values of the schema enumeration with their numbers.
+
+        Returns:
+            list[str]: Sorted values.
+            dict[str, int]: Number of every value.
+        """
+
+        # The value 0 is used by UNKNOWN.
+        enum_values = sorted(self.enum_values)
+        value_numbers = utils.get_field_numbers(
+            enum_values, self.value_numbers, 1, self.reserved_values)
+
+        return enum_values, value_numbers
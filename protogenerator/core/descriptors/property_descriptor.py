@@ -13,8 +13,10 @@
 # limitations under the License.
 import utils.utils as utils
 import utils.constants as constants
-from jinja2 import Environment, FileSystemLoader
-from typing import List
+import core.template_registry as template_registry
+import core.file_descriptor as file_descriptor
+from google.protobuf import descriptor_pb2
+from typing import Dict, List, Optional
 from utils.utils import PropertyToParent as PropertyToParent
 
 
@@ -50,16 +52,25 @@ class PropertyDescriptor:
         field_types (list[str]): The schema classes/datatypes that are included
                                  in range of schema property.
         class_list (list[str]): List of defined classes.
+        field_numbers (dict[str, int]): Field numbers of classes/datatypes
+                                        that are fixed, the others are
+                                        numbered in order.
+        reserved (list[int]): Field numbers of removed classes/datatypes.
 
     Attributes:
         name (str): Name of the schema property.
         field_types (list[str]): The schema classes/datatypes that are included
                                  in range of schema property.
         class_list (list[str]): List of defined classes.
+        field_numbers (dict[str, int]): Field numbers of classes/datatypes
+                                        that are fixed.
+        reserved (list[int]): Field numbers of removed classes/datatypes.
     """
 
     def __init__(self, name: str,
-                 field_types: List[str], class_list: List[str]):
+                 field_types: List[str], class_list: List[str],
+                 field_numbers: Optional[Dict[str, int]] = None,
+                 reserved: Optional[List[int]] = None):
 
         assert isinstance(name, str), "Invalid parameter 'name' must be 'str'."
         assert isinstance(
@@ -78,6 +89,8 @@ class PropertyDescriptor:
         self.name = name
         self.field_types = field_types
         self.class_list = class_list
+        self.field_numbers = field_numbers or dict()
+        self.reserved = sorted(reserved or ())
 
     def to_proto(self, comment: str) -> str:
         """Return proto code for the schema property.
@@ -92,19 +105,47 @@ class PropertyDescriptor:
         assert isinstance(
             comment, str), "Invalid parameter 'comment' must be 'str'."
 
-        file_loader = FileSystemLoader('./core/templates')
-        env = Environment(
-            loader=file_loader,
-            trim_blocks=True,
-            lstrip_blocks=True)
-        env.globals['get_class_type'] = utils.get_class_type
-        env.globals['to_snake_case'] = utils.to_snake_case
+        field_types = sorted(self.field_types)
+        numbers = utils.get_field_numbers(
+            field_types, self.field_numbers, 1, self.reserved)
 
         comment = '// ' + comment.replace('\n', '\n// ')
-        proto_string = env.get_template('property.txt').render(
+        proto_string = template_registry.get_template('property.txt').render(
             name=utils.get_property_name(self.name),
-            field_types=sorted(self.field_types),
+            field_types=field_types,
             class_list=self.class_list,
+            numbers=numbers,
+            reserved=self.reserved,
             comment=comment)
 
         return proto_string
+
+    def to_descriptor(self, package_name: str) -> descriptor_pb2.DescriptorProto:
+        """Return the descriptor protoc builds for the proto code of the
+        schema property.
+
+        Args:
+            package_name (str): Package name for the proto code.
+
+        Returns:
+            DescriptorProto: The descriptor of the message of the property.
+        """
+
+        field_types = sorted(self.field_types)
+        numbers = utils.get_field_numbers(
+            field_types, self.field_numbers, 1, self.reserved)
+
+        message = descriptor_pb2.DescriptorProto(
+            name=utils.get_property_name(self.name))
+        message.oneof_decl.add(name='values')
+        for x in field_types:
+            file_descriptor.add_field(
+                message, utils.to_snake_case(x), numbers[x],
+                utils.get_class_type(x, self.class_list), package_name,
+                oneof_index=0)
+
+        message.options.CopyFrom(
+            file_descriptor.get_message_options('Property'))
+        file_descriptor.add_reserved(message, self.reserved)
+
+        return message
@@ -0,0 +1,247 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import tempfile
+import utils.utils as utils
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+LOCK_FILE = 'field_numbers.lock'
+
+# Fields with a number up to 15 are encoded with a one byte tag.
+MAX_SHORT_FIELD_NUMBER = 15
+
+
+def collect_profile(documents: Iterable[Any],
+                    profile: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Dict[str, int]]:
+    """Count how often every property is used by every type in JSON-LD
+    documents. Nested entities are counted as well.
+
+    Args:
+        documents (iterable): Parsed JSON-LD documents, lists of documents
+                              and documents with an @graph are supported.
+        profile (dict): Profile the counts are added to, a new profile is
+                        returned if None.
+
+    Returns:
+        dict[str, dict[str, int]]: Mapping from type to the number of times
+                                   each of its properties is used.
+    """
+
+    if profile is None:
+        profile = dict()
+
+    stack = list(documents)
+    while stack:
+        x = stack.pop()
+
+        if isinstance(x, list):
+            stack.extend(x)
+            continue
+
+        if not isinstance(x, dict):
+            continue
+
+        types = x.get('@type', ())
+        if isinstance(types, str):
+            types = (types,)
+
+        for key, value in x.items():
+            if not key.startswith('@'):
+                for t in types:
+                    usage = profile.setdefault(t, dict())
+                    usage[key] = usage.get(key, 0) + (
+                        len(value) if isinstance(value, list) else 1)
+
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+
+    return profile
+
+
+def load_profile(path: str) -> Dict[str, Dict[str, int]]:
+    """Read a usage profile written by usage_profile.py.
+
+    Args:
+        path (str): Path to the profile.
+
+    Returns:
+        dict[str, dict[str, int]]: Mapping from type to the number of times
+                                   each of its properties is used.
+    """
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def get_hot_fields(fields: Iterable[str], usage: Mapping[str, int],
+                   start: int = 2) -> Dict[str, int]:
+    """Return field numbers for the most used fields of a message, the most
+    used field gets the number start and the last one gets
+    MAX_SHORT_FIELD_NUMBER.
+
+    Args:
+        fields (iterable[str]): Names of the fields of the message.
+        usage (dict[str, int]): Number of times each field is used.
+        start (int): The first free field number.
+
+    Returns:
+        dict[str, int]: Mapping from field name to field number.
+    """
+
+    used = sorted((-usage[x], x) for x in fields if usage.get(x, 0) > 0)
+    hot = [x for _, x in used[:max(0, MAX_SHORT_FIELD_NUMBER - start + 1)]]
+
+    return {x: start + i for i, x in enumerate(hot)}
+
+
+class FieldNumberLock():
+    """The FieldNumberLock keeps the field numbers of every message, so that
+    binary messages written with an earlier release of the schema can still
+    be decoded. Fields keep their number across runs, new fields get numbers
+    that were never used and the numbers of removed fields are reserved.
+    A removed field that is added again gets its old number back.
+
+    Args:
+        path (str): Path to the lock file, it is created on save() if it does
+                    not exist.
+
+    Attributes:
+        path (str): Path to the lock file.
+        modified (bool): Whether the lock changed since it was loaded.
+    """
+
+    def __init__(self, path: str):
+        assert isinstance(path, str), "Invalid parameter 'path' must be 'str'."
+
+        self.path = path
+        self.modified = False
+        self.__messages = dict()
+        self.__reserved = dict()
+
+        try:
+            with open(path, 'r') as f:
+                lock = json.load(f)
+        except FileNotFoundError:
+            return
+
+        self.__messages = lock['messages']
+        self.__reserved = lock.get('reserved', dict())
+
+    def get(self, message: str) -> Optional[Dict[str, int]]:
+        """Return the locked field numbers of a message.
+
+        Args:
+            message (str): Name of the message.
+
+        Returns:
+            dict[str, int]: Mapping from field name to field number, None if
+                            the message is not locked.
+        """
+
+        return self.__messages.get(message)
+
+    def get_reserved(self, message: str) -> Dict[str, int]:
+        """Return the field numbers of the removed fields of a message.
+
+        Args:
+            message (str): Name of the message.
+
+        Returns:
+            dict[str, int]: Mapping from field name to field number.
+        """
+
+        return self.__reserved.get(message, dict())
+
+    def set(self, message: str, numbers: Mapping[str, int],
+            reserved: Optional[Mapping[str, int]] = None):
+        """Lock the field numbers of a message.
+
+        Args:
+            message (str): Name of the message.
+            numbers (dict[str, int]): Mapping from field name to field
+                                      number.
+            reserved (dict[str, int]): Mapping from the name of every removed
+                                       field to its field number.
+        """
+
+        numbers = dict(sorted(numbers.items()))
+        if self.__messages.get(message) != numbers:
+            self.__messages[message] = numbers
+            self.modified = True
+
+        reserved = dict(sorted((reserved or dict()).items()))
+        if self.get_reserved(message) != reserved:
+            if reserved:
+                self.__reserved[message] = reserved
+            else:
+                self.__reserved.pop(message, None)
+            self.modified = True
+
+    def assign(self, message: str, fields: List[str], start: int = 1,
+               usage: Optional[Mapping[str, int]] = None) -> Tuple[Dict[str, int], List[int]]:
+        """Return the field numbers of a message and lock them. A message
+        that is not locked yet is numbered in order, except for its most
+        used fields which get the first numbers.
+
+        Args:
+            message (str): Name of the message.
+            fields (list[str]): Names of the fields in the order they are
+                                written.
+            start (int): The first field number.
+            usage (dict[str, int]): Number of times each field is used.
+
+        Returns:
+            dict[str, int]: Mapping from field name to field number.
+            list[int]: Sorted field numbers of the removed fields.
+        """
+
+        locked = self.get(message)
+        reserved = dict(self.get_reserved(message))
+
+        if locked is None:
+            pinned = get_hot_fields(fields, usage or dict(), start)
+        else:
+            names = set(fields)
+            pinned = {x: n for x, n in locked.items() if x in names}
+
+            for x, n in locked.items():
+                if x not in names:
+                    reserved[x] = n
+
+            for x in fields:
+                if x not in pinned and x in reserved:
+                    pinned[x] = reserved.pop(x)
+
+        numbers = utils.get_field_numbers(
+            fields, pinned, start, reserved.values())
+        self.set(message, numbers, reserved)
+
+        return numbers, sorted(reserved.values())
+
+    def save(self):
+        """Atomically write the lock file."""
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'messages': dict(sorted(self.__messages.items())),
+                       'reserved': dict(sorted(self.__reserved.items()))},
+                      f, indent=4)
+
+        # The lock file is kept with the generated code, so it gets the
+        # permissions of a regular file instead of those of mkstemp().
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.path)
+        self.modified = False
@@ -0,0 +1,479 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# Descriptors of schema.proto built without protoc.
+#
+# The FileDescriptorProto built here is the one protoc produces from
+# schema.proto with --descriptor_set_out, so the generated code can be used
+# on machines without protoc. The custom options (type) and
+# (schemaorg_value) are stored as the same encoded fields protoc writes.
+import json
+import os
+import utils.constants as constants
+import utils.utils as utils
+from google.protobuf import descriptor_pb2
+from typing import Any, BinaryIO, Iterable, List, Optional, TextIO, Tuple
+
+# Name of the file the descriptors describe.
+FILE_NAME = 'schema.proto'
+
+# Field numbers of the custom options declared in options.txt.
+TYPE_OPTION = 50001
+SCHEMAORG_VALUE_OPTION = 50002
+
+_FieldDescriptorProto = descriptor_pb2.FieldDescriptorProto
+
+_SCALAR_TYPES = {
+    'double': _FieldDescriptorProto.TYPE_DOUBLE,
+    'float': _FieldDescriptorProto.TYPE_FLOAT,
+    'int32': _FieldDescriptorProto.TYPE_INT32,
+    'int64': _FieldDescriptorProto.TYPE_INT64,
+    'uint32': _FieldDescriptorProto.TYPE_UINT32,
+    'uint64': _FieldDescriptorProto.TYPE_UINT64,
+    'sint32': _FieldDescriptorProto.TYPE_SINT32,
+    'sint64': _FieldDescriptorProto.TYPE_SINT64,
+    'fixed32': _FieldDescriptorProto.TYPE_FIXED32,
+    'fixed64': _FieldDescriptorProto.TYPE_FIXED64,
+    'sfixed32': _FieldDescriptorProto.TYPE_SFIXED32,
+    'sfixed64': _FieldDescriptorProto.TYPE_SFIXED64,
+    'bool': _FieldDescriptorProto.TYPE_BOOL,
+    'string': _FieldDescriptorProto.TYPE_STRING,
+    'bytes': _FieldDescriptorProto.TYPE_BYTES,
+}
+
+# The messages of datatypes.txt: name, value of (type) and fields.
+_DATATYPES = [
+    ('DateTime', 'DatatypeDateTime', [('date', 'Date'), ('time', 'Time')]),
+    ('Date', 'DatatypeDate', [('year', 'int32'), ('month', 'int32'),
+                              ('day', 'int32')]),
+    ('Time', 'DatatypeTime', [('hours', 'int32'), ('minutes', 'int32'),
+                              ('seconds', 'int32'), ('timezone', 'string')]),
+    ('Duration', 'DatatypeDuration', [('seconds', 'int64')]),
+    ('Distance', 'DatatypeQuantitative', [('value', 'double'),
+                                          ('unit', 'string')]),
+    ('Energy', 'DatatypeQuantitative', [('value', 'double'),
+                                        ('unit', 'string')]),
+    ('Mass', 'DatatypeQuantitative', [('value', 'double'),
+                                      ('unit', 'string')]),
+]
+
+_PYTHON_MODULE = '''# -*- coding: utf-8 -*-
+# Generated by the schema.org protogenerator {version}.  DO NOT EDIT!
+# source: {file_name}
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import descriptor_pb2 as google_dot_protobuf_dot_descriptor__pb2
+{imports}
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile({serialized})
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, __name__, _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+{options}'''
+
+_PYTHON_PACKAGE = '''# -*- coding: utf-8 -*-
+# Generated by the schema.org protogenerator {version}.  DO NOT EDIT!
+# source: {file_name}
+"""Generated protocol buffer code, loaded when it is first used.
+
+The messages are split into the strongly connected components of the graph
+of message types. A message is loaded, together with the components it
+refers to, the first time it is looked up as an attribute of this package.
+The package cannot be used in the same process as a schema_pb2 module of the
+same schema.
+"""
+import importlib
+
+# Module of the component every message is defined in.
+_MODULES = {modules}
+
+_MODULES.update(dict.fromkeys(
+    ['type', 'TYPE_FIELD_NUMBER', 'schemaorg_value',
+     'SCHEMAORG_VALUE_FIELD_NUMBER'], '{options_module}'))
+
+
+def __getattr__(name):
+  module = _MODULES.get(name)
+  if module is None:
+    raise AttributeError(
+        'module {{!r}} has no attribute {{!r}}'.format(__name__, name))
+
+  value = getattr(importlib.import_module('.' + module, __name__), name)
+  globals()[name] = value
+  return value
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_MODULES))
+'''
+
+# Name of the module of the options in a python package.
+_OPTIONS_MODULE = '_options'
+
+
+def _encode_varint(x: int) -> bytes:
+    out = bytearray()
+    while x > 0x7f:
+        out.append(x & 0x7f | 0x80)
+        x >>= 7
+    out.append(x)
+    return bytes(out)
+
+
+def _decode_varint(data: bytes, i: int) -> Tuple[int, int]:
+    x = 0
+    shift = 0
+    while data[i] & 0x80:
+        x |= (data[i] & 0x7f) << shift
+        shift += 7
+        i += 1
+    return x | data[i] << shift, i + 1
+
+
+def _encode_option(number: int, value: str) -> bytes:
+    value = value.encode('utf-8')
+    return _encode_varint(number << 3 | 2) + \
+        _encode_varint(len(value)) + value
+
+
+def get_json_name(name: str) -> str:
+    """Return the json name protoc gives a field that has no json_name
+    option.
+
+    Args:
+        name (str): Name of the field.
+
+    Returns:
+        str: The name in lower camel case.
+    """
+
+    out = list()
+    capitalize = False
+    for c in name:
+        if c == '_':
+            capitalize = True
+        elif capitalize:
+            out.append(c.upper())
+            capitalize = False
+        else:
+            out.append(c)
+
+    return ''.join(out)
+
+
+def get_message_options(message_type: str) -> descriptor_pb2.MessageOptions:
+    """Return the options of a message with the (type) option.
+
+    Args:
+        message_type (str): Value of the (type) option.
+
+    Returns:
+        MessageOptions: The options of the message.
+    """
+
+    return descriptor_pb2.MessageOptions.FromString(
+        _encode_option(TYPE_OPTION, message_type))
+
+
+def get_option(options: Any, number: int) -> Optional[str]:
+    """Return the value of a custom option of a descriptor built by this
+    module.
+
+    Args:
+        options (MessageOptions or EnumValueOptions): The options.
+        number (int): Field number of the option.
+
+    Returns:
+        str: The value of the option, None if it is not set.
+    """
+
+    data = options.SerializeToString()
+    i = 0
+    while i < len(data):
+        key, i = _decode_varint(data, i)
+        size, i = _decode_varint(data, i)
+        if key == number << 3 | 2:
+            return data[i:i + size].decode('utf-8')
+        i += size
+
+    return None
+
+
+def get_enum_value_options(value: str) -> descriptor_pb2.EnumValueOptions:
+    """Return the options of an enum value with the (schemaorg_value) option.
+
+    Args:
+        value (str): Value of the (schemaorg_value) option.
+
+    Returns:
+        EnumValueOptions: The options of the enum value.
+    """
+
+    return descriptor_pb2.EnumValueOptions.FromString(
+        _encode_option(SCHEMAORG_VALUE_OPTION, value))
+
+
+def add_field(message: descriptor_pb2.DescriptorProto, name: str,
+              number: int, field_type: str, package_name: str,
+              repeated: bool = False, json_name: Optional[str] = None,
+              oneof_index: Optional[int] = None, enum: bool = False):
+    """Add a field to a message.
+
+    Args:
+        message (DescriptorProto): The message.
+        name (str): Name of the field.
+        number (int): Field number.
+        field_type (str): Scalar type or name of the message/enum of the
+                          field, relative to the package.
+        package_name (str): Package name for the proto code.
+        repeated (bool): Whether the field is repeated.
+        json_name (str): The json_name option, the name protoc derives from
+                         the name of the field if None.
+        oneof_index (int): Index of the oneof the field belongs to.
+        enum (bool): Whether field_type is an enum.
+    """
+
+    field = message.field.add()
+    field.name = name
+    field.number = number
+    field.label = _FieldDescriptorProto.LABEL_REPEATED if repeated else \
+        _FieldDescriptorProto.LABEL_OPTIONAL
+
+    if field_type in _SCALAR_TYPES:
+        field.type = _SCALAR_TYPES[field_type]
+    else:
+        field.type = _FieldDescriptorProto.TYPE_ENUM if enum else \
+            _FieldDescriptorProto.TYPE_MESSAGE
+        field.type_name = '.' + package_name + '.' + field_type
+
+    if oneof_index is not None:
+        field.oneof_index = oneof_index
+
+    field.json_name = get_json_name(name) if json_name is None else json_name
+
+
+def add_reserved(message: descriptor_pb2.DescriptorProto,
+                 reserved: Iterable[int]):
+    """Add reserved field numbers to a message.
+
+    Args:
+        message (DescriptorProto): The message.
+        reserved (iterable[int]): The reserved field numbers.
+    """
+
+    for x in reserved:
+        message.reserved_range.add(start=x, end=x + 1)
+
+
+def _get_datatypes(package_name: str) -> List[descriptor_pb2.DescriptorProto]:
+    messages = list()
+    for name, message_type, fields in _DATATYPES:
+        message = descriptor_pb2.DescriptorProto(name=name)
+        for i, (field_name, field_type) in enumerate(fields):
+            add_field(message, field_name, i + 1, field_type, package_name)
+        message.options.CopyFrom(get_message_options(message_type))
+        messages.append(message)
+
+    return messages
+
+
+def build(package_name: str,
+          messages: Iterable[descriptor_pb2.DescriptorProto]) -> descriptor_pb2.FileDescriptorProto:
+    """Return the descriptor of schema.proto.
+
+    Args:
+        package_name (str): Package name for the proto code.
+        messages (iterable[DescriptorProto]): The messages of the classes,
+                                              enumerations and properties
+                                              in the order of schema.proto.
+
+    Returns:
+        FileDescriptorProto: The descriptor of schema.proto.
+    """
+
+    assert isinstance(
+        package_name, str), "Invalid parameter 'package_name' must be 'str'."
+
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=FILE_NAME, package=package_name, syntax='proto3')
+    file_proto.dependency.append('google/protobuf/descriptor.proto')
+
+    for name, number, extendee in [
+            ('type', TYPE_OPTION, 'MessageOptions'),
+            ('schemaorg_value', SCHEMAORG_VALUE_OPTION, 'EnumValueOptions')]:
+        file_proto.extension.add(
+            name=name, number=number,
+            label=_FieldDescriptorProto.LABEL_OPTIONAL,
+            type=_FieldDescriptorProto.TYPE_STRING,
+            extendee='.google.protobuf.' + extendee,
+            json_name=get_json_name(name), proto3_optional=True)
+
+    file_proto.message_type.extend(_get_datatypes(package_name))
+    file_proto.message_type.extend(messages)
+
+    return file_proto
+
+
+def write_descriptor_set(outFile: BinaryIO,
+                         file_proto: descriptor_pb2.FileDescriptorProto):
+    """Write a FileDescriptorSet that contains the descriptor of schema.proto,
+    like protoc --descriptor_set_out does.
+
+    Args:
+        outFile (BinaryIO): File to which the descriptor set is written.
+        file_proto (FileDescriptorProto): The descriptor of schema.proto.
+    """
+
+    outFile.write(descriptor_pb2.FileDescriptorSet(
+        file=[file_proto]).SerializeToString(deterministic=True))
+
+
+def write_python_module(outFile: TextIO,
+                        file_proto: descriptor_pb2.FileDescriptorProto,
+                        dependencies: Iterable[str] = ()):
+    """Write a python module that can be imported instead of the one
+    protoc --python_out writes.
+
+    Args:
+        outFile (TextIO): File to which the module is written.
+        file_proto (FileDescriptorProto): The descriptor of schema.proto.
+        dependencies (iterable[str]): Modules of the same package that
+                                      define the files file_proto depends
+                                      on.
+    """
+
+    # The pure python implementation of protocol buffers reads the options
+    # of descriptors from the module, like in the modules protoc writes.
+    options = list()
+    for message in file_proto.message_type:
+        name = '_' + message.name.upper()
+        for enum in message.enum_type:
+            enum_name = name + '_' + enum.name.upper()
+            for value in enum.value:
+                if value.HasField('options'):
+                    x = '_globals[{!r}].values_by_name[{}]'.format(
+                        enum_name, json.dumps(value.name))
+                    options.append(x + '._loaded_options = None\n')
+                    options.append(x + '._serialized_options = ' + repr(
+                        value.options.SerializeToString()) + '\n')
+
+        if message.HasField('options'):
+            x = '_globals[{!r}]'.format(name)
+            options.append(x + '._loaded_options = None\n')
+            options.append(x + '._serialized_options = ' + repr(
+                message.options.SerializeToString()) + '\n')
+
+    imports = ''.join('from . import {}\n'.format(x) for x in dependencies)
+
+    outFile.write(_PYTHON_MODULE.format(
+        version=constants.generator_version, file_name=file_proto.name,
+        imports=imports,
+        serialized=repr(file_proto.SerializeToString(deterministic=True)),
+        options=''.join('  ' + x for x in options)))
+
+
+def split(file_proto: descriptor_pb2.FileDescriptorProto,
+          prefix: str) -> List[descriptor_pb2.FileDescriptorProto]:
+    """Split the descriptor of schema.proto into a file with the options and
+    one file for every strongly connected component of the graph of message
+    types, so that a message only needs the files of the components it
+    refers to.
+
+    Args:
+        file_proto (FileDescriptorProto): The descriptor of schema.proto.
+        prefix (str): Prefix of the names of the files.
+
+    Returns:
+        list[FileDescriptorProto]: The file of the options followed by the
+                                   file of every component, every file after
+                                   the files it depends on.
+    """
+
+    options = descriptor_pb2.FileDescriptorProto(
+        name=prefix + _OPTIONS_MODULE + '.proto',
+        package=file_proto.package, syntax=file_proto.syntax)
+    options.dependency.extend(file_proto.dependency)
+    options.extension.extend(file_proto.extension)
+
+    # Messages are only referred to as <message> or <message>.<enum>.
+    scope = '.' + file_proto.package + '.'
+    messages = {x.name: x for x in file_proto.message_type}
+    graph = {x: sorted(set(y.type_name[len(scope):].split('.')[0]
+                           for y in messages[x].field if y.type_name))
+             for x in messages}
+
+    files = [options]
+    file_of = dict()
+    for i, component in enumerate(utils.get_components(graph)):
+        name = prefix + '_c' + str(i) + '.proto'
+        f = descriptor_pb2.FileDescriptorProto(
+            name=name, package=file_proto.package, syntax=file_proto.syntax)
+        f.dependency.append(options.name)
+
+        for x in component:
+            file_of[x] = name
+        f.dependency.extend(sorted(
+            {file_of[y] for x in component for y in graph[x]} - {name}))
+        f.message_type.extend(messages[x] for x in component)
+        files.append(f)
+
+    return files
+
+
+def write_python_package(path: str,
+                         file_proto: descriptor_pb2.FileDescriptorProto):
+    """Write a python package that can be used instead of the module
+    protoc --python_out writes and that only loads a message when it is
+    first used.
+
+    Args:
+        path (str): Path to the directory of the package, it is created if it
+                    does not exist.
+        file_proto (FileDescriptorProto): The descriptor of schema.proto.
+    """
+
+    package = os.path.basename(os.path.normpath(path))
+    os.makedirs(path, exist_ok=True)
+
+    # Modules of an earlier run are removed, the components may have
+    # changed.
+    for x in os.listdir(path):
+        if x.startswith('_c') and x.endswith('.py'):
+            os.remove(os.path.join(path, x))
+
+    modules = dict()
+    for f in split(file_proto, package + '/'):
+        module = os.path.basename(f.name)[:-len('.proto')]
+        with open(os.path.join(path, module + '.py'), 'w') as outFile:
+            write_python_module(outFile, f, [
+                os.path.basename(x)[:-len('.proto')]
+                for x in f.dependency if x.startswith(package + '/')])
+
+        for x in f.message_type:
+            modules[x.name] = module
+
+    with open(os.path.join(path, '__init__.py'), 'w') as outFile:
+        outFile.write(_PYTHON_PACKAGE.format(
+            version=constants.generator_version, file_name=file_proto.name,
+            modules=json.dumps(modules, indent=4),
+            options_module=_OPTIONS_MODULE))
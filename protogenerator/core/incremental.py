@@ -0,0 +1,225 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import utils.constants as constants
+import utils.utils as utils
+from typing import Any, Dict, Iterable, Tuple
+
+MANIFEST_FILE = 'schema.manifest'
+REPORT_FILE = 'schema_changes.json'
+
+# Sources that blocks are rendered from, blocks of a run with other sources
+# are not reused.
+_RENDER_SOURCES = ['core/schema_generator.py', 'core/descriptors',
+                   'core/templates', 'utils/utils.py', 'utils/constants.py']
+
+# Kind of message of the render functions whose blocks are tracked.
+_KINDS = {
+    '_render_class': 'classes',
+    '_render_enum': 'enumerations',
+    '_render_property': 'properties'
+}
+
+
+class PositionWriter():
+    """Text stream wrapper that records where every block is written.
+
+    Args:
+        outFile (TextIO): The stream that is written to.
+
+    Attributes:
+        position (int): Number of characters written so far.
+        positions (dict[tuple, tuple(int, int)]): Mapping from the render
+                                                  key of every block written
+                                                  with write_blocks() to its
+                                                  start and end.
+    """
+
+    def __init__(self, outFile):
+        self.__outFile = outFile
+        self.__hash = hashlib.sha256()
+        self.position = 0
+        self.positions = dict()
+
+    def write(self, x: str):
+        self.position += len(x)
+        self.__hash.update(x.encode('utf-8'))
+        self.__outFile.write(x)
+
+    def writelines(self, lines: Iterable[str]):
+        for x in lines:
+            self.write(x)
+
+    def write_blocks(self, keys: Iterable[tuple], blocks: Iterable[str]):
+        """Write blocks and record their positions.
+
+        Args:
+            keys (iterable[tuple]): The render key of every block.
+            blocks (iterable[str]): The proto code of every block.
+        """
+
+        for key, x in zip(keys, blocks):
+            start = self.position
+            self.write(x)
+            self.positions[key] = (start, self.position)
+
+    def hexdigest(self) -> str:
+        """Return the sha256 checksum of everything written."""
+
+        return self.__hash.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def get_render_digest() -> str:
+    """Return the checksum of the code and templates that blocks are
+    rendered with.
+
+    Returns:
+        str: The sha256 checksum of the sources.
+    """
+
+    return utils.get_source_digest(_RENDER_SOURCES)
+
+
+def get_block_id(key: tuple) -> Tuple[str, str, str]:
+    """Return the id by which a block is stored in the manifest.
+
+    Args:
+        key (tuple): The render key of the block, the name of its render
+                     function followed by its arguments.
+
+    Returns:
+        tuple(str, str, str): The name of the render function, the name of
+                              the message and the sha256 checksum of the
+                              render key.
+    """
+
+    return (key[0], key[1],
+            hashlib.sha256(repr(key).encode('utf-8')).hexdigest())
+
+
+def load_blocks(dst_path: str) -> Dict[Tuple[str, str, str], str]:
+    """Return the blocks of a schema.proto written by an earlier incremental
+    run. Nothing is returned if the manifest is missing or damaged, was
+    written by another version of the generator or with other templates or
+    render code, or does not match schema.proto.
+
+    Args:
+        dst_path (str): Path to the output directory.
+
+    Returns:
+        dict[tuple, str]: Mapping from the id of every block, see
+                          get_block_id(), to its proto code.
+    """
+
+    try:
+        with open(dst_path + MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        with open(dst_path + 'schema.proto', 'r') as f:
+            proto = f.read()
+    except (OSError, ValueError):
+        return dict()
+
+    if (not isinstance(manifest, dict) or
+            manifest.get('generator_version') != constants.generator_version or
+            manifest.get('render_digest') != get_render_digest() or
+            manifest.get('sha256') != hashlib.sha256(proto.encode('utf-8')).hexdigest()):
+        return dict()
+
+    try:
+        return {(fn, name, digest): proto[start:end]
+                for fn, name, digest, start, end in manifest['blocks']}
+    except (KeyError, TypeError, ValueError):
+        return dict()
+
+
+def save_manifest(dst_path: str, blocks: Dict[tuple, Tuple[int, int]],
+                  sha256: str):
+    """Write the manifest of schema.proto.
+
+    Args:
+        dst_path (str): Path to the output directory.
+        blocks (dict[tuple, tuple(int, int)]): Mapping from the id of every
+                                               block to its start and end in
+                                               schema.proto.
+        sha256 (str): Checksum of schema.proto.
+    """
+
+    manifest = {
+        'generator_version': constants.generator_version,
+        'render_digest': get_render_digest(),
+        'sha256': sha256,
+        'blocks': [[*block_id, start, end]
+                   for block_id, (start, end) in blocks.items()]
+    }
+
+    fd, tmp_path = tempfile.mkstemp(dir=dst_path, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f)
+
+    os.replace(tmp_path, dst_path + MANIFEST_FILE)
+
+
+def get_change_report(old_keys: Iterable[tuple],
+                      new_keys: Iterable[tuple]) -> Dict[str, Any]:
+    """Return the messages that were added, changed or removed between two
+    runs. A message is changed if anything its block is rendered from has
+    changed, which includes inherited properties, the expanded range of
+    properties, enumeration values and comments.
+
+    Args:
+        old_keys (iterable[tuple]): Ids of the blocks of the earlier run.
+        new_keys (iterable[tuple]): Ids of the blocks of this run.
+
+    Returns:
+        dict: For every kind of message the sorted names of the added,
+              changed and removed messages, and the number of blocks and of
+              rendered blocks.
+    """
+
+    old_keys = set(old_keys)
+    new_keys = set(new_keys)
+
+    old_names = {(x[0], x[1]) for x in old_keys}
+    new_names = {(x[0], x[1]) for x in new_keys}
+    changed_names = {(x[0], x[1]) for x in new_keys - old_keys} & old_names
+
+    report = dict()
+    for fn, kind in _KINDS.items():
+        report[kind] = {
+            'added': sorted(x for f, x in new_names - old_names if f == fn),
+            'changed': sorted(x for f, x in changed_names if f == fn),
+            'removed': sorted(x for f, x in old_names - new_names if f == fn)
+        }
+
+    report['blocks'] = len(new_keys)
+    report['rendered'] = len(new_keys - old_keys)
+
+    return report
+
+
+def save_report(dst_path: str, report: Dict[str, Any]):
+    """Write the change report next to schema.proto.
+
+    Args:
+        dst_path (str): Path to the output directory.
+        report (dict): The report returned by get_change_report().
+    """
+
+    with open(dst_path + REPORT_FILE, 'w') as f:
+        json.dump(report, f, indent=4)
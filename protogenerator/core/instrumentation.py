@@ -0,0 +1,290 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import cProfile
+import json
+import platform
+import time
+import tracemalloc
+import utils.constants as constants
+from typing import Any, ContextManager, Dict, Iterable, Iterator, Optional
+
+_recorder = None
+
+# Returned by phase() while nothing is recorded, so that instrumented code
+# costs a single check.
+_NO_PHASE = contextlib.nullcontext()
+
+
+class Recorder():
+    """The Recorder measures the phases of a run of the generator. Every
+    phase records its wall time, the CPU time of this process and, if memory
+    is traced, the peak of the memory traced by tracemalloc while it ran.
+    Phases started inside another phase are recorded as <outer>/<inner>, a
+    phase that runs several times accumulates its times.
+
+    Args:
+        trace_memory (bool): Whether the peak memory of every phase is
+                             traced, tracing slows rendering down several
+                             times, so times are best taken without it.
+        profile (bool): Whether the run is profiled with cProfile as well.
+
+    Attributes:
+        trace_memory (bool): Whether the peak memory of every phase is
+                             traced.
+        phases (dict[str, dict]): Measurements of every phase, in the order
+                                  the phases were first started. The peak
+                                  memory is None if memory is not traced.
+        counts (dict[str, int]): Number of triples, classes, properties and
+                                 other items processed by the run.
+    """
+
+    def __init__(self, trace_memory: bool = False, profile: bool = False):
+        self.trace_memory = trace_memory
+        self.phases = dict()
+        self.counts = dict()
+        self.__stack = list()
+        self.__profiler = cProfile.Profile() if profile else None
+        self.__own_tracing = False
+        self.__start = None
+        self.__total = None
+
+    def start(self):
+        """Start recording, tracemalloc is started if it is not tracing
+        already.
+        """
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__own_tracing = True
+
+        self.__start = (time.perf_counter(), time.process_time())
+        if self.__profiler:
+            self.__profiler.enable()
+
+    def stop(self):
+        """Stop recording and tracemalloc, if it was started by start()."""
+
+        if self.__profiler:
+            self.__profiler.disable()
+
+        wall_time = time.perf_counter() - self.__start[0]
+        cpu_time = time.process_time() - self.__start[1]
+        peak = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = max([tracemalloc.get_traced_memory()[1]] + [
+                x['peak_memory'] or 0 for x in self.phases.values()])
+
+        if self.__own_tracing:
+            tracemalloc.stop()
+            self.__own_tracing = False
+
+        self.__total = {'wall_time': wall_time, 'cpu_time': cpu_time,
+                        'peak_memory': peak}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the code run inside the with statement as a phase.
+
+        Args:
+            name (str): Name of the phase.
+        """
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        path = name
+        if self.__stack:
+            path = self.__stack[-1][0] + '/' + name
+
+        if tracing:
+            # The peak of the outer phase so far is kept before the peak is
+            # reset for this phase.
+            if self.__stack:
+                self.__stack[-1][1] = max(
+                    self.__stack[-1][1], tracemalloc.get_traced_memory()[1])
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+
+        stats = self.phases.setdefault(path, {
+            'calls': 0, 'wall_time': 0.0, 'cpu_time': 0.0,
+            'peak_memory': None})
+        entry = [path, 0]
+        self.__stack.append(entry)
+        start = (time.perf_counter(), time.process_time())
+
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start[0]
+            cpu_time = time.process_time() - start[1]
+            self.__stack.pop()
+
+            stats['calls'] += 1
+            stats['wall_time'] += wall_time
+            stats['cpu_time'] += cpu_time
+
+            if tracing:
+                peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+                if self.__stack:
+                    self.__stack[-1][1] = max(self.__stack[-1][1], peak)
+                stats['peak_memory'] = max(stats['peak_memory'] or 0, peak)
+
+    def count(self, name: str, n: int = 1):
+        """Add n to a count.
+
+        Args:
+            name (str): Name of the count.
+            n (int): The number added.
+        """
+
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the report of the run.
+
+        Returns:
+            dict: The totals of the run, the measurements of every phase and
+                  the counts.
+        """
+
+        report = {
+            'generator_version': constants.generator_version,
+            'python': platform.python_version(),
+            'trace_memory': self.trace_memory
+        }
+        report.update(self.__total or dict())
+        report['phases'] = [dict(name=x, **stats)
+                            for x, stats in self.phases.items()]
+        report['counts'] = dict(sorted(self.counts.items()))
+
+        return report
+
+    def save(self, path: str):
+        """Write the report of the run as json.
+
+        Args:
+            path (str): Path to the report.
+        """
+
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, indent=4)
+
+    def dump_profile(self, path: str):
+        """Write the cProfile statistics of the run, which can be read with
+        the pstats module.
+
+        Args:
+            path (str): Path to the statistics.
+        """
+
+        assert self.__profiler, 'The run is not profiled.'
+
+        self.__profiler.dump_stats(path)
+
+
+def start(trace_memory: bool = False, profile: bool = False) -> Recorder:
+    """Start recording the phases of the generator in this process. Code
+    run in worker processes is only measured as part of the phase that
+    waits for it.
+
+    Args:
+        trace_memory (bool): Whether the peak memory of every phase is
+                             traced.
+        profile (bool): Whether the run is profiled with cProfile as well.
+
+    Returns:
+        Recorder: The recorder of the run.
+    """
+
+    global _recorder
+
+    assert _recorder is None, 'Instrumentation is already started.'
+
+    _recorder = Recorder(trace_memory, profile)
+    _recorder.start()
+    return _recorder
+
+
+def stop() -> Optional[Recorder]:
+    """Stop recording.
+
+    Returns:
+        Recorder: The recorder of the run, None if it was not started.
+    """
+
+    global _recorder
+
+    recorder = _recorder
+    _recorder = None
+    if recorder:
+        recorder.stop()
+
+    return recorder
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Return a context manager that measures a phase, it does nothing if
+    instrumentation is not started.
+
+    Args:
+        name (str): Name of the phase.
+
+    Returns:
+        ContextManager: The context manager of the phase.
+    """
+
+    if _recorder is None:
+        return _NO_PHASE
+
+    return _recorder.phase(name)
+
+
+def count(name: str, n: int = 1):
+    """Add n to a count if instrumentation is started.
+
+    Args:
+        name (str): Name of the count.
+        n (int): The number added.
+    """
+
+    if _recorder is not None:
+        _recorder.count(name, n)
+
+
+def count_items(items: Iterable[Any], name: str) -> Iterable[Any]:
+    """Count the items of an iterable while they are consumed.
+
+    Args:
+        items (iterable): The items.
+        name (str): Name of the count.
+
+    Returns:
+        iterable: The same items, items itself if instrumentation is not
+                  started.
+    """
+
+    if _recorder is None:
+        return items
+
+    return _count_items(items, name, _recorder)
+
+
+def _count_items(items: Iterable[Any], name: str,
+                 recorder: Recorder) -> Iterator[Any]:
+    n = 0
+    try:
+        for x in items:
+            n += 1
+            yield x
+    finally:
+        recorder.count(name, n)
@@ -0,0 +1,100 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import collections.abc
+import json
+from typing import Any, Dict, Iterator
+
+
+class Messages(collections.abc.Mapping):
+    """Read-only mapping from message name to its json descriptor with the
+    full list of fields. Messages with inherited fields are expanded when
+    they are first accessed.
+
+    Args:
+        messages (dict): The messages of the descriptor as written.
+    """
+
+    def __init__(self, messages: Dict[str, Dict[str, Any]]):
+        self.__messages = messages
+        self.__cache = dict()
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        message = self.__messages[name]
+        if 'inherits' not in message:
+            return message
+
+        if name not in self.__cache:
+            # The own fields of a referenced message follow its '@id'.
+            fields = list(message['fields'])
+            for x in message['inherits']:
+                fields.extend(self.__messages[x]['fields'][1:])
+
+            o = {k: v for k, v in message.items() if k != 'inherits'}
+            o['fields'] = fields
+            self.__cache[name] = o
+
+        return self.__cache[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__messages)
+
+    def __len__(self) -> int:
+        return len(self.__messages)
+
+
+class JsonDescriptor():
+    """The JsonDescriptor reads schema_descriptor.json of any version and
+    gives the messages in the form of version 1, where every message lists
+    all of its fields.
+
+    Args:
+        descriptor (dict): The parsed contents of schema_descriptor.json.
+
+    Attributes:
+        version (int): Version of the descriptor.
+        messages (Messages): Mapping from message name to its json
+                             descriptor.
+        primitives (list[str]): List of the undefined classes and primitives.
+    """
+
+    def __init__(self, descriptor: Dict[str, Any]):
+        assert isinstance(
+            descriptor, dict), "Invalid parameter 'descriptor' must be 'dict'."
+
+        self.version = descriptor.get('version', 1)
+        self.messages = Messages(descriptor['messages'])
+        self.primitives = descriptor['primitives']
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the whole descriptor in the format of version 1.
+
+        Returns:
+            dict: The expanded descriptor.
+        """
+
+        return {'messages': dict(self.messages), 'primitives': self.primitives}
+
+
+def load(path: str) -> JsonDescriptor:
+    """Read schema_descriptor.json.
+
+    Args:
+        path (str): Path to the json descriptor.
+
+    Returns:
+        JsonDescriptor: The descriptor.
+    """
+
+    with open(path, 'r') as f:
+        return JsonDescriptor(json.load(f))
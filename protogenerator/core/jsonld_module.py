@@ -0,0 +1,228 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# JSON-LD serializers specialized for the messages of schema.proto.
+#
+# The module written here has one function per message that converts an
+# object of the message to JSON-LD the way schemaorgutils.JSONLDSerializer
+# does, with the (type) options, json names and enum URLs of schema.proto
+# written as constants, so nothing is looked up in the descriptors while
+# serializing.
+import core.file_descriptor as file_descriptor
+import utils.constants as constants
+from google.protobuf import descriptor_pb2
+from typing import Dict, List, TextIO
+
+_FieldDescriptorProto = descriptor_pb2.FieldDescriptorProto
+
+_HEADER = '''# -*- coding: utf-8 -*-
+# Generated by the schema.org protogenerator {version}.  DO NOT EDIT!
+# source: {file_name}
+"""JSON-LD serializers of the messages of {file_name}.
+
+Pass this module to schemaorgutils.serializer.JSONLDSerializer to serialize
+objects with the functions of their message instead of reading the
+descriptors of every object.
+"""
+import datetime
+
+
+def _primitive(value):
+    return value
+
+
+def _date(obj):
+    return datetime.date(
+        year=obj.year, month=obj.month, day=obj.day).isoformat()
+
+
+def _time(obj):
+    time = datetime.time(
+        hour=obj.hours, minute=obj.minutes, second=obj.seconds)
+    if obj.timezone:
+        time = datetime.time.fromisoformat(time.isoformat() + obj.timezone)
+    return time.isoformat()
+
+
+def _datetime(obj):
+    date = obj.date
+    time = obj.time
+    date_time = datetime.datetime(
+        year=date.year, month=date.month, day=date.day, hour=time.hours,
+        minute=time.minutes, second=time.seconds)
+    if time.timezone:
+        date_time = datetime.datetime.fromisoformat(
+            date_time.isoformat() + time.timezone)
+    return date_time.isoformat()
+
+
+def _duration(obj):
+    import isodate
+    return isodate.duration_isoformat(datetime.timedelta(seconds=obj.seconds))
+
+
+def _quantitative(obj):
+    return str(obj.value) + ' ' + obj.unit
+'''
+
+_CLASS = '''
+
+def {function}(obj):
+    out = {{'@type': {type!r}}}
+    fields = {table}
+    for field, value in obj.ListFields():
+        json_name, serialize = fields[field.number]
+        if serialize is None:
+            out[json_name] = value
+        elif len(value) == 1:
+            out[json_name] = serialize(value[0])
+        else:
+            out[json_name] = [serialize(x) for x in value]
+    return out
+'''
+
+_PROPERTY = '''
+
+def {function}(obj):
+    name = obj.WhichOneof('values')
+    if name is not None:
+        return {table}[name](getattr(obj, name))
+'''
+
+_ENUM = '''
+
+def {function}(obj):
+    value = {table}.get(obj.{id})
+    if value is not None:
+        return value
+    return {value_function}(obj.{value})
+'''
+
+_FOOTER = '''
+
+# Serializer of every message by the full name of the message.
+SERIALIZERS = {serializers}
+
+
+def serialize(obj):
+    return SERIALIZERS[obj.DESCRIPTOR.full_name](obj)
+'''
+
+# Functions of the messages of datatypes.txt by their (type) option.
+_DATATYPE_FUNCTIONS = {
+    'DatatypeDate': '_date',
+    'DatatypeTime': '_time',
+    'DatatypeDateTime': '_datetime',
+    'DatatypeDuration': '_duration',
+    'DatatypeQuantitative': '_quantitative',
+}
+
+
+def _get_function(message: str) -> str:
+    return '_serialize_' + message
+
+
+def _get_field_function(field: descriptor_pb2.FieldDescriptorProto,
+                        functions: Dict[str, str]) -> str:
+    if field.type == _FieldDescriptorProto.TYPE_MESSAGE:
+        return functions[field.type_name]
+
+    return '_primitive'
+
+
+def _get_enum_urls(message: descriptor_pb2.DescriptorProto,
+                   file_proto: descriptor_pb2.FileDescriptorProto) -> Dict[int, str]:
+    # The enum is declared in the message named by the type of the first
+    # field of the wrapper.
+    scope, name = message.field[0].type_name.rsplit('.', 1)
+    owner = next(x for x in file_proto.message_type
+                 if '.' + file_proto.package + '.' + x.name == scope)
+    enum = next(x for x in owner.enum_type if x.name == name)
+
+    return {x.number: file_descriptor.get_option(
+        x.options, file_descriptor.SCHEMAORG_VALUE_OPTION)
+        for x in enum.value if x.name != 'UNKNOWN'}
+
+
+def _get_table(name: str, entries: List[str]) -> str:
+    body = '{' + ''.join('\n    ' + x + ',' for x in entries) + (
+        '\n}' if entries else '}')
+    if name is None:
+        return body
+
+    return name + ' = ' + body + '\n'
+
+
+def write(outFile: TextIO, file_proto: descriptor_pb2.FileDescriptorProto):
+    """Write a python module with a JSON-LD serializer for every message of
+    schema.proto.
+
+    Args:
+        outFile (TextIO): File to which the module is written.
+        file_proto (FileDescriptorProto): The descriptor of schema.proto.
+    """
+
+    scope = '.' + file_proto.package + '.'
+    functions = dict()
+    for message in file_proto.message_type:
+        message_type = file_descriptor.get_option(
+            message.options, file_descriptor.TYPE_OPTION)
+        functions[scope + message.name] = _DATATYPE_FUNCTIONS.get(
+            message_type, _get_function(message.name))
+
+    outFile.write(_HEADER.format(version=constants.generator_version,
+                                 file_name=file_proto.name))
+
+    # The tables refer to the functions, so they are written after every
+    # function is defined.
+    tables = list()
+    for message in file_proto.message_type:
+        message_type = file_descriptor.get_option(
+            message.options, file_descriptor.TYPE_OPTION)
+        if message_type in _DATATYPE_FUNCTIONS:
+            continue
+
+        function = _get_function(message.name)
+        table = '_TABLE_' + message.name
+
+        if message_type == 'Property':
+            outFile.write(_PROPERTY.format(function=function, table=table))
+            entries = ['{!r}: {}'.format(x.name, _get_field_function(
+                x, functions)) for x in message.field]
+
+        elif message_type == 'EnumWrapper':
+            outFile.write(_ENUM.format(
+                function=function, table=table, id=message.field[0].name,
+                value=message.field[1].name,
+                value_function=functions[message.field[1].type_name]))
+            entries = ['{}: {!r}'.format(number, url) for number, url in
+                       _get_enum_urls(message, file_proto).items()]
+
+        else:
+            outFile.write(_CLASS.format(
+                function=function, type=message_type, table=table))
+            entries = list()
+            for x in message.field:
+                serialize = 'None'
+                if x.label == _FieldDescriptorProto.LABEL_REPEATED:
+                    serialize = _get_field_function(x, functions)
+                entries.append('{}: ({!r}, {})'.format(
+                    x.number, x.json_name, serialize))
+
+        tables.append(_get_table(table, entries))
+
+    outFile.write('\n\n')
+    outFile.write(''.join(tables))
+    outFile.write(_FOOTER.format(serializers=_get_table(None, [
+        '{!r}: {}'.format(x[1:], f) for x, f in functions.items()])))
+
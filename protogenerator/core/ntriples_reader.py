@@ -0,0 +1,174 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+import utils.constants as constants
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+# Predicates that are used by the SchemaGenerator, triples with any other
+# predicate are skipped without being decoded.
+SCHEMA_PREDICATES = frozenset(str(constants.schema_constants[x]).encode('utf-8') for x in [
+    'Type', 'subClassOf', 'domainIncludes', 'rangeIncludes', 'Comment'])
+
+_ESCAPE_RE = re.compile(
+    r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.DOTALL)
+
+_ESCAPES = {
+    't': '\t',
+    'b': '\b',
+    'n': '\n',
+    'r': '\r',
+    'f': '\f',
+    '"': '"',
+    "'": "'",
+    '\\': '\\'
+}
+
+
+def _unescape_match(m: re.Match) -> str:
+    """Return the character represented by an escape sequence.
+
+    Args:
+        m (re.Match): Match of _ESCAPE_RE.
+
+    Returns:
+        str: The unescaped character.
+    """
+
+    if m.group(1):
+        return chr(int(m.group(1), 16))
+    elif m.group(2):
+        return chr(int(m.group(2), 16))
+    elif m.group(3) in _ESCAPES:
+        return _ESCAPES[m.group(3)]
+    else:
+        raise ValueError('Invalid escape sequence \\' + m.group(3) + '.')
+
+
+def unescape(x: str) -> str:
+    """Return x after replacing N-Triples escape sequences.
+
+    Args:
+        x (str): Escaped IRI or literal.
+
+    Returns:
+        str: The unescaped string.
+    """
+
+    if '\\' not in x:
+        return x
+
+    return _ESCAPE_RE.sub(_unescape_match, x)
+
+
+def parse_line(line: bytes,
+               predicates: Optional[Iterable[bytes]] = SCHEMA_PREDICATES) -> Optional[Tuple[str, str, str]]:
+    """Parse a single line of an N-Triples document.
+
+    Args:
+        line (bytes): The line to be parsed.
+        predicates (iterable[bytes]): The predicates of interest, every
+                                      predicate is of interest if None.
+
+    Returns:
+        tuple(str, str, str): The (subject, predicate, object) of the triple,
+                              IRIs are returned without the angle brackets and
+                              literals without quotes, language or datatype.
+                              None if the line is empty, a comment or its
+                              predicate is not of interest.
+    """
+
+    line = line.strip()
+    if not line or line[0] == 35:  # '#'
+        return None
+
+    try:
+        # Subject is either an IRI or a blank node, which ends at the first
+        # space or tab.
+        if line[0] == 60:  # '<'
+            end = line.index(b'>')
+            subject = line[1:end]
+        else:
+            end = len(line.split(None, 1)[0]) - 1
+            subject = line[:end + 1]
+
+        start = line.index(b'<', end + 1)
+        end = line.index(b'>', start)
+        predicate = line[start + 1:end]
+
+        if predicates is not None and predicate not in predicates:
+            return None
+
+        rest = line[end + 1:].strip()
+        if not rest.endswith(b'.'):
+            raise ValueError
+        rest = rest[:-1].rstrip()
+
+        if rest[0] == 60:  # '<'
+            obj = rest[1:rest.index(b'>')]
+        elif rest[0] == 34:  # '"'
+            # Find the closing quote, skipping escaped characters.
+            i = 1
+            while rest[i] != 34:
+                i += 2 if rest[i] == 92 else 1  # '\\'
+            obj = rest[1:i]
+        else:
+            obj = rest
+    except (ValueError, IndexError):
+        raise ValueError('Invalid N-Triples line: ' + repr(line) + '.') from None
+
+    return (unescape(subject.decode('utf-8')),
+            unescape(predicate.decode('utf-8')),
+            unescape(obj.decode('utf-8')))
+
+
+def iter_triples(f: BinaryIO,
+                 predicates: Optional[Iterable[bytes]] = SCHEMA_PREDICATES) -> Iterator[Tuple[str, str, str]]:
+    """Yield the triples of an N-Triples stream one line at a time.
+
+    Args:
+        f (file): Stream opened in binary mode.
+        predicates (iterable[bytes]): The predicates of interest, every
+                                      predicate is yielded if None.
+
+    Yields:
+        tuple(str, str, str): The (subject, predicate, object) of every triple
+                              whose predicate is of interest.
+    """
+
+    if predicates is not None:
+        predicates = frozenset(predicates)
+
+    for line in f:
+        triple = parse_line(line, predicates)
+        if triple:
+            yield triple
+
+
+def read_triples(src_file_path: str,
+                 predicates: Optional[Iterable[bytes]] = SCHEMA_PREDICATES) -> Iterator[Tuple[str, str, str]]:
+    """Yield the triples of an N-Triples file using buffered reads, so that
+    the file is never held in memory as a whole.
+
+    Args:
+        src_file_path (str): Path to the N-Triples file.
+        predicates (iterable[bytes]): The predicates of interest, every
+                                      predicate is yielded if None.
+
+    Yields:
+        tuple(str, str, str): The (subject, predicate, object) of every triple
+                              whose predicate is of interest.
+    """
+
+    with open(src_file_path, 'rb', buffering=1 << 20) as f:
+        yield from iter_triples(f, predicates)
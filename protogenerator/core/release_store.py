@@ -0,0 +1,406 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import io
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.request
+import core.schema_cache as schema_cache
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(schema_cache.DEFAULT_CACHE_DIR, 'releases')
+RELEASE_URL = 'https://raw.githubusercontent.com/schemaorg/schemaorg/master/data/releases/{}/schema.nt'
+
+_CHUNK_SIZE = 1 << 16
+
+
+class ReleaseStore():
+    """The ReleaseStore keeps downloaded schema.org releases on disk.
+
+    A release is downloaded to a partial file that is renamed into place once
+    it is complete, so an interrupted download never leaves a broken release
+    behind and is resumed with a range request on the next fetch. Cached
+    releases are revalidated with their ETag and Last-Modified headers and
+    their checksum is verified before they are used.
+
+    Args:
+        cache_dir (str): Path to the directory where releases are stored.
+        url (str): Format string of the release URL, {} is replaced by the
+                   release number.
+        offline (bool): If True, releases are only read from the cache.
+        timeout (float): Timeout of network operations in seconds.
+
+    Attributes:
+        cache_dir (str): Path to the directory where releases are stored.
+        url (str): Format string of the release URL.
+        offline (bool): If True, releases are only read from the cache.
+        timeout (float): Timeout of network operations in seconds.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 url: str = RELEASE_URL, offline: bool = False,
+                 timeout: float = 60):
+
+        assert isinstance(
+            cache_dir, str), "Invalid parameter 'cache_dir' must be 'str'."
+        assert isinstance(url, str), "Invalid parameter 'url' must be 'str'."
+
+        self.cache_dir = cache_dir
+        self.url = url
+        self.offline = offline
+        self.timeout = timeout
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_path(self, version: str) -> str:
+        """Return the path of a release in the cache.
+
+        Args:
+            version (str): Schema.org release number.
+
+        Returns:
+            str: Path to the N-Triples file of the release.
+        """
+
+        return os.path.join(self.cache_dir, version + '.nt')
+
+    def fetch(self, version: str, sha256: Optional[str] = None) -> str:
+        """Return the path of a release, downloading it if it is not cached
+        or has changed on the server.
+
+        Args:
+            version (str): Schema.org release number.
+            sha256 (str): Expected checksum of the release, the checksum
+                          computed when the release was downloaded is used
+                          if None.
+
+        Returns:
+            str: Path to the N-Triples file of the release.
+
+        Raises:
+            FileNotFoundError: The store is offline and the release is not
+                               cached.
+            ValueError: The downloaded release does not match sha256.
+            urllib.error.URLError: The release could not be downloaded.
+        """
+
+        with self.open(version, sha256) as f:
+            if f.path is None:
+                for _ in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                    pass
+
+        return self.get_path(version)
+
+    def open(self, version: str, sha256: Optional[str] = None,
+             tee: bool = True) -> 'ReleaseStream':
+        """Open a release for reading. A cached release that is still
+        current is read from disk, otherwise the release is read from the
+        response while it is being downloaded.
+
+        Args:
+            version (str): Schema.org release number.
+            sha256 (str): Expected checksum of the release, the checksum
+                          computed when the release was downloaded is used
+                          if None.
+            tee (bool): If True, a downloaded release is also written to the
+                        cache and moved into place once it has been read
+                        completely.
+
+        Returns:
+            ReleaseStream: Binary stream of the N-Triples file of the
+                           release.
+
+        Raises:
+            FileNotFoundError: The store is offline and the release is not
+                               cached.
+            ValueError: The downloaded release does not match sha256, raised
+                        once the end of the stream is reached.
+            urllib.error.URLError: The release could not be downloaded.
+        """
+
+        assert isinstance(
+            version, str), "Invalid parameter 'version' must be 'str'."
+
+        path = self.get_path(version)
+        meta = self.__read_meta(path + '.json')
+
+        if meta and not self.__verify(path, sha256 or meta.get('sha256')):
+            # A damaged release is downloaded again.
+            self.__remove(path, path + '.json')
+            meta = None
+
+        if self.offline:
+            if meta is None:
+                raise FileNotFoundError(
+                    'Release ' + version + ' is not in the cache.')
+            return ReleaseStream(open(path, 'rb', buffering=0), path)
+
+        url = self.url.format(version)
+
+        try:
+            raw = self.__open_download(url, path, meta, sha256, tee)
+        except urllib.error.URLError:
+            # The cached release is still valid when the server can not be
+            # reached.
+            if meta is None:
+                raise
+            raw = None
+
+        if raw is None:
+            return ReleaseStream(open(path, 'rb', buffering=0), path)
+
+        return ReleaseStream(raw, None)
+
+    def __open_download(self, url: str, path: str,
+                        meta: Optional[Dict[str, Any]],
+                        sha256: Optional[str],
+                        tee: bool) -> Optional['_DownloadReader']:
+        """Request a release if it has changed, resuming a partial download
+        of the same version of the file.
+
+        Args:
+            url (str): URL of the release.
+            path (str): Path where the release is stored.
+            meta (dict): Metadata of the cached release, None if the release
+                         is not cached.
+            sha256 (str): Expected checksum of the release.
+            tee (bool): If True, the release is written to the cache while
+                        it is read.
+
+        Returns:
+            _DownloadReader: Reader of the release, None if the cached
+                             release is current.
+        """
+
+        part_path = path + '.part'
+        part_meta = self.__read_meta(part_path + '.json')
+        offset = 0
+
+        request = urllib.request.Request(url)
+
+        if meta:
+            if meta.get('etag'):
+                request.add_header('If-None-Match', meta['etag'])
+            if meta.get('last_modified'):
+                request.add_header('If-Modified-Since', meta['last_modified'])
+        elif tee and part_meta and os.path.exists(part_path):
+            validator = part_meta.get('etag') or part_meta.get(
+                'last_modified')
+            if validator:
+                offset = os.path.getsize(part_path)
+                request.add_header('Range', 'bytes={}-'.format(offset))
+                request.add_header('If-Range', validator)
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            if e.code == 416:
+                # The partial file does not match the file on the server.
+                self.__remove(part_path, part_path + '.json')
+                return self.__open_download(url, path, meta, sha256, tee)
+            raise
+
+        if response.status != 206:
+            offset = 0
+
+        new_meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+
+        length = response.headers.get('Content-Length')
+        if length is not None:
+            length = offset + int(length)
+
+        part = None
+        if tee:
+            self.__write_meta(part_path + '.json', new_meta)
+            part = open(part_path, 'ab' if offset else 'wb')
+
+        def finish(checksum: str, size: int):
+            if length is not None and size != length:
+                raise urllib.error.URLError(
+                    'Incomplete download of ' + url + '.')
+
+            if sha256 and checksum != sha256:
+                self.__remove(part_path, part_path + '.json')
+                raise ValueError('Checksum mismatch for ' + url + '.')
+
+            if tee:
+                new_meta['sha256'] = checksum
+                os.replace(part_path, path)
+                self.__write_meta(path + '.json', new_meta)
+                self.__remove(part_path + '.json')
+
+        return _DownloadReader(response, part_path if offset else None, part,
+                               finish)
+
+    def __verify(self, path: str, sha256: Optional[str]) -> bool:
+        """Return whether a cached release is intact.
+
+        Args:
+            path (str): Path to the release.
+            sha256 (str): Expected checksum of the release.
+
+        Returns:
+            bool: True if the file exists and matches sha256.
+        """
+
+        return os.path.exists(path) and self.__get_checksum(path) == sha256
+
+    def __get_checksum(self, path: str) -> str:
+        """Return the sha256 checksum of a file.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            str: The hex digest of the file.
+        """
+
+        h = hashlib.sha256()
+
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+
+        return h.hexdigest()
+
+    def __read_meta(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata stored at path.
+
+        Args:
+            path (str): Path to the metadata file.
+
+        Returns:
+            dict: The metadata, None if the file is missing or invalid.
+        """
+
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def __write_meta(self, path: str, meta: Dict[str, Any]):
+        """Atomically write metadata to path.
+
+        Args:
+            path (str): Path to the metadata file.
+            meta (dict): The metadata.
+        """
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+
+        os.replace(tmp_path, path)
+
+    def __remove(self, *paths: str):
+        """Remove files that may not exist.
+
+        Args:
+            paths (str): Paths to the files.
+        """
+
+        for x in paths:
+            try:
+                os.remove(x)
+            except FileNotFoundError:
+                pass
+
+
+class ReleaseStream(io.BufferedReader):
+    """Buffered binary stream of a release.
+
+    Args:
+        raw (RawIOBase): The unbuffered stream of the release.
+        path (str): Path to the release if it is read from the cache.
+
+    Attributes:
+        path (str): Path to the release if it is read from the cache, None if
+                    it is read while being downloaded.
+    """
+
+    def __init__(self, raw: io.RawIOBase, path: Optional[str]):
+        super().__init__(raw, _CHUNK_SIZE)
+        self.path = path
+
+
+class _DownloadReader(io.RawIOBase):
+    """Unbuffered stream of a release that is being downloaded. The part of
+    the release that was already downloaded is read first, then the
+    response, which is also appended to the partial file. Once the end of
+    the release is reached finish is called with its checksum and size.
+
+    Args:
+        response (BinaryIO): The response of the server.
+        prefix_path (str): Path to the partial file whose contents precede
+                           the response, None if the response is complete.
+        part (BinaryIO): The partial file the response is appended to, None
+                         if the response is not stored.
+        finish (function): Called with the checksum and the size of the
+                           release at its end.
+    """
+
+    def __init__(self, response: BinaryIO, prefix_path: Optional[str],
+                 part: Optional[BinaryIO], finish: Callable[[str, int], None]):
+        self.__response = response
+        self.__prefix = open(prefix_path, 'rb') if prefix_path else None
+        self.__part = part
+        self.__finish = finish
+        self.__hash = hashlib.sha256()
+        self.__size = 0
+        self.__done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = 0
+
+        if self.__prefix:
+            n = self.__prefix.readinto(b)
+            if not n:
+                self.__prefix.close()
+                self.__prefix = None
+
+        if not n:
+            n = self.__response.readinto(b)
+            if n and self.__part:
+                self.__part.write(b[:n])
+
+        if n:
+            self.__hash.update(b[:n])
+            self.__size += n
+        elif not self.__done:
+            self.__done = True
+            if self.__part:
+                self.__part.close()
+            self.__finish(self.__hash.hexdigest(), self.__size)
+
+        return n
+
+    def close(self):
+        # An unfinished partial file is kept so that it can be resumed.
+        for x in (self.__response, self.__prefix, self.__part):
+            if x:
+                x.close()
+
+        super().close()
@@ -0,0 +1,183 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+import utils.constants as constants
+import utils.utils as utils
+from core.schema_index import SchemaIndex
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser('~'), '.cache', 'schemaorg-protogenerator')
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Sources that parse a schema into the cached SchemaIndex, snapshots of
+# other sources are not used.
+_PARSER_SOURCES = ['core/ntriples_reader.py', 'core/schema_index.py',
+                   'core/schema_generator.py', 'utils/utils.py',
+                   'utils/constants.py']
+
+# Errors raised by unpickling a truncated, damaged or outdated snapshot.
+_SNAPSHOT_ERRORS = (pickle.UnpicklingError, EOFError, AttributeError,
+                    ImportError, IndexError, KeyError, TypeError, ValueError)
+
+
+@functools.lru_cache(maxsize=1)
+def get_parser_digest() -> str:
+    """Return the checksum of the code that schemas are parsed with.
+
+    Returns:
+        str: The sha256 checksum of the sources.
+    """
+
+    return utils.get_source_digest(_PARSER_SOURCES)
+
+
+class SchemaCache():
+    """The SchemaCache stores snapshots of parsed schemas on disk so that an
+    unchanged source file does not have to be parsed again. Entries are keyed
+    by the content hash of the source file and the generator version, and the
+    least recently used entries are evicted once the cache grows beyond
+    max_size.
+
+    Args:
+        cache_dir (str): Path to the directory where snapshots are stored.
+        max_size (int): Maximum size of the cache directory in bytes.
+
+    Attributes:
+        cache_dir (str): Path to the directory where snapshots are stored.
+        max_size (int): Maximum size of the cache directory in bytes.
+        hits (int): Number of lookups that were served from the cache.
+        misses (int): Number of lookups that were not found in the cache.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_size: int = DEFAULT_MAX_SIZE):
+
+        assert isinstance(
+            cache_dir, str), "Invalid parameter 'cache_dir' must be 'str'."
+        assert isinstance(
+            max_size, int), "Invalid parameter 'max_size' must be 'int'."
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_key(self, src_file_path: str) -> str:
+        """Return the cache key of a source file.
+
+        Args:
+            src_file_path (str): Path to the file containing schema.
+
+        Returns:
+            str: Hash of the contents of the file, the generator version and
+                 the code that parses it.
+        """
+
+        h = hashlib.sha256()
+        h.update(constants.generator_version.encode('utf-8'))
+        h.update(b'\0')
+        h.update(get_parser_digest().encode('utf-8'))
+        h.update(b'\0')
+
+        with open(src_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+
+        return h.hexdigest()
+
+    def load(self, key: str) -> Optional[SchemaIndex]:
+        """Return the schema index stored under key.
+
+        Args:
+            key (str): The cache key returned by get_key().
+
+        Returns:
+            SchemaIndex: The cached index, None if key is not in the cache.
+        """
+
+        path = self.__get_path(key)
+
+        try:
+            with open(path, 'rb') as f:
+                index = SchemaIndex.from_snapshot(pickle.load(f))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except _SNAPSHOT_ERRORS:
+            # A truncated or outdated entry is treated as a miss.
+            os.remove(path)
+            self.misses += 1
+            return None
+
+        # Mark the entry as recently used.
+        os.utime(path)
+        self.hits += 1
+        return index
+
+    def store(self, key: str, index: SchemaIndex):
+        """Store a schema index under key and evict old entries if the cache
+        has grown beyond max_size.
+
+        Args:
+            key (str): The cache key returned by get_key().
+            index (SchemaIndex): The index to be stored.
+        """
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(index.to_snapshot(), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, self.__get_path(key))
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the size of the cache is
+        at most max_size.
+        """
+
+        entries = list()
+        total_size = 0
+
+        for x in os.listdir(self.cache_dir):
+            if x.endswith('.pickle'):
+                st = os.stat(os.path.join(self.cache_dir, x))
+                entries.append((st.st_mtime, st.st_size, x))
+                total_size += st.st_size
+
+        for _, size, x in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            os.remove(os.path.join(self.cache_dir, x))
+            total_size -= size
+
+    def __get_path(self, key: str) -> str:
+        """Return the path of the snapshot stored under key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: Path to the snapshot file.
+        """
+
+        return os.path.join(self.cache_dir, key + '.pickle')
@@ -15,270 +15,874 @@ import rdflib
 import core.descriptors.class_descriptor as class_descriptor
 import core.descriptors.property_descriptor as property_descriptor
 import core.descriptors.enum_descriptor as enum_descriptor
+import core.schema_index as schema_index
+import core.schema_cache as schema_cache
+import core.ntriples_reader as ntriples_reader
+import core.template_registry as template_registry
+import core.schema_model as schema_model
+import core.binary_descriptor as binary_descriptor
+import core.incremental as incremental
+import core.field_numbers as field_numbers
+import core.file_descriptor as file_descriptor
+import core.jsonld_module as jsonld_module
+import core.instrumentation as instrumentation
 import utils.utils as utils
 import utils.constants as constants
 import json
-import collections
-from jinja2 import Environment, FileSystemLoader
-from bs4 import BeautifulSoup
-from typing import Dict, Set, Tuple
+import concurrent.futures
+import math
+from typing import BinaryIO, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, TextIO, Tuple, Union
+from google.protobuf import descriptor_pb2
 from utils.utils import PropertyToParent as PropertyToParent
 
+# Size of the buffer used when writing the output files.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Number of chunks every worker gets when rendering in parallel, more chunks
+# balance the load better at the cost of more inter process communication.
+_CHUNKS_PER_JOB = 4
+
+# Formats in which the schema descriptor can be written.
+DESCRIPTOR_FORMATS = ('json', 'binary')
+
+# Versions of schema_descriptor.json that can be written.
+DESCRIPTOR_VERSIONS = (1, 2)
+
+# Formats in which the descriptors protoc builds from schema.proto can be
+# written without running protoc.
+COMPILED_FORMATS = ('descriptor_set', 'python', 'python_package',
+                    'jsonld_serializer')
+
+
+def _render_class(name: str, field_types: List[PropertyToParent],
+                  comment: str, numbers: Tuple[Tuple[str, int], ...] = (),
+                  reserved: Tuple[int, ...] = (),
+                  flat_types: Tuple[Tuple[str, str], ...] = ()) -> str:
+    """Return proto code for a schema class.
+
+    Args:
+        name (str): Name of the schema class.
+        field_types (list[PropertyToParent]): The schema properties that belong
+                                              to the schema class.
+        comment (str): The comment of the schema class.
+        numbers (tuple[tuple(str, int)]): Fixed field numbers of properties.
+        reserved (tuple[int]): Field numbers of removed properties.
+        flat_types (tuple[tuple(str, str)]): Proto types of the flattened
+                                             properties.
+
+    Returns:
+        str: The proto code for the schema class as a string.
+    """
+
+    with instrumentation.phase('sanitize_comments'):
+        comment = utils.get_comment_text(comment)
+    return class_descriptor.ClassDescriptor(
+        name, field_types, dict(numbers), list(reserved),
+        dict(flat_types)).to_proto(comment) + '\n'
+
+
+def _render_enum(name: str, field_types: List[PropertyToParent],
+                 enum_values: List[str], comment: str,
+                 numbers: Tuple[Tuple[str, int], ...] = (),
+                 reserved: Tuple[int, ...] = (),
+                 value_numbers: Tuple[Tuple[str, int], ...] = (),
+                 reserved_values: Tuple[int, ...] = (),
+                 flat_types: Tuple[Tuple[str, str], ...] = ()) -> str:
+    """Return proto code for a schema enumeration.
+
+    Args:
+        name (str): Name of the schema enumeration.
+        field_types (list[PropertyToParent]): The schema properties that belong
+                                              to the schema enumeration.
+        enum_values (list[str]): The possible values of the schema enumeration.
+        comment (str): The comment of the schema enumeration.
+        numbers (tuple[tuple(str, int)]): Fixed field numbers of properties.
+        reserved (tuple[int]): Field numbers of removed properties.
+        value_numbers (tuple[tuple(str, int)]): Fixed numbers of enum values.
+        reserved_values (tuple[int]): Numbers of removed enum values.
+        flat_types (tuple[tuple(str, str)]): Proto types of the flattened
+                                             properties.
+
+    Returns:
+        str: The proto code for the schema enumeration as a string.
+    """
+
+    with instrumentation.phase('sanitize_comments'):
+        comment = utils.get_comment_text(comment)
+    return enum_descriptor.EnumDescriptor(
+        name, field_types, enum_values, dict(numbers), list(reserved),
+        dict(value_numbers), list(reserved_values),
+        dict(flat_types)).to_proto(comment) + '\n'
+
+
+def _render_property(name: str, field_types: List[str],
+                     class_list: List[str], comment: str,
+                     numbers: Tuple[Tuple[str, int], ...] = (),
+                     reserved: Tuple[int, ...] = ()) -> str:
+    """Return proto code for a schema property.
+
+    Args:
+        name (str): Name of the schema property.
+        field_types (list[str]): The schema classes/datatypes that are included
+                                 in range of schema property.
+        class_list (list[str]): List of defined classes.
+        comment (str): The comment of the schema property.
+        numbers (tuple[tuple(str, int)]): Fixed field numbers of
+                                          classes/datatypes.
+        reserved (tuple[int]): Field numbers of removed classes/datatypes.
+
+    Returns:
+        str: The proto code for the schema property as a string.
+    """
+
+    with instrumentation.phase('sanitize_comments'):
+        comment = utils.get_comment_text(comment)
+    return property_descriptor.PropertyDescriptor(
+        name, field_types, class_list, dict(numbers),
+        list(reserved)).to_proto(comment) + '\n'
+
+
+def _describe_class(package_name: str, name: str,
+                    field_types: List[PropertyToParent], comment: str,
+                    numbers: Tuple[Tuple[str, int], ...] = (),
+                    reserved: Tuple[int, ...] = (),
+                    flat_types: Tuple[Tuple[str, str], ...] = ()) -> List[descriptor_pb2.DescriptorProto]:
+    """Return the descriptor of the proto code _render_class() returns for
+    the same arguments.
+    """
+
+    return [class_descriptor.ClassDescriptor(
+        name, field_types, dict(numbers), list(reserved),
+        dict(flat_types)).to_descriptor(package_name)]
+
+
+def _describe_enum(package_name: str, name: str,
+                   field_types: List[PropertyToParent],
+                   enum_values: List[str], comment: str,
+                   numbers: Tuple[Tuple[str, int], ...] = (),
+                   reserved: Tuple[int, ...] = (),
+                   value_numbers: Tuple[Tuple[str, int], ...] = (),
+                   reserved_values: Tuple[int, ...] = (),
+                   flat_types: Tuple[Tuple[str, str], ...] = ()) -> List[descriptor_pb2.DescriptorProto]:
+    """Return the descriptors of the proto code _render_enum() returns for
+    the same arguments.
+    """
+
+    return list(enum_descriptor.EnumDescriptor(
+        name, field_types, enum_values, dict(numbers), list(reserved),
+        dict(value_numbers), list(reserved_values),
+        dict(flat_types)).to_descriptor(package_name))
+
+
+def _describe_property(package_name: str, name: str, field_types: List[str],
+                       class_list: List[str], comment: str,
+                       numbers: Tuple[Tuple[str, int], ...] = (),
+                       reserved: Tuple[int, ...] = ()) -> List[descriptor_pb2.DescriptorProto]:
+    """Return the descriptor of the proto code _render_property() returns
+    for the same arguments.
+    """
+
+    return [property_descriptor.PropertyDescriptor(
+        name, field_types, class_list, dict(numbers),
+        list(reserved)).to_descriptor(package_name)]
+
+
+# The function that describes the proto code of every render function.
+_DESCRIBE = {
+    _render_class: _describe_class,
+    _render_enum: _describe_enum,
+    _render_property: _describe_property
+}
+
+
+def _render_tasks(tasks: List[Tuple[Callable[..., str], tuple]]) -> List[str]:
+    """Render a list of tasks. This is the unit of work sent to worker
+    processes.
+
+    Args:
+        tasks (list[tuple]): List of (render function, arguments) pairs.
+
+    Returns:
+        list[str]: The proto code of every task in the same order.
+    """
+
+    return [fn(*args) for fn, args in tasks]
+
+
+def _get_task_key(fn: Callable[..., str], args: tuple) -> tuple:
+    """Return a key that is equal for tasks which render the same proto code.
+    The render functions do not depend on the order of their list
+    arguments, so lists are compared as sorted tuples.
+
+    Args:
+        fn (function): The render function.
+        args (tuple): The arguments of the render function.
+
+    Returns:
+        tuple: The key of the task.
+    """
+
+    key = [fn.__name__]
+    for x in args:
+        if isinstance(x, list):
+            x = tuple(sorted((y.name, y.parent) if isinstance(
+                y, PropertyToParent) else y for y in x))
+        key.append(x)
+
+    return tuple(key)
+
+
+def _get_flat_fields(field_types: Iterable[PropertyToParent],
+                     flat_types: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    """Return the proto types of the flattened properties of a message.
+
+    Args:
+        field_types (iterable[PropertyToParent]): The schema properties that
+                                                  belong to the message.
+        flat_types (dict[str, str]): Proto types of the flattened properties.
+
+    Returns:
+        tuple[tuple(str, str)]: Sorted (property, proto type) pairs, empty if
+                                no property of the message is flattened.
+    """
+
+    if not flat_types:
+        return ()
+
+    return tuple(sorted((x.name, flat_types[x.name])
+                        for x in field_types if x.name in flat_types))
+
 
 class SchemaGenerator():
     """The SchemaGenerator is a class that generates protocol buffer code given
     a schema.
 
     Args:
-        src_file_path (str): Path to the file containing schema.
+        src_file_path (str|BinaryIO): Path to the file containing schema, or
+                                      a binary stream of a schema in
+                                      N-Triples format which is parsed while
+                                      it is read.
+        cache (SchemaCache): Cache of parsed schemas, the schema is always
+                             parsed if it is None or the schema is a stream.
 
     Attributes:
-        graph (rdflib.Graph): Graph which is result of parsing the schema.
+        index (SchemaIndex): Index of the triples which are result of parsing
+                             the schema, None if the generator was created
+                             from a model.
     """
 
-    def __init__(self, src_file_path: str):
+    def __init__(self, src_file_path: Union[str, BinaryIO],
+                 cache: schema_cache.SchemaCache = None):
 
-        assert isinstance(
-            src_file_path, str), "Invalid parameter 'src_file_path' must be 'str'."
+        assert cache is None or isinstance(
+            cache, schema_cache.SchemaCache), "Invalid parameter 'cache' must be 'SchemaCache'."
 
-        self.graph = rdflib.Graph()
-        self.graph.parse(
-            src_file_path,
-            format=rdflib.util.guess_format(src_file_path))
+        self.index = None
+        self.__model = None
 
-    def write_proto(self, dst_path: str, package_name: str):
-        """Write the protobuf code for the graph to file.
+        if not isinstance(src_file_path, str):
+            assert hasattr(
+                src_file_path, 'read'), "Invalid parameter 'src_file_path' must be 'str' or a binary stream."
 
-        Args:
-            dst_path (str): Path to the output directory where code has to be
-                            written.
-            package_name (str): Package name for the proto code.
-        """
+            with instrumentation.phase('parse'):
+                self.index = schema_index.SchemaIndex(
+                    instrumentation.count_items(
+                        ntriples_reader.iter_triples(src_file_path), 'triples'))
+            return
 
-        assert isinstance(
-            dst_path, str), "Invalid parameter 'dst_path' must be 'str'."
-        outFile = open(dst_path + 'schema.proto', 'w')
-
-        class_to_prop, prop_to_class, enumerations = self.__get_values()
-
-        proto_string = ''
-        proto_string += self.__get_header(package_name)
-        proto_string += self.__get_options()
-        proto_string += self.__get_datatypes()
-        proto_string += self.__class_to_proto(class_to_prop, enumerations)
-        proto_string += self.__enum_to_proto(class_to_prop, enumerations)
-        proto_string += self.__prop_to_proto(prop_to_class,
-                                             set(class_to_prop.keys()))
-
-        outFile.write(proto_string)
-        outFile.close()
-
-        outFile = open(dst_path + 'schema_descriptor.json', 'w')
-        json_descriptor = self.__get_json_descriptor(
-            class_to_prop, prop_to_class, enumerations)
-        json.dump(json_descriptor, outFile, indent=4)
-        outFile.close()
-
-    def __class_to_proto(self,
-                         class_to_prop: Dict[str, Set[PropertyToParent]],
-                         enumerations: Set[str]):
-        """Call ClassDescriptor.to_proto() and get proto code for every schema
-        class.
+        if cache:
+            with instrumentation.phase('load_cache'):
+                key = cache.get_key(src_file_path)
+                self.index = cache.load(key)
 
-        Args:
-            class_to_prop (dict(set): Dictionary containing set of properties
-                                      for every class.
-            enumerations (set): Set containing the enumerations in the schema.
+        if self.index is None:
+            src_format = rdflib.util.guess_format(src_file_path)
 
-        Returns:
-            str: The proto code for all the schema classes in class_to_prop as
-                 a string.
-        """
-        proto_class = '// Definition of classes begin here.\n\n'
+            with instrumentation.phase('parse'):
+                if src_format == 'nt':
+                    # N-Triples is read line by line without building a
+                    # graph.
+                    triples = ntriples_reader.read_triples(src_file_path)
+                else:
+                    triples = rdflib.Graph()
+                    triples.parse(src_file_path, format=src_format)
 
-        for x in sorted(class_to_prop.keys()):
-            if ((x not in enumerations) and (x not in constants.schema_datatypes) and (
-                    x not in constants.schema_primitives)):
+                self.index = schema_index.SchemaIndex(
+                    instrumentation.count_items(triples, 'triples'))
 
-                comment = ''
+            if cache:
+                with instrumentation.phase('store_cache'):
+                    cache.store(key, self.index)
 
-                for _, _, c in self.graph.triples(
-                        (utils.add_url(x), constants.schema_constants['Comment'], None)):
-                    comment += c
+    @classmethod
+    def from_index(cls, index: schema_index.SchemaIndex) -> 'SchemaGenerator':
+        """Return a SchemaGenerator for a schema that is already parsed.
 
-                soup = BeautifulSoup(comment, 'html.parser')
-                comment = soup.get_text()
+        Args:
+            index (SchemaIndex): Index of the triples of the schema.
 
-                proto_class += class_descriptor.ClassDescriptor(
-                    x, list(class_to_prop[x])).to_proto(comment)
-                proto_class += '\n'
+        Returns:
+            SchemaGenerator: The generator for the schema.
+        """
+
+        assert isinstance(
+            index, schema_index.SchemaIndex), "Invalid parameter 'index' must be 'SchemaIndex'."
 
-        return proto_class
+        gen = cls.__new__(cls)
+        gen.index = index
+        gen.__model = None
+        return gen
 
-    def __prop_to_proto(self,
-                        prop_to_class: Dict[str, Set[str]],
-                        class_list: Set[str]):
-        """Call PropertyDescriptor.to_proto() and get proto code for every
-        schema property.
+    @classmethod
+    def from_model(cls, model: schema_model.SchemaModel) -> 'SchemaGenerator':
+        """Return a SchemaGenerator for a schema whose model is already
+        built.
 
         Args:
-            prop_to_class (dict(set)): Dictionary containing range of
-                                       class/datatypes for every property.
-            class_list (set): Set of defined classes.
+            model (SchemaModel): The model of the schema.
 
         Returns:
-            str: The proto code for all the schema property in prop_to_class as
-                 a string.
+            SchemaGenerator: The generator for the schema.
         """
-        proto_property = '// Definition of properties begin here.\n\n'
 
-        for x in sorted(prop_to_class.keys()):
-            if len(prop_to_class[x]) > 0:
-                comment = ''
-                for _, _, c in self.graph.triples(
-                        (utils.add_url(x), constants.schema_constants['Comment'], None)):
-                    comment += c
+        assert isinstance(
+            model, schema_model.SchemaModel), "Invalid parameter 'model' must be 'SchemaModel'."
 
-                soup = BeautifulSoup(comment, 'html.parser')
-                comment = soup.get_text()
+        gen = cls.__new__(cls)
+        gen.index = None
+        gen.__model = model
+        return gen
 
-                proto_property += property_descriptor.PropertyDescriptor(
-                    x, list(prop_to_class[x]), list(class_list)).to_proto(comment)
-                proto_property += '\n'
+    def get_model(self) -> schema_model.SchemaModel:
+        """Return the model of the schema, which is built on the first call
+        and shared by every later call and every file that is written.
 
-        return proto_property
+        Returns:
+            SchemaModel: The model of the schema.
+        """
 
-    def __enum_to_proto(self,
-                        class_to_prop: Dict[str, Set[PropertyToParent]],
-                        enumerations: Set[str]):
-        """Call EnumDescriptor.to_proto() and get proto code for every schema
-        enumeration.
+        if self.__model is None:
+            self.__model = schema_model.SchemaModel.from_index(self.index)
+
+        return self.__model
+
+    def write_proto(self, dst_path: str, package_name: str, jobs: int = 1,
+                    roots: Optional[List[str]] = None,
+                    max_depth: Optional[int] = None,
+                    properties: Optional[List[str]] = None,
+                    descriptor_formats: Iterable[str] = DESCRIPTOR_FORMATS,
+                    descriptor_version: int = 1,
+                    executor: Optional[concurrent.futures.Executor] = None,
+                    render_cache: Optional[Dict[tuple, str]] = None,
+                    incremental_update: bool = False,
+                    usage_profile: Optional[Mapping[str, Mapping[str, int]]] = None,
+                    field_lock: Optional[str] = None,
+                    flatten: bool = False,
+                    compiled_formats: Iterable[str] = ()) -> Optional[Dict]:
+        """Write the protobuf code for the graph to file.
 
         Args:
-            class_to_prop (dict(set): Dictionary containing set of properties
-                                      for every class.
-            enumerations (set): Set containing the enumerations in the schema.
+            dst_path (str): Path to the output directory where code has to be
+                            written.
+            package_name (str): Package name for the proto code.
+            jobs (int): Number of processes used to render the proto code.
+            roots (list[str]): Names of classes, if given only the classes,
+                               enumerations and properties reachable from
+                               them are written.
+            max_depth (int): Maximum number of properties between a root and
+                             a written class, unlimited if None.
+            properties (list[str]): Names of the properties that are written
+                                    when roots are given, every property is
+                                    written if None.
+            descriptor_formats (iterable[str]): Formats of the schema
+                                                descriptor, 'json' writes
+                                                schema_descriptor.json and
+                                                'binary' writes
+                                                schema_descriptor.bin.
+            descriptor_version (int): Version of schema_descriptor.json, in
+                                      version 2 the fields inherited by a
+                                      class are replaced by references to
+                                      the classes that declare them.
+            executor (Executor): Process pool of jobs processes used to
+                                 render the proto code instead of creating
+                                 one, it is not shut down.
+            render_cache (dict): Proto code of rendered blocks, blocks that
+                                 are in the cache are not rendered again and
+                                 rendered blocks are added to it.
+            incremental_update (bool): If True, the blocks of the
+                                       schema.proto written by the previous
+                                       incremental run in dst_path are
+                                       reused, only the classes,
+                                       enumerations and properties that
+                                       changed are rendered, and the changes
+                                       are written to schema_changes.json.
+            usage_profile (dict[str, dict[str, int]]): Number of times
+                                                       every property of a
+                                                       type is used, the
+                                                       most used properties
+                                                       of every new message
+                                                       get the field numbers
+                                                       up to 15.
+            field_lock (str): Path to the lock file of the field numbers of
+                              every message, field_numbers.lock in dst_path
+                              if None and usage_profile is given. Fields in
+                              the lock keep their number, new fields get
+                              unused numbers and the numbers of removed
+                              fields are reserved.
+            flatten (bool): If True, properties whose range maps to a single
+                            proto type are written as repeated fields of
+                            that type, the wrapper message of a property is
+                            only written if its range is polymorphic.
+            compiled_formats (iterable[str]): Formats of the descriptors
+                                              protoc builds from
+                                              schema.proto, which are
+                                              written without running
+                                              protoc. 'descriptor_set'
+                                              writes the FileDescriptorSet
+                                              of --descriptor_set_out to
+                                              schema.pb and 'python' writes
+                                              a schema_pb2.py that can be
+                                              used instead of the one of
+                                              --python_out. 'python_package'
+                                              writes the same messages to
+                                              the package schema, which
+                                              loads a message when it is
+                                              first used.
+                                              'jsonld_serializer' writes
+                                              schema_jsonld.py with a
+                                              JSON-LD serializer for every
+                                              message.
 
         Returns:
-            str: The proto code for all the schema enumerations in enumerations
-                 as a string.
+            dict: The change report if incremental_update is True, otherwise
+                  None.
         """
 
-        proto_enum = '// Definition of enumerations begin here.\n\n'
+        descriptor_formats = set(descriptor_formats)
+        compiled_formats = set(compiled_formats)
 
-        for x in sorted(enumerations):
-            enum_values = set()
+        assert isinstance(
+            dst_path, str), "Invalid parameter 'dst_path' must be 'str'."
+        assert isinstance(
+            jobs, int) and jobs > 0, "Invalid parameter 'jobs' must be a positive 'int'."
+        assert descriptor_formats <= set(
+            DESCRIPTOR_FORMATS), "Invalid parameter 'descriptor_formats' must contain 'json' or 'binary'."
+        assert descriptor_version in DESCRIPTOR_VERSIONS, "Invalid parameter 'descriptor_version' must be 1 or 2."
+        assert compiled_formats <= set(
+            COMPILED_FORMATS), "Invalid parameter 'compiled_formats' must contain 'descriptor_set', 'python', 'python_package' or 'jsonld_serializer'."
+
+        with instrumentation.phase('model'):
+            model = self.get_model()
+
+        # The fields of a subset are numbered and flattened as in the whole
+        # schema, so that its messages stay wire compatible.
+        full_model = None
+        if roots is not None:
+            with instrumentation.phase('subset'):
+                full_model = model
+                model = model.prune(roots, max_depth, properties)
+
+        instrumentation.count('classes', len(model.get_classes()))
+        instrumentation.count('enumerations', len(model.enumerations))
+        instrumentation.count('properties', len(model.prop_to_class))
+
+        class_list = set(model.class_to_prop.keys())
+        flat_types = dict()
+        if flatten:
+            with instrumentation.phase('flatten'):
+                flat_types = self.__get_flat_types(
+                    full_model or model, model.prop_to_class)
+
+        proto_types = {x: utils.get_class_type(t, class_list)
+                       for x, t in flat_types.items()}
+
+        lock = None
+        if usage_profile is not None or field_lock is not None:
+            lock = field_numbers.FieldNumberLock(
+                field_lock or dst_path + field_numbers.LOCK_FILE)
+
+        with instrumentation.phase('field_numbers'):
+            numbers = self.__get_field_numbers(
+                model, lock, usage_profile or dict(), flat_types, full_model)
+
+        own_executor = None
+        if executor is None and jobs > 1:
+            own_executor = executor = concurrent.futures.ProcessPoolExecutor(
+                jobs)
+
+        previous = dict()
+        if incremental_update:
+            # The blocks of the previous run are read before schema.proto is
+            # overwritten.
+            with instrumentation.phase('load_manifest'):
+                previous = incremental.load_blocks(dst_path)
+            if render_cache is None:
+                render_cache = dict()
+
+        def write_tasks(tasks: List[Tuple[Callable[..., str], tuple]]):
+            if not incremental_update:
+                outFile.writelines(self.__render(
+                    tasks, executor, jobs, render_cache))
+                return
+
+            keys = [_get_task_key(fn, args) for fn, args in tasks]
+            if previous:
+                for key in keys:
+                    block = previous.get(incremental.get_block_id(key))
+                    if block is not None:
+                        render_cache.setdefault(key, block)
+
+            outFile.write_blocks(keys, self.__render(
+                tasks, executor, jobs, render_cache, keys))
+
+        # Every block is written as soon as it is rendered, so the proto code
+        # is never held in memory as a whole.
+        try:
+            with open(dst_path + 'schema.proto', 'w',
+                      buffering=_WRITE_BUFFER_SIZE) as protoFile:
+                outFile = protoFile
+                if incremental_update:
+                    outFile = incremental.PositionWriter(protoFile)
+
+                with instrumentation.phase('render_header'):
+                    outFile.write(self.__get_header(package_name))
+                    outFile.write(self.__get_options())
+                    outFile.write(self.__get_datatypes())
+                with instrumentation.phase('render_classes'):
+                    class_tasks = self.__get_class_tasks(
+                        model, numbers, proto_types)
+                    outFile.write('// Definition of classes begin here.\n\n')
+                    write_tasks(class_tasks)
+                with instrumentation.phase('render_enumerations'):
+                    enum_tasks = self.__get_enum_tasks(
+                        model, numbers, proto_types)
+                    outFile.write(
+                        '// Definition of enumerations begin here.\n\n')
+                    write_tasks(enum_tasks)
+                with instrumentation.phase('render_properties'):
+                    prop_tasks = self.__get_prop_tasks(
+                        model, class_list, numbers, flat_types)
+                    outFile.write(
+                        '// Definition of properties begin here.\n\n')
+                    write_tasks(prop_tasks)
+        finally:
+            if own_executor:
+                own_executor.shutdown()
+
+        if lock and lock.modified:
+            with instrumentation.phase('save_lock'):
+                lock.save()
+
+        report = None
+        if incremental_update:
+            blocks = {incremental.get_block_id(key): position
+                      for key, position in outFile.positions.items()}
+
+            with instrumentation.phase('save_manifest'):
+                incremental.save_manifest(
+                    dst_path, blocks, outFile.hexdigest())
+                report = incremental.get_change_report(previous, blocks)
+                incremental.save_report(dst_path, report)
+
+        if 'json' in descriptor_formats:
+            with instrumentation.phase('json_descriptor'), open(
+                    dst_path + 'schema_descriptor.json', 'w',
+                    buffering=_WRITE_BUFFER_SIZE) as outFile:
+                self.__write_json_descriptor(
+                    outFile, model, descriptor_version, flat_types)
+
+        if 'binary' in descriptor_formats:
+            with instrumentation.phase('binary_descriptor'), open(
+                    dst_path + 'schema_descriptor.bin', 'wb',
+                    buffering=_WRITE_BUFFER_SIZE) as outFile:
+                binary_descriptor.write(outFile, self.__get_message_descriptors(
+                    model, flat_types=flat_types), list(model.primitives))
+
+        if compiled_formats:
+            with instrumentation.phase('file_descriptor'):
+                file_proto = file_descriptor.build(package_name, (
+                    message for fn, args in class_tasks + enum_tasks + prop_tasks
+                    for message in _DESCRIBE[fn](package_name, *args)))
+
+        if 'descriptor_set' in compiled_formats:
+            with instrumentation.phase('descriptor_set'), open(
+                    dst_path + 'schema.pb', 'wb') as outFile:
+                file_descriptor.write_descriptor_set(outFile, file_proto)
+
+        if 'python' in compiled_formats:
+            with instrumentation.phase('python_module'), open(
+                    dst_path + 'schema_pb2.py', 'w') as outFile:
+                file_descriptor.write_python_module(outFile, file_proto)
+
+        if 'python_package' in compiled_formats:
+            with instrumentation.phase('python_package'):
+                file_descriptor.write_python_package(
+                    dst_path + 'schema', file_proto)
+
+        if 'jsonld_serializer' in compiled_formats:
+            with instrumentation.phase('jsonld_serializer'), open(
+                    dst_path + 'schema_jsonld.py', 'w') as outFile:
+                jsonld_module.write(outFile, file_proto)
+
+        return report
+
+    def __render(self,
+                 tasks: List[Tuple[Callable[..., str], tuple]],
+                 executor: Optional[concurrent.futures.Executor],
+                 jobs: int,
+                 render_cache: Optional[Dict[tuple, str]] = None,
+                 keys: Optional[List[tuple]] = None) -> Iterator[str]:
+        """Render a list of tasks either serially or in a process pool.
 
-            for ev, _, _ in self.graph.triples(
-                    (None, constants.schema_constants['Type'], utils.add_url(x))):
-                enum_values.add(utils.strip_url(ev))
+        Args:
+            tasks (list[tuple]): List of (render function, arguments) pairs.
+            executor (Executor): Process pool used to render the tasks, the
+                                 tasks are rendered serially if None.
+            jobs (int): Number of processes in the pool.
+            render_cache (dict): Proto code of rendered tasks, only the tasks
+                                 that are not in it are rendered.
+            keys (list[tuple]): The key of every task in render_cache, the
+                                keys are computed if None.
+
+        Yields:
+            str: The proto code of every task, in the order of tasks.
+        """
 
-            comment = ''
-            for _, _, c in self.graph.triples(
-                    (utils.add_url(x), constants.schema_constants['Comment'], None)):
-                comment += c
+        if render_cache is not None:
+            if keys is None:
+                keys = [_get_task_key(fn, args) for fn, args in tasks]
 
-            soup = BeautifulSoup(comment, 'html.parser')
-            comment = soup.get_text()
+            missing = dict()
+            for key, task in zip(keys, tasks):
+                if key not in render_cache and key not in missing:
+                    missing[key] = task
 
-            proto_enum += enum_descriptor.EnumDescriptor(x, list(
-                class_to_prop[x]), list(enum_values)).to_proto(comment)
-            proto_enum += '\n'
+            for key, block in zip(missing, self.__render(
+                    list(missing.values()), executor, jobs)):
+                render_cache[key] = block
 
-        return proto_enum
+            for key in keys:
+                yield render_cache[key]
+            return
 
-    def __get_values(
-            self) -> Tuple[Dict[str, Set[PropertyToParent]], Dict[str, Set[str]], Set[str]]:
-        """Call utils.toplogical_sort(), compress the inheritance heirarchy and
-        return mappings between schema classes, schema properties and schema
-        enumerations.
+        if executor is None:
+            for fn, args in tasks:
+                yield fn(*args)
+            return
 
-        Returns:
-            dict[str, set[PropertyToParent]]: Dictionary containing set of
-                                              properties for every class.
-            dict[str, set[str]]: Dictionary containing range of
-                                 class/datatypes for every property.
-            set[str]: Set containing the enumerations in the schema.
-        """
+        chunk_size = max(1, math.ceil(len(tasks) / (jobs * _CHUNKS_PER_JOB)))
+        chunks = [tasks[i:i + chunk_size]
+                  for i in range(0, len(tasks), chunk_size)]
 
-        class_to_prop = dict()
-        inheritance_graph = dict()
+        # Executor.map returns results in the order of chunks, which keeps
+        # the output identical to serial rendering.
+        for blocks in executor.map(_render_tasks, chunks):
+            yield from blocks
 
-        for class_name, _, _ in self.graph.triples(
-                (None, constants.schema_constants['Type'], constants.schema_constants['Class'])):
-            class_to_prop[utils.strip_url(class_name)] = set()
+    def __get_class_tasks(self,
+                          model: schema_model.SchemaModel,
+                          numbers: Optional[Dict[str, tuple]] = None,
+                          flat_types: Optional[Dict[str, str]] = None) -> List[Tuple[Callable[..., str], tuple]]:
+        """Return the tasks that render the proto code of every schema class
+        with ClassDescriptor.to_proto().
 
-            for property_name, _, _ in self.graph.triples(
-                    (None, constants.schema_constants['domainIncludes'], class_name)):
-                prop = utils.PropertyToParent(
-                    utils.strip_url(property_name),
-                    utils.strip_url(class_name))
-                class_to_prop[utils.strip_url(class_name)].add(prop)
+        Args:
+            model (SchemaModel): The model of the schema.
+            numbers (dict[str, tuple]): Field numbers and reserved numbers of
+                                        messages.
+            flat_types (dict[str, str]): Proto types of the flattened
+                                         properties.
 
-        for class_name, _, _ in self.graph.triples(
-                (None, constants.schema_constants['Type'], constants.schema_constants['Class'])):
+        Returns:
+            list[tuple]: The (render function, arguments) pair of every
+                         class.
+        """
 
-            if class_name not in inheritance_graph:
-                inheritance_graph[class_name] = set()
+        tasks = list()
+        for x in model.get_classes():
+            field_types = model.get_properties(x)
+            args = (x, list(field_types), model.get_comment(x))
+            flat = _get_flat_fields(field_types, flat_types)
+            if numbers or flat:
+                args += (numbers or dict()).get(x, ((), ()))
+            if flat:
+                args += (flat,)
 
-            for _, _, parent_class in self.graph.triples(
-                    (class_name, constants.schema_constants['subClassOf'], None)):
+            tasks.append((_render_class, args))
 
-                if parent_class not in inheritance_graph:
-                    inheritance_graph[parent_class] = set()
+        return tasks
 
-                inheritance_graph[parent_class].add(class_name)
+    def __get_prop_tasks(self,
+                         model: schema_model.SchemaModel,
+                         class_list: Set[str],
+                         numbers: Optional[Dict[str, tuple]] = None,
+                         flat_types: Optional[Dict[str, str]] = None) -> List[Tuple[Callable[..., str], tuple]]:
+        """Return the tasks that render the proto code of every schema
+        property that is not flattened with PropertyDescriptor.to_proto().
 
-        topsort_order = utils.topological_sort(inheritance_graph)
+        Args:
+            model (SchemaModel): The model of the schema.
+            class_list (set): Set of defined classes.
+            numbers (dict[str, tuple]): Field numbers and reserved numbers of
+                                        messages.
+            flat_types (dict[str, str]): The flattened properties, which have
+                                         no wrapper message.
 
-        for class_name in topsort_order:
-            for _, _, parent_class in self.graph.triples(
-                    (class_name, constants.schema_constants['subClassOf'], None)):
-                if utils.strip_url(parent_class) in class_to_prop:
-                    class_to_prop[utils.strip_url(class_name)] = class_to_prop[utils.strip_url(
-                        class_name)] | class_to_prop[utils.strip_url(parent_class)]
+        Returns:
+            list[tuple]: The (render function, arguments) pair of every
+                         property.
+        """
 
-        enumerations = set()
+        tasks = list()
+        for x in sorted(model.prop_to_class.keys()):
+            field_types = model.get_range(x)
+            if len(field_types) > 0 and x not in (flat_types or ()):
+                # Only the defined classes in range of the property affect
+                # its proto code.
+                args = (x, list(field_types), [
+                    c for c in field_types if c in class_list],
+                    model.get_comment(x))
+                if numbers:
+                    args += numbers[utils.get_property_name(x)]
+
+                tasks.append((_render_property, args))
+
+        return tasks
+
+    def __get_enum_tasks(self,
+                         model: schema_model.SchemaModel,
+                         numbers: Optional[Dict[str, tuple]] = None,
+                         flat_types: Optional[Dict[str, str]] = None) -> List[Tuple[Callable[..., str], tuple]]:
+        """Return the tasks that render the proto code of every schema
+        enumeration with EnumDescriptor.to_proto().
 
-        for enum, _, _ in self.graph.triples(
-                (None, constants.schema_constants['subClassOf'], constants.schema_constants['Enumeration'])):
-            enumerations.add(utils.strip_url(enum))
+        Args:
+            model (SchemaModel): The model of the schema.
+            numbers (dict[str, tuple]): Field numbers and reserved numbers of
+                                        messages.
+            flat_types (dict[str, str]): Proto types of the flattened
+                                         properties.
 
-        class_to_children = utils.get_children(inheritance_graph)
+        Returns:
+            list[tuple]: The (render function, arguments) pair of every
+                         enumeration.
+        """
 
-        # Temporary Code
-        # class_to_children[rdflib.URIRef('http://schema.org/Audience')].add(rdflib.URIRef("http://schema.org/Researcher"))
-        # class_to_prop["SteeringPositionValue"] = class_to_prop["Enumeration"]
-        # class_to_prop["DriveWheelConfigurationValue"] = class_to_prop["Enumeration"]
-        # enumerations.add("SteeringPositionValue")
-        # enumerations.add("DriveWheelConfigurationValue")
-        # End of temporary code
+        tasks = list()
+        for x in sorted(model.enumerations):
+            field_types = model.get_properties(x)
+            args = (x, list(field_types), model.get_enum_values(x),
+                    model.get_comment(x))
+            flat = _get_flat_fields(field_types, flat_types)
+            if numbers or flat:
+                messages = numbers or dict()
+                args += messages.get(x + 'Class', ((), ())) + \
+                    messages.get(x + 'Class.Id', ((), ()))
+            if flat:
+                args += (flat,)
+
+            tasks.append((_render_enum, args))
+
+        return tasks
+
+    def __get_field_numbers(self,
+                            model: schema_model.SchemaModel,
+                            lock: Optional[field_numbers.FieldNumberLock],
+                            usage_profile: Mapping[str, Mapping[str, int]],
+                            flat_types: Optional[Dict[str, str]] = None,
+                            full_model: Optional[schema_model.SchemaModel] = None) -> Dict[str, tuple]:
+        """Return the field numbers of every message and update the lock.
+        The values of the enum of an enumeration are locked as the message
+        <name>Class.Id. The fields of a part of the schema are numbered as
+        in the whole schema and the numbers of the pruned fields are
+        reserved.
 
-        prop_to_class = dict()
+        Args:
+            model (SchemaModel): The model of the schema.
+            lock (FieldNumberLock): Field numbers of earlier runs, messages
+                                    are numbered in order if None.
+            usage_profile (dict[str, dict[str, int]]): Number of times every
+                                                       property of a type is
+                                                       used.
+            flat_types (dict[str, str]): The flattened properties, which have
+                                         no wrapper message.
+            full_model (SchemaModel): The model of the whole schema if model
+                                      is a part of it.
 
-        for property_name, _, _ in self.graph.triples(
-                (None, constants.schema_constants['Type'], constants.schema_constants['Property'])):
-            prop_to_class[utils.strip_url(property_name)] = set()
+        Returns:
+            dict[str, tuple]: Mapping from message name to a sorted tuple of
+                              (field, field number) pairs and a sorted tuple
+                              of reserved field numbers.
+        """
 
-            for _, _, class_name in self.graph.triples(
-                    (property_name, constants.schema_constants['rangeIncludes'], None)):
-                prop_to_class[utils.strip_url(property_name)].add(
-                    utils.strip_url(class_name))
-                if class_name in class_to_children:
-                    prop_to_class[utils.strip_url(property_name)] = prop_to_class[utils.strip_url(
-                        property_name)] | set(map(utils.strip_url, class_to_children[class_name]))
+        if lock is None and full_model is None:
+            return dict()
+
+        source = full_model or model
+        numbers = dict()
+
+        def assign(message: str, fields: List[str], kept: Set[str],
+                   start: int, usage: Optional[Mapping[str, int]] = None):
+            if lock is None:
+                x = utils.get_field_numbers(fields, None, start)
+                reserved = list()
+            else:
+                x, reserved = lock.assign(message, fields, start, usage)
+
+            reserved = sorted(reserved + [
+                n for field, n in x.items() if field not in kept])
+            numbers[message] = (tuple(sorted(
+                (field, n) for field, n in x.items() if field in kept)),
+                tuple(reserved))
+
+        for x in sorted(model.class_to_prop):
+            if x in constants.schema_datatypes or x in constants.schema_primitives:
+                continue
+
+            prop_from_self, prop_inherited = utils.group_properties(
+                x, source.get_properties(x))
+            fields = prop_from_self + [
+                p for props in prop_inherited.values() for p in props]
+            kept = set(p.name for p in model.get_properties(x))
+
+            # The field number 1 is used by @id.
+            if model.is_enumeration(x):
+                assign(x + 'Class', fields, kept, 2, usage_profile.get(x))
+                values = model.get_enum_values(x)
+                assign(x + 'Class.Id', values, set(values), 1)
+            else:
+                assign(x, fields, kept, 2, usage_profile.get(x))
+
+        for x in sorted(model.prop_to_class):
+            field_types = model.get_range(x)
+            if len(field_types) > 0 and x not in (flat_types or ()):
+                assign(utils.get_property_name(x), sorted(
+                    source.get_range(x)), field_types, 1)
+
+        return numbers
+
+    def __get_flat_types(self, model: schema_model.SchemaModel,
+                         prop_list: Iterable[str]) -> Dict[str, str]:
+        """Return the properties that are written without a wrapper message.
 
-                if class_name == constants.schema_constants['Number']:
-                    prop_to_class[utils.strip_url(property_name)].add(
-                        utils.strip_url(constants.schema_constants['Integer']))
-                    prop_to_class[utils.strip_url(property_name)].add(
-                        utils.strip_url(constants.schema_constants['Float']))
+        Args:
+            model (SchemaModel): The model of the schema.
+            prop_list (iterable[str]): The properties that are written.
 
-                if class_name == constants.schema_constants['Text']:
-                    prop_to_class[utils.strip_url(property_name)].add(
-                        utils.strip_url(constants.schema_constants['URL']))
+        Returns:
+            dict[str, str]: Mapping from every property whose range maps to
+                            a single proto type to the schema class/datatype
+                            it is written as.
+        """
 
-        return class_to_prop, prop_to_class, enumerations
+        class_list = set(model.class_to_prop)
+        flat_types = dict()
+        for x in prop_list:
+            flat_type = utils.get_flat_type(model.get_range(x), class_list)
+            if flat_type is not None:
+                flat_types[x] = flat_type
+
+        return flat_types
 
     def __get_header(self, package_name: str) -> str:
         """Return the header for proto code file.
@@ -290,10 +894,7 @@ class SchemaGenerator():
             str: The proto code of header as a string.
         """
 
-        file_loader = FileSystemLoader('./core/templates')
-        env = Environment(loader=file_loader)
-
-        proto_header = env.get_template(
+        proto_header = template_registry.get_template(
             'header.txt').render(package_name=package_name)
         return proto_header
 
@@ -303,10 +904,7 @@ class SchemaGenerator():
         Returns:
             str: The proto code of options for JSONLD serializer as a string.
         """
-        file_loader = FileSystemLoader('./core/templates')
-        env = Environment(loader=file_loader)
-
-        proto_options = env.get_template('options.txt').render()
+        proto_options = template_registry.get_template('options.txt').render()
         return proto_options
 
     def __get_datatypes(self) -> str:
@@ -317,105 +915,140 @@ class SchemaGenerator():
                  string.
         """
 
-        file_loader = FileSystemLoader('./core/templates')
-        env = Environment(loader=file_loader)
-
-        proto_datatypes = env.get_template('datatypes.txt').render()
+        proto_datatypes = template_registry.get_template(
+            'datatypes.txt').render()
         return proto_datatypes
 
-    def __get_json_descriptor(self,
-                              class_to_prop: Dict[str, Set[PropertyToParent]],
-                              prop_to_class: Dict[str, Set[str]],
-                              enumerations: Set[str]) -> Dict:
-        """Return a json descriptor for the given schema.
+    def __write_json_descriptor(self,
+                                outFile: TextIO,
+                                model: schema_model.SchemaModel,
+                                version: int = 1,
+                                flat_types: Optional[Dict[str, str]] = None):
+        """Write the json descriptor for the given schema one message at a
+        time. The output is identical to json.dump() with an indent of 4.
 
         Args:
-            dict[str, set[PropertyToParent]]: Dictionary containing set of
-                                              properties for every class.
-            dict[str, set[str]]: Dictionary containing range of class/datatypes
-                                 for every property.
-            set[str]: Set containing the enumerations in the schema.
-
-        Returns:
-            dict: The json descriptor for the schema.
+            outFile (TextIO): File to which the descriptor is written.
+            model (SchemaModel): The model of the schema.
+            version (int): Version of the descriptor.
+            flat_types (dict[str, str]): The schema class/datatype every
+                                         flattened property is written as.
         """
 
-        defined_classes = set(class_to_prop.keys())
-        total_classes = set()
+        outFile.write('{\n')
+        if version > 1:
+            outFile.write('    "version": ' + str(version) + ',\n')
+        outFile.write('    "messages": {')
 
-        for _, _, property_name in self.graph.triples(
-                (None, utils.constants.schema_constants['rangeIncludes'], None)):
-            total_classes.add(utils.strip_url(property_name))
+        first = True
+        for name, message in self.__get_message_descriptors(
+                model, version > 1, flat_types):
+            if not first:
+                outFile.write(',')
 
-        undefined_classes = total_classes.difference(defined_classes)
-        undefined_classes = undefined_classes | set(
-            utils.constants.schema_primitives.keys())
+            outFile.write('\n        ' + json.dumps(name) + ': ')
+            outFile.write(json.dumps(message, indent=4).replace(
+                '\n', '\n        '))
+            first = False
 
-        message_descriptor = {}
+        if not first:
+            outFile.write('\n    ')
 
-        for x in sorted(class_to_prop.keys()):
-            if ((x not in enumerations) and (x not in constants.schema_datatypes) and (
-                    x not in constants.schema_primitives)):
-                o = {}
-                o['@type'] = utils.strip_url(x)
+        outFile.write('},\n    "primitives": ')
+        outFile.write(json.dumps(list(model.primitives), indent=4).replace(
+            '\n', '\n    '))
+        outFile.write('\n}')
 
-                prop_from_self = list()
-                prop_inherited = dict()
+    def __get_message_descriptors(self,
+                                  model: schema_model.SchemaModel,
+                                  deduplicate: bool = False,
+                                  flat_types: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield the json descriptor of every message in the given schema.
 
-                o['fields'] = list()
-                o['fields'].append('@id')
+        Args:
+            model (SchemaModel): The model of the schema.
+            deduplicate (bool): If True, a class lists only its own fields
+                                and the messages of the classes its inherited
+                                fields are declared in, when that expands to
+                                the same list of fields.
+            flat_types (dict[str, str]): The schema class/datatype every
+                                         flattened property is written as,
+                                         the descriptor of such a property
+                                         has it as 'flattened'.
+
+        Yields:
+            tuple(str, dict): The name of the message and its descriptor.
+        """
 
-                for p in class_to_prop[x]:
-                    if p.parent == x:
-                        prop_from_self.append(p.name)
-                    else:
-                        if p.parent not in prop_inherited:
-                            prop_inherited[p.parent] = list()
+        fields = _ClassFields(model.class_to_prop, model.enumerations)
 
-                        prop_inherited[p.parent].append(p.name)
+        for x in model.get_classes():
+            yield x, fields.get_descriptor(x, deduplicate)
 
-                prop_from_self = sorted(prop_from_self)
-                prop_inherited = collections.OrderedDict(
-                    sorted(prop_inherited.items()))
+        for x in sorted(model.prop_to_class.keys()):
+            field_types = model.get_range(x)
+            if len(field_types) > 0:
+                o = {}
+                o['@type'] = 'Property'
+                o['fields'] = sorted(field_types)
+                if flat_types and x in flat_types:
+                    o['flattened'] = flat_types[x]
+                yield x, o
 
-                for p in prop_from_self:
-                    o['fields'].append(p)
+        for x in sorted(model.enumerations):
+            o = {}
+            o['@type'] = 'EnumWrapper'
+            o['values'] = ['Unknown'] + list(model.get_enum_members(x))
+            o['fields'] = ['id', x + 'Class']
 
-                for ky in prop_inherited:
-                    props = sorted(prop_inherited[ky])
-                    o['fields'].extend(props)
+            yield x, o
+            yield x + 'Class', fields.get_descriptor(x, deduplicate)
 
-                message_descriptor[x] = o
+        yield 'Date', {'@type': 'DatatypeDate'}
+        yield 'DateTime', {'@type': 'DatatypeDateTime'}
+        yield 'Time', {'@type': 'DatatypeTime'}
+        yield 'Duration', {'@type': 'DatatypeDuration'}
+        yield 'Distance', {'@type': 'DatatypeQuantitative'}
+        yield 'Energy', {'@type': 'DatatypeQuantitative'}
+        yield 'Mass', {'@type': 'DatatypeQuantitative'}
 
-        for x in sorted(prop_to_class.keys()):
-            if len(prop_to_class[x]) > 0:
-                o = {}
-                o['@type'] = 'Property'
-                o['fields'] = sorted(list(prop_to_class[x]))
-                message_descriptor[x] = o
 
-        for x in sorted(enumerations):
-            enum_values = set()
+class _ClassFields():
+    """The fields of the json descriptor of schema classes. The fields of a
+    class are '@id', its own properties and then the inherited properties
+    grouped by the class that declares them, every group in sorted order.
 
-            for ev, _, _ in self.graph.triples(
-                    (None, constants.schema_constants['Type'], utils.add_url(x))):
-                enum_values.add(ev)
+    Args:
+        class_to_prop (dict(set)): Dictionary containing set of properties
+                                   for every class.
+        enumerations (set): Set containing the enumerations in the schema.
+    """
 
-            o = {}
-            o['@type'] = 'EnumWrapper'
-            o['values'] = sorted(list(enum_values))
-            o['values'].insert(0, 'Unknown')
-            o['fields'] = ['id', x + 'Class']
+    def __init__(self, class_to_prop: Mapping[str, FrozenSet[PropertyToParent]],
+                 enumerations: Set[str]):
+        self.class_to_prop = class_to_prop
+        self.enumerations = enumerations
+        self.groups = dict()
+        self.deduplicated = dict()
+
+    def get_groups(self, x: str) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+        """Return the own and inherited properties of a class.
+
+        Args:
+            x (str): Name of the class.
 
-            o2 = {}
-            o2['@type'] = x
+        Returns:
+            list[str]: Sorted names of the properties declared by the class.
+            list[tuple(str, list[str])]: The inherited properties grouped by
+                                         the class that declares them, in
+                                         order of the declaring class.
+        """
+
+        if x not in self.groups:
             prop_from_self = list()
             prop_inherited = dict()
 
-            o2['fields'] = list()
-            o2['fields'].append('@id')
-
-            for p in class_to_prop[x]:
+            for p in self.class_to_prop[x]:
                 if p.parent == x:
                     prop_from_self.append(p.name)
                 else:
@@ -424,43 +1057,87 @@ class SchemaGenerator():
 
                     prop_inherited[p.parent].append(p.name)
 
-            prop_from_self = sorted(prop_from_self)
-            prop_inherited = collections.OrderedDict(
-                sorted(prop_inherited.items()))
+            self.groups[x] = (sorted(prop_from_self), [
+                (ky, sorted(props)) for ky, props in sorted(prop_inherited.items())])
 
-            for p in prop_from_self:
-                o2['fields'].append(p)
+        return self.groups[x]
 
-            for ky in prop_inherited:
-                props = sorted(prop_inherited[ky])
-                o2['fields'].extend(props)
+    def get_message_name(self, x: str) -> str:
+        """Return the name of the message that holds the fields of a class.
 
-            message_descriptor[x] = o
-            message_descriptor[x + 'Class'] = o2
+        Args:
+            x (str): Name of the class.
+
+        Returns:
+            str: Name of the message, None if the class has no such message.
+        """
+
+        if (x not in self.class_to_prop or x in constants.schema_datatypes or
+                x in constants.schema_primitives):
+            return None
 
-        message_descriptor['Date'] = {}
-        message_descriptor['Date']['@type'] = 'DatatypeDate'
+        return x + 'Class' if x in self.enumerations else x
 
-        message_descriptor['DateTime'] = {}
-        message_descriptor['DateTime']['@type'] = 'DatatypeDateTime'
+    def is_deduplicated(self, x: str) -> bool:
+        """Return whether the fields of a class can be written as its own
+        fields followed by the own fields of the classes that declare its
+        inherited fields. That holds if every group of inherited properties
+        is the whole list of own properties of a class whose message is
+        deduplicated as well.
+
+        Args:
+            x (str): Name of the class.
+
+        Returns:
+            bool: True if the fields of the class can be deduplicated.
+        """
 
-        message_descriptor['Time'] = {}
-        message_descriptor['Time']['@type'] = 'DatatypeTime'
+        stack = [x]
 
-        message_descriptor['Duration'] = {}
-        message_descriptor['Duration']['@type'] = 'DatatypeDuration'
+        while stack:
+            y = stack[-1]
+            if y in self.deduplicated:
+                stack.pop()
+                continue
 
-        message_descriptor['Distance'] = {}
-        message_descriptor['Distance']['@type'] = 'DatatypeQuantitative'
+            _, inherited = self.get_groups(y)
+            pending = [ky for ky, _ in inherited
+                       if self.get_message_name(ky) and ky not in self.deduplicated]
+
+            if pending:
+                stack.extend(pending)
+                continue
+
+            self.deduplicated[y] = all(
+                self.get_message_name(ky) and self.deduplicated[ky] and
+                self.get_groups(ky)[0] == props for ky, props in inherited)
+            stack.pop()
+
+        return self.deduplicated[x]
+
+    def get_descriptor(self, x: str, deduplicate: bool = False) -> Dict:
+        """Return the json descriptor of the message of a class.
+
+        Args:
+            x (str): Name of the class.
+            deduplicate (bool): If True, the inherited fields are replaced by
+                                references to the messages of the classes
+                                that declare them where possible.
+
+        Returns:
+            dict: The json descriptor of the class.
+        """
 
-        message_descriptor['Energy'] = {}
-        message_descriptor['Energy']['@type'] = 'DatatypeQuantitative'
+        own, inherited = self.get_groups(x)
 
-        message_descriptor['Mass'] = {}
-        message_descriptor['Mass']['@type'] = 'DatatypeQuantitative'
+        o = {}
+        o['@type'] = utils.strip_url(x)
+        o['fields'] = ['@id'] + own
 
-        json_descriptor = {}
-        json_descriptor['messages'] = message_descriptor
-        json_descriptor['primitives'] = list(sorted(undefined_classes))
+        if deduplicate and inherited and self.is_deduplicated(x):
+            o['inherits'] = [self.get_message_name(ky) for ky, _ in inherited]
+        else:
+            for _, props in inherited:
+                o['fields'].extend(props)
 
-        return json_descriptor
+        return o
@@ -0,0 +1,178 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import utils.utils as utils
+import utils.constants as constants
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+_TYPE = str(constants.schema_constants['Type'])
+_CLASS = str(constants.schema_constants['Class'])
+_PROPERTY = str(constants.schema_constants['Property'])
+_SUBCLASS_OF = str(constants.schema_constants['subClassOf'])
+_DOMAIN_INCLUDES = str(constants.schema_constants['domainIncludes'])
+_RANGE_INCLUDES = str(constants.schema_constants['rangeIncludes'])
+_COMMENT = str(constants.schema_constants['Comment'])
+
+_SNAPSHOT_ATTRIBUTES = ('classes', 'properties', 'parents', 'domain', 'range',
+                        'comments', 'enum_members')
+
+
+class SchemaIndex():
+    """The SchemaIndex reads every triple of a schema exactly once and stores
+    the relations used by the SchemaGenerator in plain dictionaries, so that
+    the generator never has to query the graph again.
+
+    Args:
+        triples (iterable[tuple]): The (subject, predicate, object) triples of
+                                   the schema.
+
+    Attributes:
+        classes (list[str]): URLs of the entities of type rdfs:Class.
+        properties (list[str]): URLs of the entities of type rdf:Property.
+        parents (dict[str, list[str]]): Mapping from a class URL to the URLs
+                                        of the classes it is subclass of.
+        children (dict[str, list[str]]): Mapping from a class URL to the URLs
+                                         of its direct subclasses.
+        domain (dict[str, set[str]]): Mapping from a class URL to the URLs of
+                                      the properties in its domain.
+        range (dict[str, set[str]]): Mapping from a property URL to the URLs
+                                     of the classes/datatypes in its range.
+        comments (dict[str, list[str]]): Mapping from an entity URL to its
+                                         comments.
+        enum_members (dict[str, set[str]]): Mapping from the name of a type
+                                            to the URLs of its instances.
+    """
+
+    def __init__(self, triples: Iterable[Tuple[Any, Any, Any]]):
+        self.classes = list()
+        self.properties = list()
+        self.parents = dict()
+        self.children = dict()
+        self.domain = dict()
+        self.range = dict()
+        self.comments = dict()
+        self.enum_members = dict()
+
+        for s, p, o in triples:
+            s = str(s)
+            p = str(p)
+            o = str(o)
+
+            if p == _TYPE:
+                if o == _CLASS:
+                    self.classes.append(s)
+                elif o == _PROPERTY:
+                    self.properties.append(s)
+                else:
+                    self.enum_members.setdefault(
+                        utils.strip_url(o), set()).add(s)
+
+            elif p == _SUBCLASS_OF:
+                parents = self.parents.setdefault(s, list())
+                if o not in parents:
+                    parents.append(o)
+                    self.children.setdefault(o, list()).append(s)
+
+            elif p == _DOMAIN_INCLUDES:
+                self.domain.setdefault(o, set()).add(s)
+
+            elif p == _RANGE_INCLUDES:
+                self.range.setdefault(s, set()).add(o)
+
+            elif p == _COMMENT:
+                comments = self.comments.setdefault(s, list())
+                if o not in comments:
+                    comments.append(o)
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Return the contents of the index as a dictionary of builtin types
+        that can be stored and later passed to SchemaIndex.from_snapshot().
+
+        Returns:
+            dict: Snapshot of the index.
+        """
+
+        return {x: getattr(self, x) for x in _SNAPSHOT_ATTRIBUTES}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> 'SchemaIndex':
+        """Return a SchemaIndex rebuilt from a snapshot.
+
+        Args:
+            snapshot (dict): Snapshot returned by SchemaIndex.to_snapshot().
+
+        Returns:
+            SchemaIndex: The index the snapshot was taken of.
+        """
+
+        index = cls(())
+        for x in _SNAPSHOT_ATTRIBUTES:
+            setattr(index, x, snapshot[x])
+
+        # The subclasses are not stored, they follow from the parents.
+        for c, parents in index.parents.items():
+            for p in parents:
+                index.children.setdefault(p, list()).append(c)
+
+        return index
+
+    def get_comment(self, name: str) -> str:
+        """Return the comment of a schema entity.
+
+        Args:
+            name (str): Name of the schema entity.
+
+        Returns:
+            str: The comments of the entity joined together, empty string if
+                 the entity has no comment.
+        """
+
+        return ''.join(self.comments.get(
+            constants.schema_url_prefix + name, ()))
+
+    def get_enum_members(self, name: str) -> Set[str]:
+        """Return the URLs of the instances of a schema type.
+
+        Args:
+            name (str): Name of the schema type.
+
+        Returns:
+            set[str]: URLs of the entities which have name as their type.
+        """
+
+        return self.enum_members.get(name, set())
+
+    def get_children(self, name: str) -> List[str]:
+        """Return the direct subclasses of a schema class.
+
+        Args:
+            name (str): URL of the schema class.
+
+        Returns:
+            list[str]: URLs of the classes that are subclass of name.
+        """
+
+        return list(self.children.get(name, ()))
+
+    def get_range_classes(self) -> Set[str]:
+        """Return every class/datatype that appears in range of a property.
+
+        Returns:
+            set[str]: URLs of the classes/datatypes used in rangeIncludes.
+        """
+
+        total_classes = set()
+        for classes in self.range.values():
+            total_classes.update(classes)
+
+        return total_classes
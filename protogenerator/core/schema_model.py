@@ -0,0 +1,294 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.schema_index as schema_index
+import core.schema_subset as schema_subset
+import core.instrumentation as instrumentation
+import utils.utils as utils
+import utils.constants as constants
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+from utils.utils import PropertyToParent as PropertyToParent
+
+
+class SchemaModel():
+    """The SchemaModel is the in-memory representation of a schema that is
+    written by the SchemaGenerator. It holds the classes, properties and
+    enumerations with the inheritance hierarchy already compressed, so every
+    writer reads the same model instead of going back to the parsed schema.
+
+    A model is immutable and can be pickled, so it can be cached or sent to
+    worker processes. The mappings it holds must not be modified.
+
+    Args:
+        class_to_prop (mapping[str, frozenset[PropertyToParent]]): Properties
+                                                                   of every
+                                                                   class.
+        prop_to_class (dict[str, frozenset[str]]): Range of class/datatypes of
+                                                   every property.
+        enumerations (iterable[str]): Names of the enumerations.
+        enum_members (dict[str, tuple[str]]): Sorted URLs of the members of
+                                              every enumeration.
+        comments (dict[str, str]): Comment of every class and property that
+                                   has one.
+        primitives (iterable[str]): The classes/datatypes used in range of
+                                    properties that are not defined as
+                                    messages, and the primitives.
+
+    Attributes:
+        class_to_prop (mapping[str, frozenset[PropertyToParent]]): Properties
+                                                                   of every
+                                                                   class.
+        prop_to_class (dict[str, frozenset[str]]): Range of class/datatypes of
+                                                   every property.
+        enumerations (frozenset[str]): Names of the enumerations.
+        enum_members (dict[str, tuple[str]]): Sorted URLs of the members of
+                                              every enumeration.
+        comments (dict[str, str]): Comment of every class and property that
+                                   has one.
+        primitives (tuple[str]): Sorted names of the undefined
+                                 classes/datatypes and primitives.
+    """
+
+    __slots__ = ('class_to_prop', 'prop_to_class', 'enumerations',
+                 'enum_members', 'comments', 'primitives')
+
+    def __init__(self,
+                 class_to_prop: Mapping[str, FrozenSet[PropertyToParent]],
+                 prop_to_class: Dict[str, FrozenSet[str]],
+                 enumerations: Iterable[str],
+                 enum_members: Dict[str, Tuple[str, ...]],
+                 comments: Dict[str, str],
+                 primitives: Iterable[str]):
+        set_attr = object.__setattr__
+        set_attr(self, 'class_to_prop', class_to_prop)
+        set_attr(self, 'prop_to_class', prop_to_class)
+        set_attr(self, 'enumerations', frozenset(enumerations))
+        set_attr(self, 'enum_members', enum_members)
+        set_attr(self, 'comments', comments)
+        set_attr(self, 'primitives', tuple(sorted(primitives)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('SchemaModel is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('SchemaModel is immutable.')
+
+    def __reduce__(self):
+        return (SchemaModel, (self.class_to_prop, self.prop_to_class,
+                              self.enumerations, self.enum_members,
+                              self.comments, self.primitives))
+
+    @classmethod
+    def from_index(cls, index: schema_index.SchemaIndex) -> 'SchemaModel':
+        """Compress the inheritance heirarchy of a parsed schema and return
+        its model.
+
+        Args:
+            index (SchemaIndex): Index of the triples of the schema.
+
+        Returns:
+            SchemaModel: The model of the schema.
+        """
+
+        assert isinstance(
+            index, schema_index.SchemaIndex), "Invalid parameter 'index' must be 'SchemaIndex'."
+
+        own_props = dict()
+        inheritance_graph = dict()
+
+        for class_name in index.classes:
+            own_props[utils.strip_url(class_name)] = frozenset(
+                utils.PropertyToParent(utils.strip_url(property_name),
+                                       utils.strip_url(class_name))
+                for property_name in index.domain.get(class_name, ()))
+
+        # Only parents that are defined classes contribute properties.
+        parents = dict()
+        for class_name in index.classes:
+            parents[utils.strip_url(class_name)] = tuple(
+                utils.strip_url(p) for p in index.parents.get(class_name, ())
+                if utils.strip_url(p) in own_props)
+
+        class_to_prop = utils.InheritedProperties(own_props, parents)
+
+        for class_name in index.classes:
+
+            if class_name not in inheritance_graph:
+                inheritance_graph[class_name] = set()
+
+            for parent_class in index.parents.get(class_name, ()):
+
+                if parent_class not in inheritance_graph:
+                    inheritance_graph[parent_class] = set()
+
+                inheritance_graph[parent_class].add(class_name)
+
+        enumerations = set(map(utils.strip_url, index.get_children(
+            str(constants.schema_constants['Enumeration']))))
+
+        with instrumentation.phase('topological_sort'):
+            class_to_children = utils.get_children(inheritance_graph)
+
+        prop_to_class = dict()
+
+        for property_name in index.properties:
+            field_types = set()
+
+            for class_name in index.range.get(property_name, ()):
+                field_types.add(utils.strip_url(class_name))
+                if class_name in class_to_children:
+                    field_types.update(
+                        map(utils.strip_url, class_to_children[class_name]))
+
+                if class_name == str(constants.schema_constants['Number']):
+                    field_types.add(utils.strip_url(
+                        constants.schema_constants['Integer']))
+                    field_types.add(utils.strip_url(
+                        constants.schema_constants['Float']))
+
+                if class_name == str(constants.schema_constants['Text']):
+                    field_types.add(utils.strip_url(
+                        constants.schema_constants['URL']))
+
+            prop_to_class[utils.strip_url(property_name)] = frozenset(
+                field_types)
+
+        enum_members = {x: tuple(sorted(index.get_enum_members(x)))
+                        for x in enumerations}
+
+        comments = dict()
+        for x in list(class_to_prop) + list(prop_to_class):
+            comment = index.get_comment(x)
+            if comment:
+                comments[x] = comment
+
+        primitives = set(map(utils.strip_url, index.get_range_classes()))
+        primitives.difference_update(class_to_prop.keys())
+        primitives.update(constants.schema_primitives.keys())
+
+        return cls(class_to_prop, prop_to_class, enumerations, enum_members,
+                   comments, primitives)
+
+    def prune(self, roots: Iterable[str], max_depth: Optional[int] = None,
+              properties: Optional[Iterable[str]] = None) -> 'SchemaModel':
+        """Return the model of the part of the schema that is reachable from
+        a set of root classes, see schema_subset.prune(). The primitives are
+        the ones of the whole schema.
+
+        Args:
+            roots (iterable[str]): Names of the classes to start from.
+            max_depth (int): Maximum number of properties between a root and
+                             a reachable class, unlimited if None.
+            properties (iterable[str]): Names of the properties that are
+                                        kept, every property is kept if None.
+
+        Returns:
+            SchemaModel: The model of the reachable part of the schema.
+        """
+
+        class_to_prop, prop_to_class, enumerations = schema_subset.prune(
+            self.class_to_prop, self.prop_to_class, self.enumerations, roots,
+            max_depth, properties)
+
+        return SchemaModel(
+            {x: frozenset(p) for x, p in class_to_prop.items()},
+            {x: frozenset(c) for x, c in prop_to_class.items()},
+            enumerations,
+            {x: self.enum_members[x] for x in enumerations},
+            self.comments, self.primitives)
+
+    def get_classes(self) -> List[str]:
+        """Return the schema classes that are written as messages of their
+        own, which excludes enumerations, datatypes and primitives.
+
+        Returns:
+            list[str]: Sorted names of the classes.
+        """
+
+        return [x for x in sorted(self.class_to_prop) if (
+            x not in self.enumerations and
+            x not in constants.schema_datatypes and
+            x not in constants.schema_primitives)]
+
+    def get_properties(self, name: str) -> FrozenSet[PropertyToParent]:
+        """Return the properties of a class including the inherited ones.
+
+        Args:
+            name (str): Name of the class.
+
+        Returns:
+            frozenset[PropertyToParent]: The properties of the class.
+        """
+
+        return self.class_to_prop[name]
+
+    def get_range(self, name: str) -> FrozenSet[str]:
+        """Return the range of a property, including the subclasses of the
+        classes in its range.
+
+        Args:
+            name (str): Name of the property.
+
+        Returns:
+            frozenset[str]: Names of the classes/datatypes in the range.
+        """
+
+        return self.prop_to_class[name]
+
+    def is_enumeration(self, name: str) -> bool:
+        """Return whether a class is an enumeration.
+
+        Args:
+            name (str): Name of the class.
+
+        Returns:
+            bool: True if the class is an enumeration.
+        """
+
+        return name in self.enumerations
+
+    def get_enum_members(self, name: str) -> Tuple[str, ...]:
+        """Return the URLs of the members of an enumeration.
+
+        Args:
+            name (str): Name of the enumeration.
+
+        Returns:
+            tuple[str]: Sorted URLs of the members.
+        """
+
+        return self.enum_members.get(name, ())
+
+    def get_enum_values(self, name: str) -> List[str]:
+        """Return the names of the members of an enumeration.
+
+        Args:
+            name (str): Name of the enumeration.
+
+        Returns:
+            list[str]: Sorted names of the members without duplicates.
+        """
+
+        return sorted(set(map(utils.strip_url, self.get_enum_members(name))))
+
+    def get_comment(self, name: str) -> str:
+        """Return the comment of a class or property.
+
+        Args:
+            name (str): Name of the class or property.
+
+        Returns:
+            str: The comment, empty string if it has none.
+        """
+
+        return self.comments.get(name, '')
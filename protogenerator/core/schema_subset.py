@@ -0,0 +1,119 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import collections
+import utils.constants as constants
+from typing import Dict, Iterable, Optional, Set, Tuple
+from utils.utils import PropertyToParent as PropertyToParent
+
+
+def prune(class_to_prop: Dict[str, Set[PropertyToParent]],
+          prop_to_class: Dict[str, Set[str]],
+          enumerations: Set[str],
+          roots: Iterable[str],
+          max_depth: Optional[int] = None,
+          properties: Optional[Iterable[str]] = None) -> Tuple[Dict[str, Set[PropertyToParent]], Dict[str, Set[str]], Set[str]]:
+    """Return the part of the schema that is reachable from a set of root
+    classes. A class is reachable if it is a root or is in the range of a
+    property of a reachable class. The range of every property already
+    contains the subclasses of its classes, so the class hierarchy is followed
+    as well.
+
+    Args:
+        class_to_prop (dict(set)): Dictionary containing set of properties
+                                   for every class.
+        prop_to_class (dict(set)): Dictionary containing range of
+                                   class/datatypes for every property.
+        enumerations (set): Set containing the enumerations in the schema.
+        roots (iterable[str]): Names of the classes to start from.
+        max_depth (int): Maximum number of properties between a root and a
+                         reachable class, unlimited if None.
+        properties (iterable[str]): Names of the properties that are kept,
+                                    every property is kept if None.
+
+    Returns:
+        dict[str, set[PropertyToParent]]: Dictionary containing set of
+                                          properties for every reachable
+                                          class.
+        dict[str, set[str]]: Dictionary containing range of class/datatypes
+                             for every property of a reachable class.
+        set[str]: Set containing the reachable enumerations.
+    """
+
+    roots = list(roots)
+    for x in roots:
+        assert x in class_to_prop, "Unknown root class '{}'.".format(x)
+
+    assert max_depth is None or max_depth >= 0, "Invalid parameter 'max_depth' must be non negative."
+
+    if properties is not None:
+        properties = set(properties)
+
+    # Datatypes and primitives are not rendered as classes, but properties
+    # need them in the list of defined classes to get the right field type.
+    builtins = set(constants.schema_datatypes) | set(
+        constants.schema_primitives)
+
+    depth = dict()
+    queue = collections.deque()
+
+    for x in roots:
+        if x not in depth:
+            depth[x] = 0
+            queue.append(x)
+
+    while queue:
+        x = queue.popleft()
+
+        if max_depth is not None and depth[x] >= max_depth:
+            continue
+
+        for p in class_to_prop[x]:
+            if properties is not None and p.name not in properties:
+                continue
+
+            for c in prop_to_class.get(p.name, ()):
+                if c in class_to_prop and c not in builtins and c not in depth:
+                    depth[c] = depth[x] + 1
+                    queue.append(c)
+
+    # Keep only the part of the range of properties that is still defined.
+    sub_prop_to_class = dict()
+    for x in depth:
+        for p in class_to_prop[x]:
+            if p.name in sub_prop_to_class:
+                continue
+
+            if properties is not None and p.name not in properties:
+                continue
+
+            value_range = prop_to_class.get(p.name, set())
+            sub_range = set(c for c in value_range if (
+                c in depth or c in builtins or c not in class_to_prop))
+
+            # A property whose whole range was pruned away cannot be used.
+            if len(value_range) == 0 or len(sub_range) > 0:
+                sub_prop_to_class[p.name] = sub_range
+
+    sub_class_to_prop = dict()
+    for x in depth:
+        sub_class_to_prop[x] = set(
+            p for p in class_to_prop[x] if p.name in sub_prop_to_class)
+
+    for x in builtins:
+        if x in class_to_prop:
+            sub_class_to_prop[x] = class_to_prop[x]
+
+    sub_enumerations = set(x for x in enumerations if x in depth)
+
+    return sub_class_to_prop, sub_prop_to_class, sub_enumerations
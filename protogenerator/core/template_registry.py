@@ -0,0 +1,105 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import utils.utils as utils
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from typing import Optional
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), 'templates')
+
+_environment = None
+_templates = dict()
+_bytecode_cache_dir = None
+
+
+def configure(bytecode_cache_dir: Optional[str] = None):
+    """Configure the template registry. The shared environment is recreated
+    on next use.
+
+    Args:
+        bytecode_cache_dir (str): Path to directory where compiled templates
+                                  are cached across runs, compiled templates
+                                  are only kept in memory if None.
+    """
+
+    global _environment, _templates, _bytecode_cache_dir
+
+    assert bytecode_cache_dir is None or isinstance(
+        bytecode_cache_dir, str), "Invalid parameter 'bytecode_cache_dir' must be 'str'."
+
+    _bytecode_cache_dir = bytecode_cache_dir
+    _environment = None
+    _templates = dict()
+
+
+def get_environment() -> Environment:
+    """Return the environment shared by all the templates, creating it on
+    first use.
+
+    Returns:
+        jinja2.Environment: The shared environment.
+    """
+
+    global _environment
+
+    if _environment is None:
+        bytecode_cache = None
+        if _bytecode_cache_dir:
+            os.makedirs(_bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(_bytecode_cache_dir)
+
+        # Templates do not change while generating, so they are never
+        # checked for modifications once compiled.
+        env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+            bytecode_cache=bytecode_cache)
+        env.globals['get_property_name'] = utils.get_property_name
+        env.globals['to_snake_case'] = utils.to_snake_case
+        env.globals['sorted'] = sorted
+        env.globals['get_enum_value_name'] = utils.get_enum_value_name
+        env.globals['get_class_type'] = utils.get_class_type
+
+        _environment = env
+
+    return _environment
+
+
+def get_template(name: str) -> Template:
+    """Return the compiled template, compiling it on first use.
+
+    Args:
+        name (str): Name of the template file in core/templates.
+
+    Returns:
+        jinja2.Template: The compiled template.
+    """
+
+    if name not in _templates:
+        _templates[name] = get_environment().get_template(name)
+
+    return _templates[name]
+
+
+def preload():
+    """Compile every template, so that processes forked afterwards share the
+    compiled templates instead of compiling them again.
+    """
+
+    for name in sorted(os.listdir(TEMPLATE_DIR)):
+        if name.endswith('.txt'):
+            get_template(name)
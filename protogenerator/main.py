@@ -14,8 +14,13 @@
 import argparse
 import os
 import core.schema_generator as schema_generator
-import urllib.request
-import time
+import core.schema_cache as schema_cache
+import core.template_registry as template_registry
+import core.release_store as release_store
+import core.field_numbers as field_numbers
+import core.instrumentation as instrumentation
+import tempfile
+import urllib.error
 
 parser = argparse.ArgumentParser()
 group = parser.add_mutually_exclusive_group(required=True)
@@ -40,6 +45,108 @@ parser.add_argument('-p',
                     type=str,
                     help='Proto package name', required=True)
 
+parser.add_argument('-j',
+                    '--jobs',
+                    type=int,
+                    default=1,
+                    help='Number of processes used to render the proto code')
+
+parser.add_argument('--roots',
+                    type=str,
+                    help='Comma separated list of classes, only the part of '
+                    'the schema reachable from them is generated')
+
+parser.add_argument('--max-depth',
+                    type=int,
+                    help='Maximum number of properties between a root and a '
+                    'generated class')
+
+parser.add_argument('--properties',
+                    type=str,
+                    help='Comma separated list of properties that are '
+                    'generated when --roots is used')
+
+parser.add_argument('--descriptor-format',
+                    type=str,
+                    choices=['json', 'binary', 'both'],
+                    default='both',
+                    help='Format of the schema descriptor')
+
+parser.add_argument('--descriptor-version',
+                    type=int,
+                    choices=list(schema_generator.DESCRIPTOR_VERSIONS),
+                    default=1,
+                    help='Version of schema_descriptor.json, version 2 '
+                    'references inherited fields instead of repeating them')
+
+parser.add_argument('--cache-dir',
+                    type=str,
+                    default=schema_cache.DEFAULT_CACHE_DIR,
+                    help='Path to directory where parsed schemas are cached')
+
+parser.add_argument('--cache-size',
+                    type=int,
+                    default=schema_cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+                    help='Maximum size of the cache directory in MB')
+
+parser.add_argument('--no-cache',
+                    action='store_true',
+                    help='Always parse the schema and do not use the cache')
+
+parser.add_argument('--offline',
+                    action='store_true',
+                    help='Only use releases that are already in the cache')
+
+parser.add_argument('--incremental',
+                    action='store_true',
+                    help='Only regenerate the messages that changed since the '
+                    'previous incremental run in the output directory')
+
+parser.add_argument('--usage-profile',
+                    type=str,
+                    help='Path to a usage profile written by usage_profile.py, '
+                    'the most used properties get the field numbers up to 15')
+
+parser.add_argument('--field-lock',
+                    type=str,
+                    help='Path to the lock file of the field numbers of every '
+                    'message, fields keep their numbers across releases and '
+                    'the numbers of removed fields are reserved, '
+                    'defaults to field_numbers.lock in the output directory')
+
+parser.add_argument('--flatten',
+                    action='store_true',
+                    help='Write properties whose range maps to a single proto '
+                    'type as fields of that type without a wrapper message')
+
+parser.add_argument('--compiled-format',
+                    type=str,
+                    action='append',
+                    choices=['descriptor_set', 'python', 'python_package',
+                             'jsonld_serializer', 'both'],
+                    help='Also write the descriptors protoc builds from '
+                    'schema.proto without running protoc, as schema.pb, '
+                    'schema_pb2.py, both or as the package schema that '
+                    'loads messages lazily, or the JSON-LD serializers of '
+                    'the messages as schema_jsonld.py, can be given several '
+                    'times')
+
+parser.add_argument('--profile-out',
+                    type=str,
+                    help='Path to a json report with the wall time, CPU time '
+                    'and peak memory of every phase of the run')
+
+parser.add_argument('--profile-memory',
+                    action='store_true',
+                    help='Add the peak memory traced by tracemalloc in every '
+                    'phase to the --profile-out report, which slows the run '
+                    'down')
+
+parser.add_argument('--cprofile-out',
+                    type=str,
+                    help='Path to a cProfile dump of the run, which can be '
+                    'read with pstats')
+
 
 def main():
     args = parser.parse_args()
@@ -51,21 +158,92 @@ def main():
     if dest[-1] != '/':
         dest = dest + '/'
 
+    if args.profile_out or args.cprofile_out:
+        instrumentation.start(trace_memory=args.profile_memory,
+                              profile=bool(args.cprofile_out))
+
+    roots = None
+    if args.roots:
+        roots = [x.strip() for x in args.roots.split(',') if x.strip()]
+
+    properties = None
+    if args.properties:
+        properties = [x.strip()
+                      for x in args.properties.split(',') if x.strip()]
+
+    descriptor_formats = schema_generator.DESCRIPTOR_FORMATS
+    if args.descriptor_format != 'both':
+        descriptor_formats = [args.descriptor_format]
+
+    compiled_formats = set()
+    for x in args.compiled_format or ():
+        if x == 'both':
+            compiled_formats.update(['descriptor_set', 'python'])
+        else:
+            compiled_formats.add(x)
+
+    usage_profile = None
+    if args.usage_profile:
+        usage_profile = field_numbers.load_profile(args.usage_profile)
+
+    cache = None
+    if not args.no_cache:
+        cache = schema_cache.SchemaCache(
+            args.cache_dir, args.cache_size * 1024 * 1024)
+        template_registry.configure(
+            os.path.join(args.cache_dir, 'templates'))
+
+    schema = None
     if isinstance(src, str):
-        schema = schema_generator.SchemaGenerator(src)
-        schema.write_proto(dest, pkg)
+        schema = schema_generator.SchemaGenerator(src, cache)
     else:
-        url = 'https://raw.githubusercontent.com/schemaorg/schemaorg/master/data/releases/' + \
-            ver + '/schema.nt'
-        name = './temp-' + str(int(time.time())) + '.nt'
-        try:
-            urllib.request.urlretrieve(url, name)
-        except urllib.error.HTTPError:
-            print('Invalid release number or check your internet connection.')
-        else:
-            schema = schema_generator.SchemaGenerator(name)
-            schema.write_proto(dest, pkg)
-            os.remove(name)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Without the cache the release is only kept for this run.
+            store = release_store.ReleaseStore(
+                tmp_dir if args.no_cache else os.path.join(
+                    args.cache_dir, 'releases'),
+                offline=args.offline)
+
+            try:
+                # A release that is not cached is parsed while it is
+                # downloaded and written to the cache at the same time.
+                with store.open(ver, tee=not args.no_cache) as f:
+                    schema = schema_generator.SchemaGenerator(
+                        f.path or f, cache)
+            except FileNotFoundError:
+                print('Release ' + ver + ' is not in the cache.')
+            except (urllib.error.URLError, ValueError):
+                print('Invalid release number or check your internet connection.')
+
+    if schema:
+        report = schema.write_proto(dest, pkg, args.jobs, roots,
+                                    args.max_depth, properties,
+                                    descriptor_formats,
+                                    args.descriptor_version,
+                                    incremental_update=args.incremental,
+                                    usage_profile=usage_profile,
+                                    field_lock=args.field_lock,
+                                    flatten=args.flatten,
+                                    compiled_formats=compiled_formats)
+        if report:
+            changes = ['{} {} {}'.format(len(report[kind][change]), kind, change)
+                       for kind in ('classes', 'enumerations', 'properties')
+                       for change in ('added', 'changed', 'removed')
+                       if report[kind][change]]
+            print('Changes: {}.'.format(', '.join(changes) or 'none'))
+            print('Rendered {} of {} block(s).'.format(
+                report['rendered'], report['blocks']))
+
+    if cache:
+        print('Schema cache: {} hit(s), {} miss(es).'.format(
+            cache.hits, cache.misses))
+
+    recorder = instrumentation.stop()
+    if recorder and args.profile_out:
+        recorder.save(args.profile_out)
+        print('Profile written to {}.'.format(args.profile_out))
+    if recorder and args.cprofile_out:
+        recorder.dump_profile(args.cprofile_out)
 
 
 if __name__ == '__main__':
@@ -77,5 +255,29 @@ if __name__ == '__main__':
         -v, --VER   Schema.org release number
         -o, --OUT   Path to out file
         -p, --PKG   Proto package name
+        -j, --jobs      Number of processes used to render the proto code
+        --roots         Comma separated list of classes to generate from
+        --max-depth     Maximum number of properties between a root and a class
+        --properties    Comma separated list of properties to generate
+        --descriptor-format     Format of the schema descriptor: json, binary
+                                or both
+        --descriptor-version    Version of schema_descriptor.json: 1 or 2
+        --cache-dir     Path to directory where parsed schemas are cached
+        --cache-size    Maximum size of the cache directory in MB
+        --no-cache      Always parse the schema and do not use the cache
+        --offline       Only use releases that are already in the cache
+        --incremental   Only regenerate the messages that changed since the
+                        previous incremental run
+        --usage-profile Path to a usage profile written by usage_profile.py
+        --field-lock    Path to the lock file of the field numbers
+        --flatten       Write properties with a single type without a
+                        wrapper message
+        --compiled-format   Also write schema.pb, schema_pb2.py, both or
+                            the lazily loaded package schema without
+                            running protoc, or the JSON-LD serializers
+                            schema_jsonld.py
+        --profile-out   Path to a json report of the phases of the run
+        --profile-memory    Trace the peak memory of every phase
+        --cprofile-out  Path to a cProfile dump of the run
     """
     main()
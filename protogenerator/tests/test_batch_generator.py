@@ -0,0 +1,67 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+import core.batch_generator as batch_generator
+
+
+def test_batch_generator():
+    """Test generating several schemas in one batch.
+
+    Procedure:
+        - Create a batch with the test graph and a copy of it with a changed
+          comment, once with a single worker and once with two workers.
+        - Run the batch.
+
+    Verification:
+        - Check if the proto code of the test graph is the expected one.
+        - Check if only the block with the changed comment is rendered for
+          the second schema.
+        - Check if the summary lists both schemas and their totals.
+    """
+
+    expected_proto = open('./tests/files/test_schema.proto', 'r').read()
+    graph = open('./tests/files/test_graph.nt', 'r').read()
+
+    for workers in [1, 2]:
+        with tempfile.TemporaryDirectory() as out_dir:
+            changed = os.path.join(out_dir, 'changed.nt')
+            with open(changed, 'w') as f:
+                f.write(graph.replace('"Comment for RootClass.',
+                                      '"Changed comment for RootClass.'))
+
+            os.makedirs(os.path.join(out_dir, 'a'))
+            os.makedirs(os.path.join(out_dir, 'b'))
+
+            batch = batch_generator.BatchGenerator('schemaorg', workers)
+            batch.add_source('./tests/files/test_graph.nt',
+                             os.path.join(out_dir, 'a'))
+            batch.add_source(changed, os.path.join(out_dir, 'b'))
+            summary = batch.run()
+
+            out_proto = open(os.path.join(
+                out_dir, 'a', 'schema.proto'), 'r').read()
+            changed_proto = open(os.path.join(
+                out_dir, 'b', 'schema.proto'), 'r').read()
+
+        assert out_proto == expected_proto, 'Test proto code.'
+        assert 'Changed comment for RootClass.' in changed_proto, 'Test changed proto code.'
+        assert summary[0]['rendered'] == summary[0]['blocks'], \
+            'Test first schema is rendered.'
+        assert summary[1]['blocks'] == summary[0]['blocks'], \
+            'Test number of blocks.'
+        assert summary[1]['rendered'] == 1, 'Test changed block is rendered.'
+
+        table = batch_generator.format_summary(summary)
+        assert len(table.splitlines()) == 4, 'Test summary table.'
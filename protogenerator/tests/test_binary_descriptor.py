@@ -0,0 +1,94 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import tempfile
+import core.binary_descriptor as binary_descriptor
+import core.schema_generator as schema_generator
+
+
+def test_binary_descriptor():
+    """Test the binary schema descriptor.
+
+    Procedure:
+        - Generate the json and binary descriptor for the test graph.
+        - Load the binary descriptor.
+
+    Verification:
+        - Check if a single message is decoded without decoding the others.
+        - Check if unknown messages raise KeyError.
+        - Check if the decoded descriptor is equal to the json descriptor.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        gen.write_proto(out_dir + '/', 'schemaorg')
+        expected = json.load(open(out_dir + '/schema_descriptor.json', 'r'))
+
+        with binary_descriptor.load(out_dir + '/schema_descriptor.bin') as d:
+            assert d.messages['ChildClassB'] == expected['messages'][
+                'ChildClassB'], 'Test single message.'
+            assert 'NotAMessage' not in d.messages, 'Test unknown message.'
+            assert len(d.messages) == len(
+                expected['messages']), 'Test number of messages.'
+            assert d.to_json() == expected, 'Test decoded descriptor.'
+
+
+def test_binary_descriptor_only():
+    """Test writing only the binary schema descriptor.
+
+    Procedure:
+        - Generate the test graph with only the binary descriptor format.
+
+    Verification:
+        - Check if schema_descriptor.json is not written.
+        - Check if schema_descriptor.bin is written.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        gen.write_proto(out_dir + '/', 'schemaorg',
+                        descriptor_formats=['binary'])
+
+        assert not os.path.exists(
+            out_dir + '/schema_descriptor.json'), 'Test json descriptor is not written.'
+
+        with binary_descriptor.load(out_dir + '/schema_descriptor.bin') as d:
+            assert 'Date' in d.messages, 'Test binary descriptor is written.'
+
+
+def test_binary_descriptor_flattened_values():
+    """Test a flattened message with values in the binary descriptor.
+
+    Procedure:
+        - Write a binary descriptor with a flattened property that has both
+          fields and values.
+        - Load the binary descriptor.
+
+    Verification:
+        - Check if the values do not include the type the property is
+          written as.
+    """
+
+    message = {'@type': 'Property', 'fields': ['text'],
+               'values': ['Text', 'URL'], 'flattened': 'Text'}
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        with open(out_dir + '/schema_descriptor.bin', 'wb') as f:
+            binary_descriptor.write(f, [('Alpha', message)], ['Text', 'URL'])
+
+        with binary_descriptor.load(out_dir + '/schema_descriptor.bin') as d:
+            assert d.messages['Alpha'] == message, 'Test flattened values.'
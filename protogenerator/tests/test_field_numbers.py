@@ -0,0 +1,150 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.field_numbers as field_numbers
+import core.schema_generator as schema_generator
+import json
+import os
+import tempfile
+
+
+def test_collect_profile():
+    """Test collecting a usage profile from JSON-LD documents.
+
+    Procedure:
+        - Collect the profile of a list of documents with nested entities,
+          repeated values and an @graph.
+
+    Verification:
+        - Check if every value of every property of every type is counted.
+        - Check if the most used fields get the smallest field numbers.
+    """
+
+    documents = [
+        {'@context': 'http://schema.org', '@type': 'Movie', 'name': 'A',
+         'actor': [{'@type': 'Person', 'name': 'B'},
+                   {'@type': 'Person', 'name': 'C'}]},
+        {'@graph': [{'@type': 'Movie', 'name': 'D', 'url': 'E'}]}
+    ]
+
+    profile = field_numbers.collect_profile(documents)
+
+    assert profile == {
+        'Movie': {'name': 2, 'actor': 2, 'url': 1},
+        'Person': {'name': 2}
+    }, 'Error in profile.'
+
+    hot = field_numbers.get_hot_fields(
+        ['actor', 'name', 'url', 'genre'], profile['Movie'], 14)
+    assert hot == {'actor': 14, 'name': 15}, 'Error in hot fields.'
+
+
+def test_usage_profile():
+    """Test field numbers chosen from a usage profile.
+
+    Procedure:
+        - Generate the test graph with a profile in which alpha is the most
+          used property of ChildClassA.
+        - Generate it again with a profile in which beta is the most used
+          property.
+
+    Verification:
+        - Check if alpha gets field number 2 and beta the next free number.
+        - Check if the numbers of every field are recorded in the lock file.
+        - Check if the second run keeps the locked numbers.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+
+        gen.write_proto(out_dir, 'schemaorg',
+                        usage_profile={'ChildClassA': {'alpha': 5}})
+        out_proto = open(out_dir + 'schema.proto', 'r').read()
+        lock = json.load(open(out_dir + field_numbers.LOCK_FILE, 'r'))
+        message = out_proto.split('message ChildClassA ')[1].split('}')[0]
+
+        assert 'repeated AlphaProperty alpha = 2 [json_name = "alpha"];' in message, 'Error in hot field.'
+        assert 'repeated BetaProperty beta = 3 [json_name = "beta"];' in message, 'Error in other field.'
+        assert lock['messages']['ChildClassA'] == {
+            'alpha': 2, 'beta': 3}, 'Error in lock file.'
+
+        gen.write_proto(out_dir, 'schemaorg',
+                        usage_profile={'ChildClassA': {'beta': 5}})
+
+        assert open(out_dir + 'schema.proto',
+                    'r').read() == out_proto, 'Error in locked field numbers.'
+
+
+def test_field_lock():
+    """Test upgrading a schema with a field number lock file.
+
+    Procedure:
+        - Generate the test graph with a lock file.
+        - Add the property delta to RootClass, remove beta from ChildClassA,
+          add a value to ChildClassB that sorts first and generate again.
+
+    Verification:
+        - Check if the remaining fields and enum values keep their numbers.
+        - Check if the new fields and enum values get unused numbers.
+        - Check if the number of the removed field is reserved.
+        - Check if beta gets its number back when it is added again.
+    """
+
+    src = open('./tests/files/test_graph.nt', 'r').read()
+    beta = '<http://schema.org/beta> <http://schema.org/domainIncludes> <http://schema.org/ChildClassA> .\n'
+    changed = src.replace(beta, '') + (
+        '<http://schema.org/delta> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/delta> <http://schema.org/domainIncludes> <http://schema.org/RootClass> .\n'
+        '<http://schema.org/delta> <http://schema.org/rangeIncludes> <http://schema.org/Text> .\n'
+        '<http://schema.org/EnumValueZero> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://schema.org/ChildClassB> .\n')
+
+    assert beta in src, 'Error in test graph.'
+
+    def generate(out_dir: str, schema: str) -> str:
+        with open(out_dir + 'schema.nt', 'w') as f:
+            f.write(schema)
+
+        gen = schema_generator.SchemaGenerator(out_dir + 'schema.nt')
+        gen.write_proto(out_dir, 'schemaorg',
+                        field_lock=out_dir + field_numbers.LOCK_FILE)
+        return open(out_dir + 'schema.proto', 'r').read()
+
+    def get_message(proto: str, name: str) -> str:
+        return proto.split('message ' + name + ' ')[1].split('\n}')[0]
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+
+        out_proto = generate(out_dir, src)
+        expected_proto = open('./tests/files/test_schema.proto', 'r').read()
+
+        assert out_proto == expected_proto, 'Error in first run.'
+
+        out_proto = generate(out_dir, changed)
+        message = get_message(out_proto, 'ChildClassA')
+        enum = get_message(out_proto, 'ChildClassBClass')
+
+        assert 'beta' not in message, 'Error in removed field.'
+        assert 'repeated AlphaProperty alpha = 3 [json_name = "alpha"];' in message, 'Error in locked field.'
+        assert 'repeated DeltaProperty delta = 4 [json_name = "delta"];' in message, 'Error in new field.'
+        assert 'reserved 2;' in message, 'Error in reserved field.'
+        assert 'ENUM_VALUE_ONE = 1 ' in enum, 'Error in locked enum value.'
+        assert 'ENUM_VALUE_TWO = 2 ' in enum, 'Error in locked enum value.'
+        assert 'ENUM_VALUE_ZERO = 3 ' in enum, 'Error in new enum value.'
+
+        message = get_message(generate(out_dir, changed + beta), 'ChildClassA')
+
+        assert 'repeated BetaProperty beta = 2 [json_name = "beta"];' in message, 'Error in restored field.'
+        assert 'reserved' not in message, 'Error in restored field.'
@@ -0,0 +1,210 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.schema_generator as schema_generator
+import core.field_numbers as field_numbers
+import core.file_descriptor as file_descriptor
+import grpc_tools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from grpc_tools import protoc
+
+
+def compile_proto(out_dir: str) -> bytes:
+    """Return the FileDescriptorSet protoc builds from schema.proto."""
+
+    include = os.path.join(os.path.dirname(grpc_tools.__file__), '_proto')
+    assert protoc.main(['protoc', '-I' + out_dir, '-I' + include,
+                        '--descriptor_set_out=' + out_dir + 'protoc.pb',
+                        'schema.proto']) == 0, 'Error in protoc.'
+
+    return open(out_dir + 'protoc.pb', 'rb').read()
+
+
+def test_descriptor_set():
+    """Test writing the descriptor set without protoc.
+
+    Procedure:
+        - Add the property delta with the range Text to RootClass and the
+          property epsilon with the range ChildClassA to ChildClassA.
+        - Generate the test graph with a lock file, remove beta from
+          ChildClassA and a value from ChildClassB and generate again, so
+          that the lock reserves their numbers.
+        - Generate the flattened schema.
+        - Compile every schema.proto with protoc.
+
+    Verification:
+        - Check if every schema.pb is identical to the descriptor set
+          written by protoc.
+        - Check if the second run reserves field numbers and enum values.
+    """
+
+    src = open('./tests/files/test_graph.nt', 'r').read() + (
+        '<http://schema.org/delta> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/delta> <http://schema.org/domainIncludes> <http://schema.org/RootClass> .\n'
+        '<http://schema.org/delta> <http://schema.org/rangeIncludes> <http://schema.org/Text> .\n'
+        '<http://schema.org/epsilon> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/epsilon> <http://schema.org/domainIncludes> <http://schema.org/ChildClassA> .\n'
+        '<http://schema.org/epsilon> <http://schema.org/rangeIncludes> <http://schema.org/ChildClassA> .\n')
+    beta = '<http://schema.org/beta> <http://schema.org/domainIncludes> <http://schema.org/ChildClassA> .\n'
+    value = '<http://schema.org/EnumValueOne> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://schema.org/ChildClassB> .\n'
+    changed = src.replace(beta, '').replace(value, '')
+
+    assert beta in src and value in src, 'Error in test graph.'
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        lock = out_dir + field_numbers.LOCK_FILE
+
+        reserved = list()
+        for schema, options in [(src, dict(field_lock=lock)),
+                                (changed, dict(field_lock=lock)),
+                                (src, dict(flatten=True))]:
+            with open(out_dir + 'schema.nt', 'w') as f:
+                f.write(schema)
+
+            gen = schema_generator.SchemaGenerator(out_dir + 'schema.nt')
+            gen.write_proto(out_dir, 'schemaorg',
+                            compiled_formats=['descriptor_set'], **options)
+
+            expected = compile_proto(out_dir)
+            out = open(out_dir + 'schema.pb', 'rb').read()
+
+            assert out == expected, 'Error in descriptor set with ' + \
+                str(options) + '.'
+
+            reserved.append(open(out_dir + 'schema.proto',
+                                 'r').read().count('reserved '))
+
+    assert reserved == [0, 2, 0], 'Error in reserved numbers.'
+
+
+def test_python_module():
+    """Test writing schema_pb2.py without protoc.
+
+    Procedure:
+        - Generate schema_pb2.py for the test graph.
+        - Import it in a new process.
+
+    Verification:
+        - Check if the classes and their (type) options are defined.
+        - Check if the json names and (schemaorg_value) options are the ones
+          of schema.proto.
+        - Check if the descriptor of the file is the one protoc builds.
+    """
+
+    script = '\n'.join([
+        'import json, schema_pb2',
+        'm = schema_pb2.ChildClassA()',
+        'm.alpha.add().child_class_c.id = "x"',
+        'e = schema_pb2.ChildClassBClass.Id',
+        'print(json.dumps({',
+        '    "type": m.DESCRIPTOR.GetOptions().Extensions[schema_pb2.type],',
+        '    "json_names": [x.json_name for x in m.DESCRIPTOR.fields],',
+        '    "value": e.DESCRIPTOR.values[1].GetOptions().Extensions[',
+        '        schema_pb2.schemaorg_value],',
+        '    "size": len(schema_pb2.ChildClassA.FromString(',
+        '        m.SerializeToString()).alpha),',
+        '    "file": schema_pb2.DESCRIPTOR.serialized_pb.hex()}))'])
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+        gen.write_proto(out_dir, 'schemaorg', compiled_formats=['python'])
+
+        out = json.loads(subprocess.run(
+            [sys.executable, '-c', script], cwd=out_dir, check=True,
+            stdout=subprocess.PIPE).stdout)
+        expected = compile_proto(out_dir)
+
+    assert out['type'] == 'ChildClassA', 'Error in type option.'
+    assert out['json_names'] == [
+        '@id', 'beta', 'alpha'], 'Error in json names.'
+    assert out['value'] == 'http://schema.org/EnumValueOne', 'Error in schemaorg_value option.'
+    assert out['size'] == 1, 'Error in round trip.'
+    assert expected.endswith(bytes.fromhex(
+        out['file'])), 'Error in file descriptor.'
+
+
+def test_python_package():
+    """Test writing the lazily loaded python package.
+
+    Procedure:
+        - Generate the package schema for the test graph.
+        - Import it in a new process and access ChildClassA.
+
+    Verification:
+        - Check if no message is loaded by importing the package.
+        - Check if ChildClassA is loaded with the messages it refers to, but
+          not with Date.
+        - Check if the (type) option, the json names and a round trip work.
+        - Check if unknown names raise AttributeError.
+    """
+
+    script = '\n'.join([
+        'import json, sys, schema',
+        'loaded = lambda: sorted(x for x in sys.modules',
+        '                        if x.startswith("schema._c"))',
+        'before = loaded()',
+        'm = schema.ChildClassA()',
+        'm.alpha.add().child_class_c.id = "x"',
+        'try:',
+        '    schema.Unknown',
+        '    missing = False',
+        'except AttributeError:',
+        '    missing = True',
+        'print(json.dumps({',
+        '    "before": before,',
+        '    "after": loaded(),',
+        '    "date": schema._MODULES["Date"],',
+        '    "type": m.DESCRIPTOR.GetOptions().Extensions[schema.type],',
+        '    "json_names": [x.json_name for x in m.DESCRIPTOR.fields],',
+        '    "size": len(schema.ChildClassA.FromString(',
+        '        m.SerializeToString()).alpha),',
+        '    "missing": missing}))'])
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+        gen.write_proto(out_dir, 'schemaorg',
+                        compiled_formats=['python_package'])
+
+        out = json.loads(subprocess.run(
+            [sys.executable, '-c', script], cwd=out_dir, check=True,
+            stdout=subprocess.PIPE).stdout)
+
+    assert out['before'] == [], 'Error in lazy loading.'
+    assert out['after'] and 'schema.' + out['date'] not in out['after'], 'Error in loaded components.'
+    assert out['type'] == 'ChildClassA', 'Error in type option.'
+    assert out['json_names'] == [
+        '@id', 'beta', 'alpha'], 'Error in json names.'
+    assert out['size'] == 1, 'Error in round trip.'
+    assert out['missing'], 'Error in unknown attribute.'
+
+
+def test_json_name():
+    """Test the json names protoc gives fields without a json_name option.
+
+    Procedure:
+        - Get the json name of field names with underscores.
+
+    Verification:
+        - Check if they are in lower camel case.
+    """
+
+    assert file_descriptor.get_json_name('child_class_b') == 'childClassB', 'Error in json name.'
+    assert file_descriptor.get_json_name('id') == 'id', 'Error in json name.'
+    assert file_descriptor.get_json_name('schemaorg_value') == 'schemaorgValue', 'Error in json name.'
@@ -14,8 +14,12 @@
 import rdflib
 import utils.constants as constants
 import utils.utils as utils
+import core.binary_descriptor as binary_descriptor
 import core.schema_generator as schema_generator
+import json
 import os
+import tempfile
+from google.protobuf import descriptor_pb2
 
 
 def test_generator():
@@ -53,6 +57,182 @@ def test_generator():
 
     os.remove('./tests/files/schema.proto')
     os.remove('./tests/files/schema_descriptor.json')
+    os.remove('./tests/files/schema_descriptor.bin')
 
     assert out_proto == expected_proto, 'Error in schema proto.'
     assert out_descriptor == expected_descriptor, 'Error in schema descriptor.'
+
+
+def test_generator_parallel():
+    """Test the schema generator with parallel rendering.
+
+    Procedure:
+        - Generate the proto code for the test graph using a pool of
+          processes.
+
+    Verification:
+        - Check if the output is identical to the output of a serial run.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        gen.write_proto(out_dir + '/', 'schemaorg', jobs=2)
+        out_proto = open(out_dir + '/schema.proto', 'r').read()
+
+    expected_proto = open('./tests/files/test_schema.proto', 'r').read()
+
+    assert out_proto == expected_proto, 'Error in parallel schema proto.'
+
+
+def test_generator_subset():
+    """Test the schema generator with a set of root classes.
+
+    Procedure:
+        - Generate the proto code for the test graph with the following:
+            * ChildClassA as root without limits.
+            * ChildClassA as root with a maximum depth of 0.
+            * ChildClassA as root with only the property beta.
+
+    Verification:
+        - Check if classes that are not reachable from the root are skipped.
+        - Check if classes in range of properties of reachable classes are
+          generated.
+        - Check if the maximum depth limits the reachable classes and prunes
+          the range of properties.
+        - Check if properties that are not allowed are skipped.
+        - Check if the json descriptor only contains the generated messages.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    def generate(**kwargs):
+        with tempfile.TemporaryDirectory() as out_dir:
+            gen.write_proto(out_dir + '/', 'schemaorg', **kwargs)
+            out_proto = open(out_dir + '/schema.proto', 'r').read()
+            out_descriptor = json.load(
+                open(out_dir + '/schema_descriptor.json', 'r'))
+
+        return out_proto, out_descriptor['messages']
+
+    out_proto, messages = generate(roots=['ChildClassA'])
+    assert 'message RootClass ' not in out_proto, 'Test unreachable class.'
+    assert 'message ChildClassA ' in out_proto, 'Test root class.'
+    assert 'message ChildClassC ' in out_proto, 'Test class in range.'
+    assert 'message ChildClassB ' in out_proto, 'Test enumeration in range.'
+    assert 'message GammaProperty ' in out_proto, 'Test transitive property.'
+    assert sorted(messages.keys()) == sorted([
+        'ChildClassA', 'ChildClassB', 'ChildClassBClass', 'ChildClassC',
+        'alpha', 'beta', 'gamma', 'Date', 'DateTime', 'Time', 'Duration',
+        'Distance', 'Energy', 'Mass']), 'Test descriptor messages.'
+
+    out_proto, messages = generate(roots=['ChildClassA'], max_depth=0)
+    assert 'message ChildClassC ' not in out_proto, 'Test maximum depth.'
+    assert 'message ChildClassB ' not in out_proto, 'Test maximum depth.'
+    assert 'child_class_c' not in out_proto, 'Test pruned range.'
+    assert messages['alpha']['fields'] == [
+        'Float', 'Integer', 'Number'], 'Test pruned range in descriptor.'
+
+    out_proto, messages = generate(roots=['ChildClassA'],
+                                   properties=['beta'])
+    assert 'AlphaProperty' not in out_proto, 'Test property allowlist.'
+    assert messages['ChildClassA']['fields'] == [
+        '@id', 'beta'], 'Test property allowlist in descriptor.'
+
+
+def test_generator_subset_field_numbers():
+    """Test the field numbers of the schema generator with a set of root
+    classes.
+
+    Procedure:
+        - Generate the descriptor set of the whole test graph.
+        - Generate the descriptor set with ChildClassA as root with only the
+          property beta, with a maximum depth of 0 and with flattened
+          properties.
+
+    Verification:
+        - Check if every field of a subset message has the number of the
+          same field of the whole schema.
+        - Check if the numbers of the pruned fields are reserved.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    def generate(**kwargs):
+        with tempfile.TemporaryDirectory() as out_dir:
+            gen.write_proto(out_dir + '/', 'schemaorg', descriptor_formats=[],
+                            compiled_formats=['descriptor_set'], **kwargs)
+            descriptor_set = descriptor_pb2.FileDescriptorSet.FromString(
+                open(out_dir + '/schema.pb', 'rb').read())
+
+        return {x.name: x for x in descriptor_set.file[0].message_type}
+
+    full = generate()
+    for kwargs in [{'properties': ['beta']}, {'max_depth': 0},
+                   {'flatten': True}]:
+        subset = generate(roots=['ChildClassA'], **kwargs)
+        for name, message in subset.items():
+            fields = {x.name: x.number for x in message.field}
+            expected = {x.name: x.number for x in full[name].field}
+            pruned = sorted(n for x, n in expected.items() if x not in fields)
+
+            for x, n in fields.items():
+                assert expected[x] == n, 'Test field number of {}.{}.'.format(
+                    name, x)
+            assert [x.start for x in message.reserved_range] == pruned, 'Test reserved numbers of {}.'.format(
+                name)
+
+
+def test_generator_flatten():
+    """Test the schema generator with flattened properties.
+
+    Procedure:
+        - Add the property delta with the range Text to RootClass and the
+          property epsilon with the range ChildClassA to ChildClassA.
+        - Generate the proto code with flattened properties.
+
+    Verification:
+        - Check if delta and epsilon are fields of their own type and have no
+          wrapper message.
+        - Check if the polymorphic properties keep their wrapper message.
+        - Check if the json and binary descriptor give the type the
+          flattened properties are written as.
+    """
+
+    src = open('./tests/files/test_graph.nt', 'r').read() + (
+        '<http://schema.org/delta> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/delta> <http://schema.org/domainIncludes> <http://schema.org/RootClass> .\n'
+        '<http://schema.org/delta> <http://schema.org/rangeIncludes> <http://schema.org/Text> .\n'
+        '<http://schema.org/epsilon> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/epsilon> <http://schema.org/domainIncludes> <http://schema.org/ChildClassA> .\n'
+        '<http://schema.org/epsilon> <http://schema.org/rangeIncludes> <http://schema.org/ChildClassA> .\n')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        with open(out_dir + 'schema.nt', 'w') as f:
+            f.write(src)
+
+        gen = schema_generator.SchemaGenerator(out_dir + 'schema.nt')
+        gen.write_proto(out_dir, 'schemaorg', flatten=True)
+
+        out_proto = open(out_dir + 'schema.proto', 'r').read()
+        messages = json.load(
+            open(out_dir + 'schema_descriptor.json', 'r'))['messages']
+
+        with binary_descriptor.load(out_dir + 'schema_descriptor.bin') as d:
+            binary_messages = dict(d.messages)
+
+    root = out_proto.split('message RootClass ')[1].split('\n}')[0]
+    child = out_proto.split('message ChildClassA ')[1].split('\n}')[0]
+
+    assert 'repeated string delta = ' in root, 'Test flattened primitive.'
+    assert 'repeated ChildClassA epsilon = ' in child, 'Test flattened class.'
+    assert 'repeated string delta = ' in child, 'Test inherited flattened property.'
+    assert 'DeltaProperty' not in out_proto, 'Test wrapper of flattened property.'
+    assert 'EpsilonProperty' not in out_proto, 'Test wrapper of flattened property.'
+    assert 'repeated AlphaProperty alpha = ' in child, 'Test polymorphic property.'
+    assert 'message AlphaProperty ' in out_proto, 'Test polymorphic property.'
+    assert messages['delta']['flattened'] == 'Text', 'Test flattened descriptor.'
+    assert messages['epsilon']['flattened'] == 'ChildClassA', 'Test flattened descriptor.'
+    assert 'flattened' not in messages['alpha'], 'Test polymorphic descriptor.'
+    assert binary_messages == messages, 'Test flattened binary descriptor.'
@@ -0,0 +1,141 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.incremental as incremental
+import core.schema_generator as schema_generator
+import io
+import json
+import os
+import tempfile
+
+
+def test_incremental():
+    """Test incremental regeneration.
+
+    Procedure:
+        - Generate the proto code for the test graph incrementally.
+        - Change the comment of RootClass, add the NewClass class and
+          regenerate into the same directory.
+        - Generate the changed graph in full into another directory.
+
+    Verification:
+        - Check if the first run reports every message as added.
+        - Check if the second run reports RootClass as changed and NewClass
+          as added, and only renders the changed blocks.
+        - Check if the incremental output is identical to the full output.
+        - Check if a modified schema.proto is regenerated in full.
+    """
+
+    src = open('./tests/files/test_graph.nt', 'r').read()
+    changed = src.replace('Comment for RootClass.', 'New comment.')
+    changed += ('<http://schema.org/NewClass> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/2000/01/rdf-schema#Class> .\n'
+                '<http://schema.org/NewClass> <http://www.w3.org/2000/01/rdf-schema#subClassOf> <http://schema.org/RootClass> .\n')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_dir = os.path.join(tmp_dir, 'out', '')
+        full_dir = os.path.join(tmp_dir, 'full', '')
+        os.mkdir(out_dir)
+        os.mkdir(full_dir)
+
+        src_path = os.path.join(tmp_dir, 'schema.nt')
+        with open(src_path, 'w') as f:
+            f.write(src)
+
+        report = schema_generator.SchemaGenerator(src_path).write_proto(
+            out_dir, 'schemaorg', incremental_update=True)
+
+        assert report['rendered'] == report['blocks'], 'Error in first run.'
+        assert 'RootClass' in report['classes']['added'], 'Error in first run.'
+
+        with open(src_path, 'w') as f:
+            f.write(changed)
+
+        report = schema_generator.SchemaGenerator(src_path).write_proto(
+            out_dir, 'schemaorg', incremental_update=True)
+        schema_generator.SchemaGenerator(src_path).write_proto(
+            full_dir, 'schemaorg')
+
+        out_proto = open(out_dir + 'schema.proto', 'r').read()
+        full_proto = open(full_dir + 'schema.proto', 'r').read()
+        saved_report = json.load(open(out_dir + incremental.REPORT_FILE))
+
+        assert out_proto == full_proto, 'Error in incremental proto.'
+        assert saved_report == report, 'Error in saved report.'
+        assert 'RootClass' in report['classes']['changed'], 'Error in changed classes.'
+        assert 'ChildClassA' not in report['classes']['changed'], 'Error in changed classes.'
+        assert report['classes']['added'] == [
+            'NewClass'], 'Error in added classes.'
+        assert report['rendered'] < report['blocks'], 'Error in rendered blocks.'
+
+        # A manifest that does not match schema.proto is ignored.
+        with open(out_dir + 'schema.proto', 'a') as f:
+            f.write('\n')
+
+        report = schema_generator.SchemaGenerator(src_path).write_proto(
+            out_dir, 'schemaorg', incremental_update=True)
+
+        assert report['rendered'] == report['blocks'], 'Error in modified proto.'
+        assert open(out_dir + 'schema.proto', 'r').read() == full_proto, 'Error in modified proto.'
+
+
+def test_incremental_manifest():
+    """Test that damaged or outdated manifests are ignored.
+
+    Procedure:
+        - Generate the proto code for the test graph incrementally.
+        - Regenerate it with a damaged manifest, a manifest of a pickle and a
+          manifest written with other render code.
+        - Write two equal blocks with a PositionWriter.
+
+    Verification:
+        - Check if the manifest is json, stores the render function, message
+          name and checksum of every block, and every block is reused by an
+          unchanged run.
+        - Check if every block is rendered again for the other manifests
+          and the output is unchanged.
+        - Check if the position of every equal block is recorded by its key.
+    """
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+        gen.write_proto(out_dir, 'schemaorg', incremental_update=True)
+        expected = open(out_dir + 'schema.proto', 'r').read()
+        manifest = json.load(open(out_dir + incremental.MANIFEST_FILE))
+        for fn, name, digest, start, end in manifest['blocks']:
+            assert expected[start:end].startswith('// ') and expected[
+                start:end].endswith('}\n\n'), 'Error in manifest block.'
+            assert len(digest) == 64, 'Error in manifest block checksum.'
+
+        report = gen.write_proto(out_dir, 'schemaorg',
+                                 incremental_update=True)
+        assert report['rendered'] == 0, 'Error in unchanged run.'
+
+        outdated = dict(manifest, render_digest='0' * 64)
+        for content in ['{"blocks": [[1', '\x80\x04K\x01.',
+                        json.dumps(outdated)]:
+            with open(out_dir + incremental.MANIFEST_FILE, 'w') as f:
+                f.write(content)
+
+            report = gen.write_proto(out_dir, 'schemaorg',
+                                     incremental_update=True)
+
+            assert report['rendered'] == report['blocks'], 'Error in ignored manifest.'
+            assert open(out_dir + 'schema.proto',
+                        'r').read() == expected, 'Error in ignored manifest.'
+
+    writer = incremental.PositionWriter(io.StringIO())
+    writer.write('header\n')
+    writer.write_blocks([('a',), ('b',)], ['x\n', 'x\n'])
+    assert writer.positions == {('a',): (7, 9), ('b',): (
+        9, 11)}, 'Error in positions of equal blocks.'
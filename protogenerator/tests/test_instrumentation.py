@@ -0,0 +1,77 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.instrumentation as instrumentation
+import core.schema_generator as schema_generator
+import json
+import os
+import pstats
+import tempfile
+
+
+def test_instrumentation():
+    """Test recording the phases of a run.
+
+    Procedure:
+        - Generate the test graph while instrumentation is started with
+          memory tracing and cProfile.
+        - Write the report and the cProfile dump.
+
+    Verification:
+        - Check if the parse, model, render and descriptor phases and the
+          nested phases are recorded in the order they were started.
+        - Check if every phase has its times and peak memory.
+        - Check if the triples and entities are counted.
+        - Check if the cProfile dump can be read.
+        - Check if nothing is recorded once instrumentation is stopped.
+    """
+
+    recorder = instrumentation.start(trace_memory=True, profile=True)
+    try:
+        gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+        with tempfile.TemporaryDirectory() as out_dir:
+            gen.write_proto(os.path.join(out_dir, ''), 'schemaorg')
+    finally:
+        assert instrumentation.stop() is recorder, 'Error in stop.'
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        recorder.save(os.path.join(out_dir, 'profile.json'))
+        recorder.dump_profile(os.path.join(out_dir, 'profile.pstats'))
+
+        report = json.load(open(os.path.join(out_dir, 'profile.json'), 'r'))
+        stats = pstats.Stats(os.path.join(out_dir, 'profile.pstats'))
+
+    names = [x['name'] for x in report['phases']]
+
+    assert names[:3] == ['parse', 'model',
+                         'model/topological_sort'], 'Error in phase order.'
+    for x in ['render_classes', 'render_classes/sanitize_comments',
+              'render_enumerations', 'render_properties', 'json_descriptor',
+              'binary_descriptor']:
+        assert x in names, 'Error in phase ' + x + '.'
+
+    for x in report['phases']:
+        assert x['calls'] > 0 and x['wall_time'] >= 0 and x['cpu_time'] >= 0, 'Error in phase times.'
+        assert x['peak_memory'] > 0, 'Error in phase memory.'
+
+    assert report['peak_memory'] >= max(
+        x['peak_memory'] for x in report['phases']), 'Error in peak memory.'
+    assert report['counts'] == {
+        'triples': 26, 'classes': 4, 'enumerations': 1, 'properties': 3}, 'Error in counts.'
+    assert stats.total_calls > 0, 'Error in cProfile dump.'
+
+    with instrumentation.phase('ignored'):
+        instrumentation.count('ignored')
+
+    assert 'ignored' not in recorder.phases, 'Error in stopped recorder.'
+    assert 'ignored' not in recorder.counts, 'Error in stopped recorder.'
@@ -0,0 +1,97 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import tempfile
+import utils.utils as utils
+import core.json_descriptor as json_descriptor
+import core.schema_generator as schema_generator
+
+
+def test_json_descriptor_version_2():
+    """Test version 2 of the json schema descriptor.
+
+    Procedure:
+        - Generate the json descriptor for the test graph in version 1 and
+          version 2.
+        - Load both descriptors.
+
+    Verification:
+        - Check if child classes reference the classes they inherit from.
+        - Check if the expanded version 2 descriptor is equal to the version
+          1 descriptor, including the order of fields.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        gen.write_proto(out_dir + '/', 'schemaorg',
+                        descriptor_formats=['json'])
+        expected = json.load(open(out_dir + '/schema_descriptor.json', 'r'))
+
+        gen.write_proto(out_dir + '/', 'schemaorg',
+                        descriptor_formats=['json'], descriptor_version=2)
+        raw = json.load(open(out_dir + '/schema_descriptor.json', 'r'))
+        out = json_descriptor.load(out_dir + '/schema_descriptor.json')
+
+    assert raw['version'] == 2, 'Test descriptor version.'
+    assert raw['messages']['ChildClassA']['inherits'] == [
+        'RootClass'], 'Test references to parent classes.'
+    assert out.version == 2, 'Test loaded version.'
+    assert out.to_json() == expected, 'Test expanded descriptor.'
+
+
+def test_json_descriptor_fallback():
+    """Test classes whose inherited fields can not be deduplicated.
+
+    Procedure:
+        - Create a hierarchy where Thing is the root, Movie and Series are
+          children of Thing and TVSeries is a child of both Movie and Series.
+        - Declare the property url on both Thing and Series, so that Series
+          inherits only name from Thing.
+
+    Verification:
+        - Check if Movie references Thing.
+        - Check if Series lists all of its fields.
+        - Check if TVSeries lists all of its fields as it inherits from
+          Series.
+    """
+
+    own = {
+        'Thing': frozenset([utils.PropertyToParent('name', 'Thing'),
+                            utils.PropertyToParent('url', 'Thing')]),
+        'Movie': frozenset([utils.PropertyToParent('director', 'Movie')]),
+        'Series': frozenset([utils.PropertyToParent('episode', 'Series'),
+                             utils.PropertyToParent('url', 'Series')]),
+        'TVSeries': frozenset()
+    }
+
+    parents = {
+        'Thing': (),
+        'Movie': ('Thing',),
+        'Series': ('Thing',),
+        'TVSeries': ('Movie', 'Series')
+    }
+
+    fields = schema_generator._ClassFields(
+        utils.InheritedProperties(own, parents), set())
+
+    assert fields.get_descriptor('Movie', True) == {
+        '@type': 'Movie', 'fields': ['@id', 'director'],
+        'inherits': ['Thing']}, 'Test deduplicated fields.'
+    assert fields.get_descriptor('Series', True) == {
+        '@type': 'Series',
+        'fields': ['@id', 'episode', 'url', 'name']}, 'Test redeclared field.'
+    assert fields.get_descriptor('TVSeries', True) == {
+        '@type': 'TVSeries',
+        'fields': ['@id', 'director', 'episode', 'name', 'url']}, 'Test full list of fields.'
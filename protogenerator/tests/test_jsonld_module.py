@@ -0,0 +1,126 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.schema_generator as schema_generator
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_SCRIPT = '\n'.join([
+    'import json, schema_pb2, schema_jsonld',
+    'a = schema_pb2.ChildClassA()',
+    'a.id = "http://example.com/a"',
+    'a.beta.add().text = "x"',
+    'a.beta.add().url = "http://example.com/"',
+    'c = a.alpha.add().child_class_c',
+    'c.gamma.add().float = 1.5',
+    'a.alpha.add().child_class_b.id = 2',
+    'a.alpha.add().child_class_b.child_class_b.id = "b"',
+    'a.alpha.add()',
+    'dt = schema_pb2.DateTime()',
+    'dt.date.year, dt.date.month, dt.date.day = 2000, 2, 9',
+    'dt.time.hours, dt.time.timezone = 6, "+05:30"',
+    'd = schema_pb2.Distance(value=2.5, unit="km")',
+    'print(json.dumps([schema_jsonld.serialize(x) for x in [a, dt, d]]))'])
+
+
+def test_jsonld_module():
+    """Test the generated JSON-LD serializers.
+
+    Procedure:
+        - Generate schema_pb2.py and schema_jsonld.py for the test graph.
+        - Serialize a class with text, URL, class, enumeration values and an
+          empty property, a datetime and a quantitative datatype in a new
+          process.
+
+    Verification:
+        - Check if the output is the JSON-LD JSONLDSerializer writes.
+    """
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+        gen.write_proto(out_dir, 'schemaorg', compiled_formats=[
+                        'python', 'jsonld_serializer'])
+
+        out = json.loads(subprocess.run(
+            [sys.executable, '-c', _SCRIPT], cwd=out_dir, check=True,
+            stdout=subprocess.PIPE).stdout)
+
+    expected = [
+        {
+            '@type': 'ChildClassA',
+            '@id': 'http://example.com/a',
+            'beta': ['x', 'http://example.com/'],
+            'alpha': [
+                {'@type': 'ChildClassC', 'gamma': 1.5},
+                'http://schema.org/EnumValueTwo',
+                {'@type': 'ChildClassB', '@id': 'b'},
+                None
+            ]
+        },
+        '2000-02-09T06:00:00+05:30',
+        '2.5 km'
+    ]
+
+    assert out == expected, 'Error in JSON-LD serializers.'
+
+
+def test_jsonld_module_flatten():
+    """Test the generated JSON-LD serializers of a flattened schema.
+
+    Procedure:
+        - Add the property delta with the range Text to RootClass and the
+          property epsilon with the range ChildClassA to ChildClassA.
+        - Generate schema_pb2.py and schema_jsonld.py for the graph with
+          flattened properties.
+        - Serialize a class with flattened text and class values in a new
+          process.
+
+    Verification:
+        - Check if the values are written like the values of wrapped
+          properties.
+    """
+
+    src = open('./tests/files/test_graph.nt', 'r').read() + (
+        '<http://schema.org/delta> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/delta> <http://schema.org/domainIncludes> <http://schema.org/RootClass> .\n'
+        '<http://schema.org/delta> <http://schema.org/rangeIncludes> <http://schema.org/Text> .\n'
+        '<http://schema.org/epsilon> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/1999/02/22-rdf-syntax-ns#Property> .\n'
+        '<http://schema.org/epsilon> <http://schema.org/domainIncludes> <http://schema.org/ChildClassA> .\n'
+        '<http://schema.org/epsilon> <http://schema.org/rangeIncludes> <http://schema.org/ChildClassA> .\n')
+
+    script = '\n'.join([
+        'import json, schema_pb2, schema_jsonld',
+        'a = schema_pb2.ChildClassA()',
+        'a.delta.extend(["x", "y"])',
+        'a.epsilon.add().delta.append("z")',
+        'print(json.dumps(schema_jsonld.serialize(a)))'])
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = os.path.join(out_dir, '')
+        with open(out_dir + 'schema.nt', 'w') as f:
+            f.write(src)
+
+        gen = schema_generator.SchemaGenerator(out_dir + 'schema.nt')
+        gen.write_proto(out_dir, 'schemaorg', flatten=True, compiled_formats=[
+                        'python', 'jsonld_serializer'])
+
+        out = json.loads(subprocess.run(
+            [sys.executable, '-c', script], cwd=out_dir, check=True,
+            stdout=subprocess.PIPE).stdout)
+
+    assert out == {'@type': 'ChildClassA', 'delta': ['x', 'y'], 'epsilon': {
+        '@type': 'ChildClassA', 'delta': 'z'}}, 'Error in flattened JSON-LD serializers.'
@@ -0,0 +1,128 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import pytest
+import rdflib
+import core.ntriples_reader as ntriples_reader
+import core.schema_index as schema_index
+
+
+def test_read_triples():
+    """Test the N-Triples reader against rdflib.
+
+    Procedure:
+        - Read the test graph using the N-Triples reader.
+        - Parse the test graph using rdflib.
+        - Build a schema index from both.
+
+    Verification:
+        - Check if both readers produce the same set of triples.
+        - Check if both schema indexes are equal.
+    """
+
+    triples = set(ntriples_reader.read_triples(
+        './tests/files/test_graph.nt', None))
+
+    graph = rdflib.Graph()
+    graph.parse('./tests/files/test_graph.nt', format='nt')
+    expected = set((str(s), str(p), str(o)) for s, p, o in graph)
+
+    assert triples == expected, 'Test triples.'
+
+    index = schema_index.SchemaIndex(
+        ntriples_reader.read_triples('./tests/files/test_graph.nt'))
+    expected_index = schema_index.SchemaIndex(graph)
+
+    for x in ['domain', 'range', 'comments', 'enum_members']:
+        assert getattr(index, x) == getattr(
+            expected_index, x), 'Test index ' + x + '.'
+
+    # Order of the parents depends on the order in which rdflib returns
+    # the triples.
+    assert {k: set(v) for k, v in index.parents.items()} == {
+        k: set(v) for k, v in expected_index.parents.items()}, 'Test index parents.'
+    assert set(index.classes) == set(expected_index.classes), 'Test classes.'
+    assert set(index.properties) == set(
+        expected_index.properties), 'Test properties.'
+
+
+def test_parse_line():
+    """Test parsing of individual N-Triples lines.
+
+    Procedure:
+        - Create lines containing the following:
+            * Empty line and comment.
+            * Literal with escape sequences, language tag and datatype.
+            * Blank nodes.
+            * A predicate which is not of interest.
+        - Parse every line using the N-Triples reader and rdflib.
+
+    Verification:
+        - Check if empty lines and comments are skipped.
+        - Check if the parsed triples are equal to those parsed by rdflib.
+        - Check if triples with other predicates are skipped.
+    """
+
+    comment = b'<http://www.w3.org/2000/01/rdf-schema#comment>'
+    lines = [
+        b'<http://schema.org/a> ' + comment +
+        b' "Tab\\there \\"quoted\\" \\u00e9\\U0001F600 back\\\\slash." .',
+        b'<http://schema.org/b> ' + comment + b' "Text"@en .',
+        b'<http://schema.org/c> ' + comment +
+        b' "1"^^<http://www.w3.org/2001/XMLSchema#integer> .',
+        b'_:b0 <http://schema.org/rangeIncludes> _:b1 .',
+        '<http://schema.org/d> {} "Unicode é" .'.format(
+            comment.decode()).encode('utf-8'),
+    ]
+
+    assert ntriples_reader.parse_line(b'\n') is None, 'Test empty line.'
+    assert ntriples_reader.parse_line(b'# comment\n') is None, 'Test comment.'
+
+    for line in lines:
+        graph = rdflib.Graph()
+        graph.parse(data=line.decode('utf-8'), format='nt')
+        s, p, o = next(iter(graph))
+
+        if isinstance(s, rdflib.BNode):
+            assert ntriples_reader.parse_line(line)[1:] == (
+                str(p), '_:b1'), 'Test blank nodes.'
+        else:
+            assert ntriples_reader.parse_line(line) == (
+                str(s), str(p), str(o)), 'Test ' + repr(line) + '.'
+
+    other = b'<http://schema.org/a> <http://schema.org/sameAs> <http://schema.org/b> .'
+    assert ntriples_reader.parse_line(other) is None, 'Test other predicate.'
+    assert list(ntriples_reader.iter_triples(io.BytesIO(other), None)) == [
+        ('http://schema.org/a', 'http://schema.org/sameAs', 'http://schema.org/b')], 'Test all predicates.'
+
+
+def test_parse_line_separators():
+    """Test parsing of N-Triples lines separated by tabs and malformed lines.
+
+    Procedure:
+        - Parse a line with a blank node subject followed by a tab.
+        - Parse lines without a predicate, object or final period.
+
+    Verification:
+        - Check if the blank node ends at the tab.
+        - Check if every malformed line raises the invalid line error.
+    """
+
+    assert ntriples_reader.parse_line(b'_:b1\t<p>\t"v" .', None) == (
+        '_:b1', 'p', 'v'), 'Test tab after a blank node.'
+
+    for line in [b'_:b1', b'_:b1 <p', b'<s> <p> "v"', b'<s> <p> .',
+                 b'<s> <p> "v .', b'<s']:
+        with pytest.raises(ValueError, match='Invalid N-Triples line'):
+            ntriples_reader.parse_line(line, None)
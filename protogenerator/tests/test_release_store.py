@@ -0,0 +1,209 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import http.server
+import json
+import os
+import tempfile
+import threading
+import core.release_store as release_store
+import core.schema_generator as schema_generator
+
+CONTENT = open('./tests/files/test_graph.nt', 'rb').read()
+ETAG = '"v1"'
+
+
+class ReleaseHandler(http.server.BaseHTTPRequestHandler):
+    """Serve CONTENT as every release with support for conditional and
+    range requests, and record the requests."""
+
+    requests = []
+
+    def do_GET(self):
+        ReleaseHandler.requests.append(dict(self.headers))
+
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        if self.headers.get('Range') and self.headers.get('If-Range') == ETAG:
+            start = int(self.headers['Range'][len('bytes='):-1])
+            self.send_response(206)
+        else:
+            self.send_response(200)
+
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(CONTENT) - start))
+        self.end_headers()
+        self.wfile.write(CONTENT[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = http.server.HTTPServer(('127.0.0.1', 0), ReleaseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_release_store():
+    """Test downloading and revalidating releases.
+
+    Procedure:
+        - Start a local HTTP server that serves the test graph.
+        - Fetch a release twice.
+        - Damage the cached release and fetch it again.
+        - Fetch the release from an offline store.
+
+    Verification:
+        - Check if the first fetch downloads the release.
+        - Check if the second fetch is a conditional request that does not
+          download the release again.
+        - Check if a damaged release is downloaded again.
+        - Check if the offline store uses the cache and fails for releases
+          that are not cached.
+    """
+
+    server = start_server()
+    url = 'http://127.0.0.1:{}/{{}}/schema.nt'.format(server.server_port)
+    ReleaseHandler.requests = []
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            store = release_store.ReleaseStore(cache_dir, url)
+
+            path = store.fetch('8.0')
+            assert open(path, 'rb').read() == CONTENT, 'Test download.'
+            assert not os.path.exists(path + '.part'), 'Test atomic rename.'
+
+            store.fetch('8.0')
+            assert len(ReleaseHandler.requests) == 2, 'Test request count.'
+            assert ReleaseHandler.requests[1].get(
+                'If-None-Match') == ETAG, 'Test conditional request.'
+
+            with open(path, 'wb') as f:
+                f.write(b'damaged')
+
+            store.fetch('8.0')
+            assert open(path, 'rb').read() == CONTENT, 'Test damaged release.'
+            assert 'If-None-Match' not in ReleaseHandler.requests[2], \
+                'Test unconditional request for damaged release.'
+
+            offline = release_store.ReleaseStore(cache_dir, url, offline=True)
+            assert offline.fetch('8.0') == path, 'Test offline store.'
+            assert len(ReleaseHandler.requests) == 3, 'Test offline requests.'
+
+            try:
+                offline.fetch('9.0')
+            except FileNotFoundError:
+                pass
+            else:
+                assert False, 'Test offline store without release.'
+    finally:
+        server.shutdown()
+
+
+def test_release_store_resume():
+    """Test resuming a partial download.
+
+    Procedure:
+        - Start a local HTTP server that serves the test graph.
+        - Create a partial download of half of the release.
+        - Fetch the release.
+        - Fetch another release with a wrong checksum.
+
+    Verification:
+        - Check if only the rest of the release is requested.
+        - Check if the completed release is equal to the served file.
+        - Check if a checksum mismatch raises ValueError and the release is
+          not kept.
+    """
+
+    server = start_server()
+    url = 'http://127.0.0.1:{}/{{}}/schema.nt'.format(server.server_port)
+    ReleaseHandler.requests = []
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            store = release_store.ReleaseStore(cache_dir, url)
+            path = store.get_path('8.0')
+
+            half = len(CONTENT) // 2
+            with open(path + '.part', 'wb') as f:
+                f.write(CONTENT[:half])
+            with open(path + '.part.json', 'w') as f:
+                json.dump({'etag': ETAG}, f)
+
+            store.fetch('8.0')
+            assert ReleaseHandler.requests[0].get('Range') == 'bytes={}-'.format(
+                half), 'Test range request.'
+            assert open(path, 'rb').read() == CONTENT, 'Test resumed download.'
+
+            try:
+                store.fetch('9.0', sha256='0' * 64)
+            except ValueError:
+                pass
+            else:
+                assert False, 'Test checksum mismatch.'
+
+            assert not os.path.exists(
+                store.get_path('9.0')), 'Test release with wrong checksum.'
+    finally:
+        server.shutdown()
+
+
+def test_release_store_stream():
+    """Test parsing a release while it is downloaded.
+
+    Procedure:
+        - Start a local HTTP server that serves the test graph.
+        - Parse the release from the stream of the store, once without
+          writing it to the cache and once writing it to the cache.
+        - Open the release again.
+
+    Verification:
+        - Check if the parsed schema is equal to the schema parsed from file.
+        - Check if the release is only cached when tee is True.
+        - Check if the cached release is read from disk.
+    """
+
+    server = start_server()
+    url = 'http://127.0.0.1:{}/{{}}/schema.nt'.format(server.server_port)
+    expected = schema_generator.SchemaGenerator(
+        './tests/files/test_graph.nt').index.to_snapshot()
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            store = release_store.ReleaseStore(cache_dir, url)
+            path = store.get_path('8.0')
+
+            with store.open('8.0', tee=False) as f:
+                assert f.path is None, 'Test stream of download.'
+                index = schema_generator.SchemaGenerator(f).index
+
+            assert index.to_snapshot() == expected, 'Test parsed stream.'
+            assert not os.path.exists(path), 'Test stream without tee.'
+
+            with store.open('8.0') as f:
+                index = schema_generator.SchemaGenerator(f).index
+
+            assert index.to_snapshot() == expected, 'Test parsed stream.'
+            assert open(path, 'rb').read() == CONTENT, 'Test stream with tee.'
+
+            with store.open('8.0') as f:
+                assert f.path == path, 'Test stream of cached release.'
+    finally:
+        server.shutdown()
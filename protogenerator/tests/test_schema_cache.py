@@ -0,0 +1,100 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+import core.schema_cache as schema_cache
+import core.schema_generator as schema_generator
+
+
+def test_schema_cache():
+    """Test the schema cache.
+
+    Procedure:
+        - Create a cache in a temporary directory.
+        - Create a schema generator for the test graph twice using the cache.
+
+    Verification:
+        - Check if the first lookup is a miss and the second one is a hit.
+        - Check if the cached index is equal to the parsed index.
+        - Check if a corrupted or outdated entry is treated as a miss and
+          removed.
+    """
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = schema_cache.SchemaCache(cache_dir)
+
+        gen1 = schema_generator.SchemaGenerator(
+            './tests/files/test_graph.nt', cache)
+        assert (cache.hits, cache.misses) == (0, 1), 'Test cache miss.'
+
+        gen2 = schema_generator.SchemaGenerator(
+            './tests/files/test_graph.nt', cache)
+        assert (cache.hits, cache.misses) == (1, 1), 'Test cache hit.'
+
+        assert gen1.index.to_snapshot() == gen2.index.to_snapshot(), \
+            'Test cached index.'
+
+        key = cache.get_key('./tests/files/test_graph.nt')
+        with open(os.path.join(cache_dir, key + '.pickle'), 'wb') as f:
+            f.write(b'corrupted')
+
+        assert cache.load(key) is None, 'Test corrupted entry.'
+        assert cache.misses == 2, 'Test corrupted entry is a miss.'
+
+        # Entries that refer to missing modules or attributes.
+        for i, data in enumerate([b'cmissing_module\nX\n.',
+                                  b'cos\nmissing_attribute\n.']):
+            with open(os.path.join(cache_dir, key + '.pickle'), 'wb') as f:
+                f.write(data)
+
+            assert cache.load(key) is None, 'Test outdated entry.'
+            assert cache.misses == 3 + i, 'Test outdated entry is a miss.'
+            assert not os.path.exists(os.path.join(
+                cache_dir, key + '.pickle')), 'Test outdated entry is removed.'
+
+
+def test_schema_cache_eviction():
+    """Test the eviction of the schema cache.
+
+    Procedure:
+        - Create a cache in a temporary directory.
+        - Store an entry, then use it so that it is the most recently used.
+        - Store two more entries and shrink the cache so that only two
+          entries fit.
+
+    Verification:
+        - Check if the least recently used entry is evicted.
+        - Check if recently used entries are kept.
+    """
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = schema_cache.SchemaCache(cache_dir)
+        index = schema_generator.SchemaGenerator(
+            './tests/files/test_graph.nt').index
+
+        for i, key in enumerate(['a', 'b', 'c']):
+            cache.store(key, index)
+            path = os.path.join(cache_dir, key + '.pickle')
+            os.utime(path, (i, i))
+
+        entry_size = os.path.getsize(os.path.join(cache_dir, 'a.pickle'))
+
+        # Use 'a' so that 'b' becomes the least recently used entry.
+        assert cache.load('a') is not None, 'Test cache hit.'
+
+        cache.max_size = 2 * entry_size
+        cache.evict()
+
+        assert sorted(os.listdir(cache_dir)) == [
+            'a.pickle', 'c.pickle'], 'Test LRU eviction.'
@@ -0,0 +1,67 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import rdflib
+import core.schema_index as schema_index
+
+
+def test_schema_index():
+    """Test the schema index.
+
+    Procedure:
+        - Parse the test graph using rdflib.
+        - Build a schema index from the triples of the graph.
+
+    Verification:
+        - Check if all classes and properties are indexed.
+        - Check if subclass, domain and range edges are indexed.
+        - Check if comments can be looked up by name.
+        - Check if enumeration values are indexed by the name of their type.
+        - Check if children of a class are computed from subclass edges,
+          also in an index rebuilt from a snapshot.
+    """
+
+    graph = rdflib.Graph()
+    graph.parse('./tests/files/test_graph.nt', format='nt')
+    index = schema_index.SchemaIndex(graph)
+
+    url = 'http://schema.org/'
+
+    assert set(index.classes) == {url + 'RootClass', url + 'ChildClassA',
+                                  url + 'ChildClassB', url + 'ChildClassC',
+                                  url + 'Enumeration'}, 'Test classes.'
+    assert set(index.properties) == {
+        url + 'alpha', url + 'beta', url + 'gamma'}, 'Test properties.'
+
+    assert index.parents[url + 'ChildClassB'] in (
+        [url + 'RootClass', url + 'Enumeration'],
+        [url + 'Enumeration', url + 'RootClass']), 'Test subclass edges.'
+    assert index.domain[url + 'ChildClassA'] == {url + 'beta'}, 'Test domain.'
+    assert index.range[url + 'gamma'] == {
+        url + 'ChildClassA', url + 'Float'}, 'Test range.'
+
+    assert index.get_comment(
+        'alpha') == 'Comment for alpha.\nSecond Line of Comment.', 'Test comment.'
+    assert index.get_comment('beta') == '', 'Test missing comment.'
+
+    assert index.get_enum_members('ChildClassB') == {
+        url + 'EnumValueOne', url + 'EnumValueTwo'}, 'Test enumeration values.'
+    assert index.get_children(url + 'Enumeration') == [
+        url + 'ChildClassB'], 'Test children.'
+    assert sorted(index.get_children(url + 'RootClass')) == [
+        url + 'ChildClassA', url + 'ChildClassB'], 'Test children.'
+    assert index.get_children(url + 'ChildClassC') == [], 'Test no children.'
+    snapshot = schema_index.SchemaIndex.from_snapshot(index.to_snapshot())
+    assert {x: sorted(c) for x, c in snapshot.children.items()} == {
+        x: sorted(c) for x, c in index.children.items()}, 'Test children of snapshot.'
+    assert url + 'Number' in index.get_range_classes(), 'Test range classes.'
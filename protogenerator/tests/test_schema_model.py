@@ -0,0 +1,126 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import core.schema_generator as schema_generator
+import core.schema_model as schema_model
+import filecmp
+import os
+import pickle
+import tempfile
+
+
+def test_schema_model():
+    """Test the model of the test graph.
+
+    Procedure:
+        - Build the model of the test graph.
+        - Look up classes, properties, enumerations and comments.
+
+    Verification:
+        - Check if the model is built once per generator.
+        - Check if inherited properties and the expanded range of properties
+          are returned.
+        - Check if the enumeration, its members and the comments are
+          returned.
+        - Check if the model cannot be modified.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+    model = gen.get_model()
+
+    assert gen.get_model() is model, 'Test model is built once.'
+    assert model.get_classes() == [
+        'ChildClassA', 'ChildClassC', 'Enumeration', 'RootClass'], 'Test classes.'
+    assert sorted(p.name for p in model.get_properties('ChildClassC')) == [
+        'alpha', 'beta', 'gamma'], 'Test inherited properties.'
+    assert model.get_range('beta') == {
+        'ChildClassB', 'ChildClassC', 'Text', 'URL'}, 'Test range.'
+    assert model.is_enumeration(
+        'ChildClassB') and not model.is_enumeration('RootClass'), 'Test enumerations.'
+    assert model.get_enum_members('ChildClassB') == (
+        'http://schema.org/EnumValueOne', 'http://schema.org/EnumValueTwo'), 'Test enum members.'
+    assert model.get_enum_values('ChildClassB') == [
+        'EnumValueOne', 'EnumValueTwo'], 'Test enum values.'
+    assert model.get_comment('RootClass') == 'Comment for RootClass.\nSecond Line of Comment.', 'Test comment.'
+    assert model.get_comment('beta') == '', 'Test missing comment.'
+    assert 'Boolean' in model.primitives, 'Test primitives.'
+
+    for fn in [lambda: setattr(model, 'enumerations', frozenset()),
+               lambda: delattr(model, 'comments'),
+               lambda: setattr(model, 'other', None)]:
+        try:
+            fn()
+        except AttributeError:
+            continue
+        assert False, 'Test model is immutable.'
+
+
+def test_schema_model_pickle():
+    """Test writing the proto code from a pickled model.
+
+    Procedure:
+        - Pickle and unpickle the model of the test graph.
+        - Write the proto code and descriptors from the generator and from
+          a generator created from the unpickled model.
+
+    Verification:
+        - Check if the unpickled model has the same contents.
+        - Check if the written files are identical.
+    """
+
+    gen = schema_generator.SchemaGenerator('./tests/files/test_graph.nt')
+    model = gen.get_model()
+    copy = pickle.loads(pickle.dumps(model))
+
+    assert isinstance(copy, schema_model.SchemaModel), 'Test type.'
+    for x in schema_model.SchemaModel.__slots__:
+        assert getattr(copy, x) == getattr(model, x), 'Test ' + x + '.'
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        dst_a = os.path.join(out_dir, 'a', '')
+        dst_b = os.path.join(out_dir, 'b', '')
+        os.mkdir(dst_a)
+        os.mkdir(dst_b)
+
+        gen.write_proto(dst_a, 'schemaorg')
+        schema_generator.SchemaGenerator.from_model(
+            copy).write_proto(dst_b, 'schemaorg')
+
+        for x in ['schema.proto', 'schema_descriptor.json',
+                  'schema_descriptor.bin']:
+            assert filecmp.cmp(dst_a + x, dst_b + x,
+                               shallow=False), 'Test ' + x + '.'
+
+
+def test_schema_model_prune():
+    """Test pruning the model.
+
+    Procedure:
+        - Prune the model of the test graph to the classes reachable from
+          ChildClassA without following properties.
+
+    Verification:
+        - Check if only ChildClassA and the properties of it are kept.
+        - Check if the original model is unchanged.
+    """
+
+    model = schema_generator.SchemaGenerator(
+        './tests/files/test_graph.nt').get_model()
+    sub = model.prune(['ChildClassA'], max_depth=0)
+
+    assert sub.get_classes() == ['ChildClassA'], 'Test pruned classes.'
+    assert sorted(sub.prop_to_class) == ['alpha', 'beta'], 'Test pruned properties.'
+    assert len(sub.enumerations) == 0, 'Test pruned enumerations.'
+    assert sub.primitives == model.primitives, 'Test primitives.'
+    assert model.get_classes() == [
+        'ChildClassA', 'ChildClassC', 'Enumeration', 'RootClass'], 'Test model is unchanged.'
@@ -0,0 +1,50 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+import core.template_registry as template_registry
+
+
+def test_template_registry():
+    """Test the template registry.
+
+    Procedure:
+        - Configure the registry with a bytecode cache in a temporary
+          directory.
+        - Change the working directory and get a template twice.
+        - Render the template.
+
+    Verification:
+        - Check if templates are resolved relative to the package.
+        - Check if the same compiled template is returned every time.
+        - Check if the compiled template is written to the bytecode cache.
+    """
+
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        try:
+            template_registry.configure(cache_dir)
+            os.chdir(cache_dir)
+
+            t1 = template_registry.get_template('header.txt')
+            t2 = template_registry.get_template('header.txt')
+
+            assert t1 is t2, 'Test compiled template is reused.'
+            assert 'package foo;' in t1.render(
+                package_name='foo'), 'Test template render.'
+            assert len(os.listdir(cache_dir)) == 1, 'Test bytecode cache.'
+        finally:
+            os.chdir(cwd)
+            template_registry.configure()
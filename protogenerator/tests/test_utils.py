@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import utils.utils as utils
+import pickle
+import random
 import rdflib
+from bs4 import BeautifulSoup
 
 
 def test_to_snake_case():
@@ -215,6 +218,36 @@ def test_get_class_type():
         ip9, class_list) == op9, 'Test if Boolean is mapped to bool.'
 
 
+def test_get_flat_type():
+    """Test utils.get_flat_type function.
+
+    Procedure:
+        - Create a list of defined classes.
+        - Call utils.get_flat_type for ranges that map to a single proto type
+          and for polymorphic ranges.
+
+    Verification:
+        - Check if a primitive stands for a range that maps to one primitive.
+        - Check if a single defined class stands for itself.
+        - Check if None is returned for polymorphic and empty ranges.
+    """
+
+    class_list = {'RandomClass', 'OtherClass'}
+
+    assert utils.get_flat_type(
+        ['URL', 'Text'], class_list) == 'Text', 'Test if Text stands for Text and URL.'
+    assert utils.get_flat_type(
+        ['randomclass', 'URL'], class_list) == 'URL', 'Test if undefined classes map to string.'
+    assert utils.get_flat_type(
+        ['RandomClass'], class_list) == 'RandomClass', 'Test a single defined class.'
+    assert utils.get_flat_type(
+        ['Number', 'Integer'], class_list) is None, 'Test double and int64.'
+    assert utils.get_flat_type(
+        ['RandomClass', 'OtherClass'], class_list) is None, 'Test two defined classes.'
+    assert utils.get_flat_type(
+        [], class_list) is None, 'Test an empty range.'
+
+
 def test_add_url():
     """Test utils.add_url function.
 
@@ -246,10 +279,15 @@ def test_topological_sort():
           node.
         - Create an expected output of topological ordering.
         - Call utils.toplogical_sort for the graph.
+        - Create a chain of 10000 nodes and call utils.toplogical_sort for it.
+        - Create a graph with a cycle and call utils.toplogical_sort and
+          utils.get_children for it.
 
     Verification:
         - Check if all the output generated by the function is the same order 
           are expected output.
+        - Check if deep graphs are sorted without hitting the recursion limit.
+        - Check if the nodes on and below the cycle follow the other nodes.
     """
 
     graph = dict()
@@ -263,10 +301,24 @@ def test_topological_sort():
     graph[5].add(0)
     graph[5].add(2)
 
-    answer = [5, 4, 2, 3, 1, 0]
+    answer = [4, 5, 0, 2, 3, 1]
 
     assert utils.topological_sort(graph) == answer, 'Test toplogical_sort.'
 
+    # A deep hierarchy must not hit the recursion limit.
+    chain = dict()
+    for i in range(10000):
+        chain[i] = {i + 1} if i + 1 < 10000 else set()
+
+    assert utils.topological_sort(chain) == list(
+        range(10000)), 'Test toplogical_sort of a deep graph.'
+
+    cycle = {0: {1}, 1: {2}, 2: {1, 3}, 3: set(), 4: {0}}
+    assert utils.topological_sort(cycle) == [
+        4, 0, 1, 2, 3], 'Test toplogical_sort of a graph with a cycle.'
+    assert set(utils.get_children(cycle)[4]) == {
+        0, 1, 2, 3}, 'Test get_children of a graph with a cycle.'
+
 
 def test_get_children():
     """Test utils.get_childern function.
@@ -310,3 +362,158 @@ def test_get_children():
             answer[0].add(2 * i + 2)
 
     assert utils.get_children(graph) == answer, 'Test get_children.'
+
+
+def test_get_components():
+    """Test utils.get_components function.
+
+    Procedure:
+        - Create a graph with a cycle, a self loop and a node that is only
+          reachable from the cycle.
+        - Create a chain that is too deep for a recursive search.
+
+    Verification:
+        - Check if every cycle is one component and the components are
+          returned after the components they have edges to.
+        - Check if the deep chain does not hit the recursion limit.
+    """
+
+    graph = {'a': ['b'], 'b': ['c', 'a'], 'c': [], 'd': ['a', 'd']}
+
+    assert utils.get_components(graph) == [
+        ['c'], ['a', 'b'], ['d']], 'Test get_components.'
+
+    chain = {i: [i + 1] if i + 1 < 10000 else [] for i in range(10000)}
+
+    assert utils.get_components(chain) == [
+        [i] for i in reversed(range(10000))], 'Test get_components of a deep graph.'
+
+
+def test_inherited_properties():
+    """Test utils.InheritedProperties class.
+
+    Procedure:
+        - Create a hierarchy where Thing is the root, Movie and Series are
+          children of Thing and TVSeries is a child of both Movie and Series.
+        - Declare a property on Thing, a property on each of Movie and Series
+          and a property on Thing that is redeclared by Series.
+        - Create the mapping from the declared properties and the parents.
+
+    Verification:
+        - Check if every class has its own and all inherited properties.
+        - Check if a property declared by an earlier parent takes precedence.
+        - Check if the mapping behaves like a dict of the classes.
+        - Check if the view of a class is built once and survives pickling.
+    """
+
+    own = {
+        'Thing': frozenset([utils.PropertyToParent('name', 'Thing'),
+                            utils.PropertyToParent('url', 'Thing')]),
+        'Movie': frozenset([utils.PropertyToParent('director', 'Movie')]),
+        'Series': frozenset([utils.PropertyToParent('episode', 'Series'),
+                             utils.PropertyToParent('url', 'Series')]),
+        'TVSeries': frozenset()
+    }
+
+    parents = {
+        'Thing': (),
+        'Movie': ('Thing',),
+        'Series': ('Thing',),
+        'TVSeries': ('Movie', 'Series')
+    }
+
+    class_to_prop = utils.InheritedProperties(own, parents)
+
+    def as_tuples(props):
+        return sorted((p.name, p.parent) for p in props)
+
+    assert as_tuples(class_to_prop['Thing']) == [
+        ('name', 'Thing'), ('url', 'Thing')], 'Test root class.'
+    assert as_tuples(class_to_prop['Series']) == [
+        ('episode', 'Series'), ('name', 'Thing'), ('url', 'Series')], 'Test own property takes precedence.'
+    assert as_tuples(class_to_prop['TVSeries']) == [
+        ('director', 'Movie'), ('episode', 'Series'), ('name', 'Thing'),
+        ('url', 'Thing')], 'Test earlier parent takes precedence.'
+
+    assert sorted(class_to_prop) == sorted(own.keys()), 'Test keys.'
+    assert 'Movie' in class_to_prop, 'Test contains.'
+    assert len(class_to_prop) == 4, 'Test length.'
+    assert class_to_prop['TVSeries'] is class_to_prop['TVSeries'], 'Test view is built once.'
+
+    copy = pickle.loads(pickle.dumps(class_to_prop))
+    assert copy['TVSeries'] == class_to_prop['TVSeries'], 'Test pickled view.'
+
+
+def test_get_comment_text():
+    """Test utils.get_comment_text function.
+
+    Procedure:
+        - Create comments with the markup used by schema.org: links, line
+          breaks, emphasis, lists and character references.
+        - Create comments which are handled differently by html.parser:
+          stray angle brackets, unknown tags, html comments, unquoted
+          attributes, malformed character references and texts between
+          tags that only have whitespace.
+
+    Verification:
+        - Check if the text of every comment is the same as the text
+          returned by BeautifulSoup.
+    """
+
+    comments = [
+        'The most generic type of item.',
+        'A <a class="localLink" href="http://schema.org/CreativeWork">CreativeWork</a> such as a book.',
+        'First line.<br/>\nSecond line.<br />Third line.<br>',
+        'Use <em>only</em> for <code>ISO 8601</code> values, e.g. <strong>2020-01-01</strong>.',
+        '<p>Values:</p>\n<ul>\n<li>one</li>\n<li>two</li>\n</ul>',
+        '<A HREF=\'http://schema.org/Thing\'>Thing</A>',
+        'Terms &amp; conditions, &quot;quoted&quot; and &lt;b&gt; as text.',
+        'Non&nbsp;breaking, &#39;single&#x27; and &#65;&#x42;.',
+        '<code>&lt;meta&gt;</code> tags &amp; <a href="x">links</a>',
+        'a < b and c > d',
+        'x<y',
+        'AT&T and &amp without semicolon.',
+        '&copy; &#0; &#128; &#55296; &#x110000;',
+        '<script>if (a < b) {}</script>text',
+        '<!-- note -->visible',
+        '<a href=unquoted>link</a>',
+        '<table><tr><td>cell</td></tr></table>',
+        'Text<br/>\n\n',
+        '<b>x</b>  \n\n',
+        '<ul>\n  <li>one</li>\n  <li>two</li>\n</ul>',
+        'a<br/>\r<br/>\t \x0c<br/>&#32;<br/>&nbsp;',
+        '<pre>  \n  </pre>',
+        ' \r\n ',
+        '\t',
+        ''
+    ]
+
+    for comment in comments:
+        assert utils.get_comment_text(comment) == BeautifulSoup(
+            comment, 'html.parser').get_text(), 'Test comment {}.'.format(repr(comment))
+
+
+def test_get_comment_text_random():
+    """Test utils.get_comment_text function on random markup.
+
+    Procedure:
+        - Create comments from random sequences of tags, whitespace, text
+          and character references with a fixed seed.
+
+    Verification:
+        - Check if the text of every comment is the same as the text
+          returned by BeautifulSoup.
+    """
+
+    parts = ['<br/>', '<br>', '<b>', '</b>', '<a href="x">', '</a>', '<li>',
+             '</li>', '<ul>', '</ul>', '<em>', '</em>', '<pre>', '</pre>',
+             '<p>', '</p>', '<!-- c -->', '<', '>', ' ', '  ', '\n', '\t',
+             '\r', '\r\n', '\x0c', '\xa0', 'x', 'y z', '&amp;', '&#32;',
+             '&#9;', '&nbsp;', '&lt;', '&#x27;', '&copy;', '&']
+    rng = random.Random(0)
+
+    for _ in range(5000):
+        comment = ''.join(rng.choice(parts)
+                          for _ in range(rng.randint(0, 8)))
+        assert utils.get_comment_text.__wrapped__(comment) == BeautifulSoup(
+            comment, 'html.parser').get_text(), 'Test comment {}.'.format(repr(comment))
@@ -0,0 +1,54 @@
+# Copyright 2020 Google LLC
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     https://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+import json
+import core.field_numbers as field_numbers
+
+parser = argparse.ArgumentParser()
+
+parser.add_argument('documents',
+                    type=str,
+                    nargs='+',
+                    help='Paths to JSON-LD documents')
+
+parser.add_argument('-o',
+                    '--OUT',
+                    type=str,
+                    help='Path to the usage profile', required=True)
+
+
+def main():
+    args = parser.parse_args()
+
+    profile = dict()
+    for x in args.documents:
+        with open(x, 'r') as f:
+            field_numbers.collect_profile([json.load(f)], profile)
+
+    with open(args.OUT, 'w') as f:
+        json.dump(profile, f, indent=4, sort_keys=True)
+
+    print('Profiled {} type(s).'.format(len(profile)))
+
+
+if __name__ == '__main__':
+    """Collects the number of times every property of every type is used in
+    JSON-LD documents, to be used with the --usage-profile option of main.py.
+
+    Args:
+        -h, --help  Show this help message and exit
+        documents   Paths to JSON-LD documents
+        -o, --OUT   Path to the usage profile
+    """
+    main()
@@ -13,6 +13,10 @@
 # limitations under the License.
 import rdflib
 
+generator_version = '0.1.0'
+
+schema_url_prefix = 'http://schema.org/'
+
 proto_primitives = {
     'double',
     'float',
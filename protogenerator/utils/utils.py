@@ -11,10 +11,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
+import collections.abc
+import functools
+import hashlib
+import os
 import re
 import utils.constants as constants
 import rdflib
-from typing import Any, Dict, Set
+from bs4 import BeautifulSoup
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
 
 
 def to_snake_case(x: str) -> str:
@@ -85,6 +91,257 @@ def get_class_type(x: str, class_list: Set[str]) -> str:
     return class_type
 
 
+def get_flat_type(field_types: Iterable[str],
+                  class_list: Set[str]) -> Optional[str]:
+    """Return the type a property is written as when it is flattened. A
+    property can be flattened if every class/datatype in its range maps to
+    the same type in proto.
+
+    Args:
+        field_types (iterable[str]): The schema classes/datatypes that are
+                                     included in range of the property.
+        class_list (Set[str]): All defined classes in schema.
+
+    Returns:
+        str: The schema class/datatype that stands for the whole range, a
+             primitive if there is one, None if the property is polymorphic.
+    """
+
+    field_types = sorted(field_types)
+    if not field_types or len(
+            {get_class_type(x, class_list) for x in field_types}) > 1:
+        return None
+
+    for x in field_types:
+        if x in constants.schema_primitives:
+            return x
+
+    return field_types[0]
+
+
+# Field numbers reserved for the implementation of protocol buffers.
+_RESERVED_FIELD_NUMBERS = range(19000, 20000)
+
+
+def get_field_numbers(fields: List[str],
+                      pinned: Optional[Mapping[str, int]] = None,
+                      start: int = 1,
+                      reserved: Iterable[int] = ()) -> Dict[str, int]:
+    """Return the field number of every field of a message. Pinned fields
+    keep their number, the other fields are numbered in order with the
+    numbers that are neither pinned nor reserved, skipping the range
+    reserved by protocol buffers.
+
+    Args:
+        fields (list[str]): Names of the fields in the order they are
+                            written.
+        pinned (dict[str, int]): Field numbers that are fixed, for example
+                                 by a lock file.
+        start (int): The first field number.
+        reserved (iterable[int]): Field numbers that must not be used, for
+                                  example those of removed fields.
+
+    Returns:
+        dict[str, int]: Mapping from field name to field number.
+    """
+
+    pinned = pinned or dict()
+    used = set(pinned.values()) | set(reserved)
+    numbers = dict()
+    n = start
+
+    for x in fields:
+        if x in pinned:
+            numbers[x] = pinned[x]
+            continue
+
+        while n in used or n in _RESERVED_FIELD_NUMBERS:
+            n += 1
+
+        numbers[x] = n
+        n += 1
+
+    return numbers
+
+
+def group_properties(name: str,
+                     field_types: Iterable['PropertyToParent']) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Return the properties of a class in the order they are written, its
+    own properties first and then the inherited properties grouped by the
+    class that declares them.
+
+    Args:
+        name (str): Name of the class.
+        field_types (iterable[PropertyToParent]): The properties of the class.
+
+    Returns:
+        list[str]: Sorted names of the properties declared by the class.
+        dict[str, list[str]]: Ordered mapping from parent class to the sorted
+                              names of the properties inherited from it.
+    """
+
+    prop_from_self = list()
+    prop_inherited = dict()
+
+    for x in field_types:
+        if x.parent == name:
+            prop_from_self.append(x.name)
+        else:
+            if x.parent not in prop_inherited:
+                prop_inherited[x.parent] = list()
+
+            prop_inherited[x.parent].append(x.name)
+
+    prop_from_self = sorted(prop_from_self)
+    prop_inherited = collections.OrderedDict(
+        (k, sorted(v)) for k, v in sorted(prop_inherited.items()))
+
+    return prop_from_self, prop_inherited
+
+
+# Tags used in schema.org comments. Their content is kept and the tags are
+# dropped, as done by BeautifulSoup.get_text().
+_COMMENT_TAGS = frozenset(['a', 'b', 'br', 'code', 'dd', 'div', 'dl', 'dt',
+                           'em', 'i', 'li', 'ol', 'p', 'pre', 'span',
+                           'strong', 'sub', 'sup', 'ul'])
+
+_COMMENT_TAG_RE = re.compile(
+    r'<(/?)([a-zA-Z][a-zA-Z0-9]*)'
+    r'((?:\s+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'))?)*)'
+    r'\s*/?>')
+
+_COMMENT_ENTITY_RE = re.compile(r'&(amp|lt|gt|quot|nbsp|#[0-9]{2,3}|#x[0-9a-fA-F]{2});')
+
+# Whitespace of html as defined by BeautifulSoup.
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+_COMMENT_ENTITIES = {
+    'amp': '&',
+    'lt': '<',
+    'gt': '>',
+    'quot': '"',
+    'nbsp': '\xa0'
+}
+
+
+def _replace_comment_entity(m: re.Match) -> Optional[str]:
+    """Return the character of a character reference in a comment.
+
+    Args:
+        m (re.Match): Match of _COMMENT_ENTITY_RE.
+
+    Returns:
+        str: The character, None if it is not a printable ASCII character.
+    """
+
+    name = m.group(1)
+
+    if name in _COMMENT_ENTITIES:
+        return _COMMENT_ENTITIES[name]
+    elif name[1] == 'x':
+        code = int(name[2:], 16)
+    else:
+        code = int(name[1:])
+
+    return chr(code) if 32 <= code < 127 else None
+
+
+@functools.lru_cache(maxsize=8192)
+def get_comment_text(comment: str) -> str:
+    """Return the text of a comment after removing the html markup. The
+    limited markup used by schema.org is removed by a tokenizer, comments
+    with any other markup, <pre>, entities or stray angle brackets are
+    passed to BeautifulSoup.
+
+    Args:
+        comment (str): The comment with html markup.
+
+    Returns:
+        str: The text of the comment, identical to
+             BeautifulSoup(comment, 'html.parser').get_text().
+    """
+
+    if '<' not in comment and '&' not in comment and (
+            not comment or comment.strip(_ASCII_SPACES)):
+        return comment
+
+    segments = []
+    end = 0
+
+    for m in _COMMENT_TAG_RE.finditer(comment):
+        # Whitespace is kept as-is inside <pre>, left to BeautifulSoup.
+        name = m.group(2).lower()
+        if name not in _COMMENT_TAGS or name == 'pre':
+            return BeautifulSoup(comment, 'html.parser').get_text()
+
+        segments.append(comment[end:m.start()])
+        end = m.end()
+
+    segments.append(comment[end:])
+
+    text = ''.join(segments)
+    if '<' in text or '>' in text:
+        return BeautifulSoup(comment, 'html.parser').get_text()
+
+    for i, segment in enumerate(segments):
+        if '&' in segment:
+            entities = [_replace_comment_entity(m)
+                        for m in _COMMENT_ENTITY_RE.finditer(segment)]
+
+            # html.parser has its own rules for malformed and uncommon
+            # references, those are left to BeautifulSoup.
+            if None in entities or len(entities) != segment.count('&'):
+                return BeautifulSoup(comment, 'html.parser').get_text()
+
+            entities = iter(entities)
+            segment = _COMMENT_ENTITY_RE.sub(lambda m: next(entities), segment)
+
+        # BeautifulSoup replaces a text between tags that only has ASCII
+        # whitespace by a single newline or space.
+        if segment and not segment.strip(_ASCII_SPACES):
+            segment = '\n' if '\n' in segment else ' '
+
+        segments[i] = segment
+
+    return ''.join(segments)
+
+
+# Directory of the protogenerator, source paths are relative to it.
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_source_digest(paths: Iterable[str]) -> str:
+    """Return a checksum of source files of the generator, which changes
+    whenever code that affects generated or cached output changes.
+
+    Args:
+        paths (iterable[str]): Paths to files or directories relative to the
+                               protogenerator directory, the .py and .txt
+                               files of a directory are included.
+
+    Returns:
+        str: The sha256 checksum of the names and contents of the files.
+    """
+
+    files = list()
+    for x in paths:
+        path = os.path.join(_SOURCE_ROOT, x)
+        if os.path.isdir(path):
+            files.extend(os.path.join(x, y) for y in os.listdir(path)
+                         if y.endswith(('.py', '.txt')))
+        else:
+            files.append(x)
+
+    h = hashlib.sha256()
+    for x in sorted(files):
+        h.update(x.replace(os.sep, '/').encode('utf-8') + b'\0')
+        with open(os.path.join(_SOURCE_ROOT, x), 'rb') as f:
+            h.update(f.read())
+        h.update(b'\0')
+
+    return h.hexdigest()
+
+
 def strip_url(x: str) -> str:
     """Return the name of the schema entity after stripping url.
 
@@ -114,7 +371,9 @@ def add_url(x: str) -> str:
 
 
 def topological_sort(graph: dict) -> list:
-    """Call topological_sort_util() and return the toplogically sorted answer.
+    """Return the nodes of a directed acyclic graph in topological order
+    using Kahn's algorithm. The nodes on or below a cycle cannot be ordered,
+    they follow the other nodes in the order of graph.
 
     Args:
         graph (dict): Dictionary representing the graph.
@@ -123,94 +382,161 @@ def topological_sort(graph: dict) -> list:
         list: The toplogically sorted nodes as a list.
     """
 
-    seen = set()
-    answer = []
+    in_degree = dict.fromkeys(graph, 0)
 
     for x in graph:
-        if x not in seen:
-            seen = topological_sort_util(x, graph, seen, answer)
+        for i in graph[x]:
+            in_degree[i] += 1
 
-    return answer
+    queue = collections.deque(x for x in graph if in_degree[x] == 0)
+    answer = []
 
+    while queue:
+        src = queue.popleft()
+        answer.append(src)
 
-def topological_sort_util(src: Any, graph: dict,
-                          seen: set, answer: list) -> set:
-    """Do topological sorting.
+        for i in graph[src]:
+            in_degree[i] -= 1
+            if in_degree[i] == 0:
+                queue.append(i)
 
-    Args:
-        src (str): Source/Current node of the graph.
-        graph (dict): Dictionary representing the graph.
-        seen (set): Set of seen nodes.
-        answer (list): List where nodes should be put in order.
+    # Subclass data with a cycle must not stop the generator.
+    if len(answer) < len(graph):
+        answer.extend(x for x in graph if in_degree[x] > 0)
 
-    Returns:
-        set: Set of seen nodes.
-    """
+    return answer
 
-    seen.add(src)
 
-    for i in graph[src]:
-        if i not in seen:
-            seen = topological_sort_util(i, graph, seen, answer)
-    answer.insert(0, src)
+def get_components(graph: Dict[Any, Iterable[Any]]) -> List[List[Any]]:
+    """Return the strongly connected components of a directed graph using
+    Tarjan's algorithm without recursion.
 
-    return seen
+    Args:
+        graph (dict): Dictionary representing the graph, every node must be
+                      a key.
 
+    Returns:
+        list[list]: The components, every component after the components
+                    it has edges to. The nodes of a component are in the
+                    order of graph.
+    """
 
-def get_children(graph: Dict[Any, set]) -> Dict[Any, set]:
+    position = {x: i for i, x in enumerate(graph)}
+    index = dict()
+    low = dict()
+    stack = list()
+    on_stack = set()
+    components = list()
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            x, edges = work[-1]
+            for y in edges:
+                if y not in index:
+                    index[y] = low[y] = len(index)
+                    stack.append(y)
+                    on_stack.add(y)
+                    work.append((y, iter(graph[y])))
+                    break
+                elif y in on_stack:
+                    low[x] = min(low[x], index[y])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[x])
+
+                if low[x] == index[x]:
+                    component = list()
+                    while True:
+                        y = stack.pop()
+                        on_stack.discard(y)
+                        component.append(y)
+                        if y == x:
+                            break
+
+                    components.append(sorted(component, key=position.get))
+
+    return components
+
+
+def get_children(graph: Dict[Any, set]) -> Mapping[Any, set]:
     """Return a mapping between class to it childrens.
 
+    Every node is given an integer id in topological order and the
+    descendants of a node are kept as a bitset of ids, so that the closure is
+    built with one pass over the edges in reverse topological order. The
+    bitsets are converted to sets of nodes only when they are looked up.
+
     Args:
         graph (dict): Dictionary representing the graph.
 
     Returns:
-        dict (any, set): Dictionary containing mapping between class to its 
-                         children.
+        mapping (any, set): Mapping between class to its children.
     """
 
-    class_to_children = {}
-    seen = set()
+    order = topological_sort(graph)
+    ids = {x: i for i, x in enumerate(order)}
+    descendants = [0] * len(order)
 
-    for x in graph.keys():
-        if x not in seen:
-            class_to_children, seen = get_children_util(
-                x, graph, seen, class_to_children)
+    for x in reversed(order):
+        bits = 0
+        for i in graph[x]:
+            j = ids[i]
+            bits |= descendants[j] | (1 << j)
 
-    return class_to_children
+        descendants[ids[x]] = bits
 
+    return _Descendants(order, ids, descendants)
 
-def get_children_util(
-        src: str, graph: Dict[Any, set], seen: set, class_to_children: dict) -> (dict, set):
-    """Helper function to assist get_childern in mapping classes and their
-    children.
 
-    Args:
-        src (str): Source/Current node of the graph.
-        graph (dict(Any, set)): Dictionary representing the graph.
-        seen (set): Set of seen nodes.
-        class_to_children (dict (any, set)): Dictionary containing mapping 
-                                             between class to its children.
+class _Descendants(collections.abc.Mapping):
+    """Read only mapping from a node to the set of its descendants, backed
+    by bitsets of node ids.
 
-    Returns:
-        dict (any, set): Dictionary containing mapping between class to its 
-                         children.
-        set: Set of seen nodes.
+    Args:
+        order (list): The nodes, the position of a node is its id.
+        ids (dict): Mapping from a node to its id.
+        descendants (list[int]): Bitset of descendants for every node id.
     """
 
-    seen.add(src)
+    def __init__(self, order: list, ids: dict, descendants: List[int]):
+        self._order = order
+        self._ids = ids
+        self._descendants = descendants
+        self._decoded = {}
+
+    def __getitem__(self, x: Any) -> set:
+        if x not in self._decoded:
+            bits = self._descendants[self._ids[x]]
+            binary = format(bits, 'b')[::-1]
+            children = set()
+
+            i = binary.find('1')
+            while i != -1:
+                children.add(self._order[i])
+                i = binary.find('1', i + 1)
 
-    if src not in class_to_children:
-        class_to_children[src] = set()
+            self._decoded[x] = children
 
-    for i in graph[src]:
-        class_to_children[src].add(i)
-        if i not in seen:
-            class_to_children, seen = get_children_util(
-                i, graph, seen, class_to_children)
+        return self._decoded[x]
 
-        class_to_children[src] = class_to_children[src] | class_to_children[i]
+    def __contains__(self, x: Any) -> bool:
+        return x in self._ids
 
-    return class_to_children, seen
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
 
 
 class PropertyToParent():
@@ -227,6 +553,8 @@ class PropertyToParent():
         parent(any): Name of the property's parent class.
     """
 
+    __slots__ = ('name', 'parent')
+
     def __init__(self, name: Any, parent: Any):
         self.name = name
         self.parent = parent
@@ -236,3 +564,77 @@ class PropertyToParent():
 
     def __eq__(self, other):
         return self.name == other.name
+
+
+class InheritedProperties(collections.abc.Mapping):
+    """The InheritedProperties maps every class to the set of its properties
+    including the inherited ones. Only the properties declared by a class and
+    its parent classes are stored, the inherited view of a class is built
+    the first time it is looked up and kept for later lookups, so properties
+    of classes like Thing are only copied into the descendants that are
+    used.
+
+    Args:
+        own (dict[str, frozenset[PropertyToParent]]): Properties declared by
+                                                      every class.
+        parents (dict[str, tuple[str]]): Parent classes of every class.
+
+    Attributes:
+        own (dict[str, frozenset[PropertyToParent]]): Properties declared by
+                                                      every class.
+        parents (dict[str, tuple[str]]): Parent classes of every class.
+    """
+
+    def __init__(self, own: Dict[str, FrozenSet[PropertyToParent]],
+                 parents: Dict[str, Tuple[str, ...]]):
+        self.own = own
+        self.parents = parents
+        self.__cache = dict()
+
+    def __reduce__(self):
+        # The views are built again after unpickling.
+        return (InheritedProperties, (self.own, self.parents))
+
+    def __getitem__(self, x: str) -> FrozenSet[PropertyToParent]:
+        """Return the properties of a class including the inherited ones. A
+        property declared by the class itself or by an earlier parent takes
+        precedence over one with the same name declared by a later parent.
+
+        Args:
+            x (str): Name of the class.
+
+        Returns:
+            frozenset[PropertyToParent]: The properties of the class.
+        """
+
+        if x in self.__cache:
+            return self.__cache[x]
+
+        props = {p.name: p for p in self.own[x]}
+        seen = {x}
+        stack = list(reversed(self.parents.get(x, ())))
+
+        # Ancestors are visited depth first in the order of the parents.
+        while stack:
+            c = stack.pop()
+            if c in seen:
+                continue
+
+            seen.add(c)
+            for p in self.own[c]:
+                props.setdefault(p.name, p)
+
+            stack.extend(reversed(self.parents.get(c, ())))
+
+        result = frozenset(props.values())
+        self.__cache[x] = result
+        return result
+
+    def __contains__(self, x: Any) -> bool:
+        return x in self.own
+
+    def __iter__(self):
+        return iter(self.own)
+
+    def __len__(self) -> int:
+        return len(self.own)